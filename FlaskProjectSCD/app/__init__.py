@@ -1,11 +1,11 @@
 from flask import Flask
 from flask_sqlalchemy import SQLAlchemy
-from flask_cors import CORS
 from .config import config_by_name
+from .db_routing import RoutingSession
 import os
 
 # Initialize extensions
-db = SQLAlchemy()
+db = SQLAlchemy(session_options={'class_': RoutingSession})
 
 
 def create_app(config_name=None):
@@ -15,27 +15,98 @@ def create_app(config_name=None):
     """
     if config_name is None:
         config_name = os.getenv('FLASK_ENV', 'development')
-
+    
     # IMPORTANT: Specify template and static folders relative to project root
-    app = Flask(__name__)
-
-    app.template_folder = os.path.join(os.getcwd(), 'FlaskProjectSCD', 'templates')
-    app.static_folder = os.path.join(os.getcwd(), 'FlaskProjectSCD', 'static')
-
-    # Recreate jinja environment with new template folder
-    app.jinja_env = app.create_jinja_environment()
-
+    # Passed to the constructor so the jinja environment is only built on first render
+    app = Flask(
+        __name__,
+        template_folder=os.path.join(os.getcwd(), 'FlaskProjectSCD', 'templates'),
+        static_folder=os.path.join(os.getcwd(), 'FlaskProjectSCD', 'static')
+    )
+    
     # Load configuration
     app.config.from_object(config_by_name[config_name])
-
+    
+    # The typeahead index learns of other workers' writes from the change feed
+    if app.config['SUGGEST_ENABLED'] and not app.config['CHANGE_FEED_ENABLED']:
+        app.logger.warning("SUGGEST_ENABLED requires CHANGE_FEED_ENABLED; suggestions are turned off")
+        app.config['SUGGEST_ENABLED'] = False
+    
     # Initialize extensions
+    from .db_pool import engine_options, install_pool_events, MonitoredQueuePool
+    app.config['SQLALCHEMY_ENGINE_OPTIONS'] = engine_options(app.config, poolclass=MonitoredQueuePool)
+    replicas = {}
+    if app.config['DATABASE_REPLICA_URLS']:
+        from .db_routing import replica_binds
+        replicas = replica_binds(app.config)
+        app.config['SQLALCHEMY_BINDS'] = dict(app.config.get('SQLALCHEMY_BINDS') or {}, **replicas)
     db.init_app(app)
+    # init_app gives each bind a MetaData on the shared db object; replicas
+    # mirror the primary's tables, and a leftover entry would make every later
+    # app's create_all() look for a bind it does not have
+    for key in replicas:
+        db.metadatas.pop(key, None)
+    with app.app_context():
+        for engine in db.engines.values():
+            install_pool_events(engine, app.config)
+        if replicas:
+            from .db_routing import init_db_routing
+            init_db_routing(app, {key: db.engines[key] for key in replicas})
+    
+    # after_request handlers run in reverse order of registration, so
+    # registering first makes compression the last step of every response;
+    # profiling comes before it, so profiles cover every hook, compression too
+    if app.config['PROFILING_ENABLED']:
+        from .profiling import init_profiling, install_profiling_events
+        init_profiling(app)
+        with app.app_context():
+            for engine in db.engines.values():
+                install_profiling_events(engine)
+    
+    if app.config['COMPRESSION_ENABLED']:
+        from .compression import init_compression
+        init_compression(app)
+    
+    if app.config['METRICS_ENABLED']:
+        from .metrics import init_metrics, install_query_events
+        init_metrics(app)
+        with app.app_context():
+            for key, engine in db.engines.items():
+                install_query_events(engine, app.extensions['metrics'], key or 'default')
+    
+    if app.config['SQL_TRACE_ENABLED']:
+        from .query_trace import init_query_trace, install_query_trace
+        init_query_trace(app)
+        with app.app_context():
+            for engine in db.engines.values():
+                install_query_trace(engine, app)
+    
+    config = app.config
+    if config['RATE_LIMIT_TRUSTED_PROXIES']:
+        from werkzeug.middleware.proxy_fix import ProxyFix
+        app.wsgi_app = ProxyFix(app.wsgi_app, x_for=config['RATE_LIMIT_TRUSTED_PROXIES'])
+    if config['RATE_LIMIT_ENABLED'] or config['LOAD_SHED_MAX_IN_FLIGHT'] or config['LOAD_SHED_MAX_POOL_WAITERS']:
+        from .middleware.rate_limit import init_rate_limiting
+        with app.app_context():
+            init_rate_limiting(app, list(db.engines.values()))
+    
+    # Imported here so importing the package stays cheap for CLI tools and workers
+    from flask_cors import CORS
     CORS(app)
-
+    
     # Register blueprints
     from .controllers.supplier_controller import supplier_bp
-
+    from .controllers.supplier_async_controller import supplier_async_bp
+    from .controllers.health_controller import health_bp
+    from .controllers.batch_controller import batch_bp
+    
     app.register_blueprint(supplier_bp)
+    app.register_blueprint(supplier_async_bp)
+    app.register_blueprint(health_bp)
+    app.register_blueprint(batch_bp)
+    if app.config['METRICS_ENABLED']:
+        from .controllers.metrics_controller import metrics_bp
+        app.register_blueprint(metrics_bp)
     
     # Add simple web route for home page
     from flask import render_template
@@ -44,23 +115,24 @@ def create_app(config_name=None):
     def index():
         """Home page - show suppliers"""
         return render_template('suppliers.html')
-
-    # Create database tables
-    with app.app_context():
-        db.create_all()
-
+    
+    # CLI commands (flask --app run init-db / startup-report)
+    from .commands import register_commands, init_db, build_suggest_indexes
+    register_commands(app)
+    
+    # Schema I/O at boot is opt-in; production runs init-db once per deploy instead
+    if app.config['DB_CREATE_ON_STARTUP']:
+        with app.app_context():
+            init_db()
+            build_suggest_indexes()
+    
     # Error handlers
     @app.errorhandler(404)
     def not_found(error):
         return {'success': False, 'message': 'Resource not found'}, 404
-
+    
     @app.errorhandler(500)
     def internal_error(error):
         return {'success': False, 'message': 'Internal server error'}, 500
-
-    # Health check endpoint
-    @app.route('/health', methods=['GET'])
-    def health_check():
-        return {'success': True, 'message': 'Server is running'}, 200
-
+    
     return app
\ No newline at end of file
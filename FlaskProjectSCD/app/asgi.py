@@ -0,0 +1,160 @@
+import asyncio
+import inspect
+import io
+import sys
+from typing import Any, Dict, Optional
+from asgiref.wsgi import WsgiToAsgi
+from flask import request, request_started
+from werkzeug.exceptions import HTTPException
+from werkzeug.middleware.proxy_fix import ProxyFix
+from .repositories.async_database import serving_loop
+
+
+def build_environ(scope: Dict[str, Any], body: bytes) -> Dict[str, Any]:
+    """WSGI environ of an ASGI HTTP request whose body has been read"""
+    script_name = scope.get('root_path', '').encode('utf8').decode('latin1')
+    path_info = scope['path'].encode('utf8').decode('latin1')
+    if script_name and path_info.startswith(script_name):
+        path_info = path_info[len(script_name):]
+    
+    server = scope.get('server') or ('localhost', 80)
+    environ = {
+        'REQUEST_METHOD': scope['method'],
+        'SCRIPT_NAME': script_name,
+        'PATH_INFO': path_info,
+        'QUERY_STRING': scope['query_string'].decode('latin1'),
+        'SERVER_NAME': server[0],
+        'SERVER_PORT': str(server[1]),
+        'SERVER_PROTOCOL': f"HTTP/{scope.get('http_version', '1.1')}",
+        'wsgi.version': (1, 0),
+        'wsgi.url_scheme': scope.get('scheme', 'http'),
+        'wsgi.input': io.BytesIO(body),
+        'wsgi.errors': sys.stderr,
+        'wsgi.multithread': True,
+        'wsgi.multiprocess': True,
+        'wsgi.run_once': False,
+    }
+    if scope.get('client'):
+        environ['REMOTE_ADDR'] = scope['client'][0]
+    
+    for name, value in scope.get('headers', []):
+        name = name.decode('latin1').upper().replace('-', '_')
+        if name not in ('CONTENT_LENGTH', 'CONTENT_TYPE'):
+            name = f'HTTP_{name}'
+        value = value.decode('latin1')
+        environ[name] = f'{environ[name]},{value}' if name in environ else value
+    return environ
+
+
+class AsgiApp:
+    """
+    ASGI application serving a Flask app
+    Requests routed to coroutine views (async def, as in supplier_async_bp)
+    are awaited on the server's event loop, so a request waiting on the
+    database holds no thread and a worker keeps thousands in flight. Every
+    other request goes through WsgiToAsgi and its thread pool. Both run the
+    app's before/after_request hooks, error handlers and teardown; the
+    synchronous hooks of native requests run on the event loop
+    """
+    
+    def __init__(self, app):
+        self.app = app
+        self.wsgi = WsgiToAsgi(app)
+        # Native requests skip app.wsgi_app, so its ProxyFix is applied here
+        proxies = app.config.get('RATE_LIMIT_TRUSTED_PROXIES', 0)
+        self.proxy_fix = ProxyFix(lambda environ, start_response: environ, x_for=proxies) if proxies else None
+    
+    async def __call__(self, scope, receive, send) -> None:
+        if scope['type'] == 'http' and self.native_view(scope) is not None:
+            await self.handle(scope, receive, send)
+        else:
+            await self.wsgi(scope, receive, send)
+    
+    def native_view(self, scope: Dict[str, Any]):
+        """The coroutine view the request is routed to, or None"""
+        adapter = self.app.url_map.bind('localhost', script_name=scope.get('root_path') or None)
+        try:
+            endpoint, _ = adapter.match(scope['path'], method=scope['method'])
+        except HTTPException:
+            return None
+        
+        view = self.app.view_functions.get(endpoint)
+        return view if inspect.iscoroutinefunction(view) else None
+    
+    async def handle(self, scope, receive, send) -> None:
+        """Counterpart of Flask.wsgi_app that awaits the view instead of blocking on it"""
+        body = await self._read_body(receive)
+        if body is None:
+            return
+        
+        app = self.app
+        environ = build_environ(scope, body)
+        if self.proxy_fix is not None:
+            environ = self.proxy_fix(environ, None)
+        context = app.request_context(environ)
+        error = None
+        # Database sessions of the view run right here, not on another thread
+        token = serving_loop.set(asyncio.get_running_loop())
+        try:
+            try:
+                context.push()
+                response = await self.full_dispatch_request()
+            except Exception as e:
+                error = e
+                response = app.handle_exception(e)
+            await self._send(response, environ, send)
+        finally:
+            if error is not None and app.should_ignore_error(error):
+                error = None
+            context.pop(error)
+            serving_loop.reset(token)
+    
+    async def full_dispatch_request(self):
+        app = self.app
+        try:
+            request_started.send(app, _async_wrapper=app.ensure_sync)
+            rv = app.preprocess_request()
+            if rv is None:
+                rv = await self.dispatch_request()
+        except Exception as e:
+            rv = app.handle_user_exception(e)
+        return app.finalize_request(rv)
+    
+    async def dispatch_request(self):
+        if request.routing_exception is not None:
+            self.app.raise_routing_exception(request)
+        
+        rule = request.url_rule
+        if getattr(rule, 'provide_automatic_options', False) and request.method == 'OPTIONS':
+            return self.app.make_default_options_response()
+        return await self.app.view_functions[rule.endpoint](**request.view_args)
+    
+    @staticmethod
+    async def _read_body(receive) -> Optional[bytes]:
+        """Whole request body, or None when the client went away"""
+        chunks = []
+        while True:
+            message = await receive()
+            if message['type'] == 'http.disconnect':
+                return None
+            chunks.append(message.get('body', b''))
+            if not message.get('more_body', False):
+                return b''.join(chunks)
+    
+    @staticmethod
+    async def _send(response, environ: Dict[str, Any], send) -> None:
+        app_iter, status, headers = response.get_wsgi_response(environ)
+        try:
+            await send({
+                'type': 'http.response.start',
+                'status': int(status.split(' ', 1)[0]),
+                'headers': [(name.lower().encode('latin1'), value.encode('latin1')) for name, value in headers],
+            })
+            for chunk in app_iter:
+                if chunk:
+                    await send({'type': 'http.response.body', 'body': chunk, 'more_body': True})
+            await send({'type': 'http.response.body', 'body': b'', 'more_body': False})
+        finally:
+            # Runs the response's call_on_close callbacks
+            if hasattr(app_iter, 'close'):
+                app_iter.close()
\ No newline at end of file
@@ -0,0 +1,97 @@
+import contextvars
+from typing import Any, Dict, Optional
+from flask import current_app, g, request, Response
+from werkzeug.test import EnvironBuilder
+from . import db
+from .utils.response_handler import ResponseHandler
+
+# Sub-response headers a client may need, e.g. an ETag for a later If-Match
+RETURNED_HEADERS = ('ETag', 'Last-Modified', 'Location', 'Retry-After')
+
+# Request methods a sub-request may use
+METHODS = ('GET', 'POST', 'PUT', 'PATCH', 'DELETE')
+
+
+def parse_subrequest(spec: Any) -> Dict[str, Any]:
+    """Validate one {"method", "path", "body", "headers"} entry of a batch"""
+    if not isinstance(spec, dict):
+        raise ValueError("each request must be an object with method and path")
+    
+    method = str(spec.get('method', 'GET')).upper()
+    path = spec.get('path')
+    headers = spec.get('headers') or {}
+    if method not in METHODS:
+        raise ValueError(f"method must be one of: {', '.join(METHODS)}")
+    if not isinstance(path, str) or not path.startswith('/'):
+        raise ValueError("path must be an absolute path, e.g. /api/suppliers/1")
+    if not isinstance(headers, dict):
+        raise ValueError("headers must be an object")
+    
+    return {'method': method, 'path': path, 'body': spec.get('body'), 'headers': headers}
+
+
+def run_subrequest(method: str, path: str, body: Any = None,
+                   headers: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
+    """
+    Dispatch one request to the app from inside the current request
+    It goes through every before/after_request hook, so auth, rate limits,
+    load shedding, metrics and query budgets apply as if it had been sent
+    on its own. It shares the app context, and with it the database session
+    Returns: {'status', 'headers', 'body'}
+    """
+    app = current_app._get_current_object()
+    forwarded = {
+        name: request.headers[name]
+        for name in app.config['BATCH_FORWARDED_HEADERS'] if name in request.headers
+    }
+    builder = EnvironBuilder(
+        path=path, method=method, json=body, headers=dict(forwarded, **(headers or {})),
+        environ_base={'REMOTE_ADDR': request.remote_addr}
+    )
+    try:
+        environ = builder.get_environ()
+    finally:
+        builder.close()
+    
+    # Hooks keep per-request state in g and in context variables; give the
+    # sub-request its own of both, so its teardown cannot end the batch's
+    state = g._get_current_object().__dict__
+    saved = dict(state)
+    state.clear()
+    try:
+        response = contextvars.copy_context().run(_dispatch, app, environ)
+    finally:
+        state.clear()
+        state.update(saved)
+    
+    return {
+        'status': response.status_code,
+        'headers': {name: response.headers[name] for name in RETURNED_HEADERS if name in response.headers},
+        'body': response.get_json(silent=True) if response.is_json else response.get_data(as_text=True)
+    }
+
+
+def _dispatch(app, environ) -> Response:
+    context = app.request_context(environ)
+    # Refused before the context is pushed: popping it would run teardown
+    # hooks whose before_request counterparts never ran. Pushing is what
+    # routes the request, so route it here first
+    context.match_request()
+    if context.request.blueprint == 'batch':
+        return app.make_response(ResponseHandler.bad_request("Batches cannot be nested"))
+    
+    with context:
+        try:
+            response = app.full_dispatch_request()
+        except Exception as e:
+            # Leave the shared session usable for the sub-requests after this one
+            db.session.rollback()
+            return app.make_response(ResponseHandler.error(f"Sub-request failed: {str(e)}", 500))
+        
+        if response.status_code >= 500:
+            db.session.rollback()
+        if response.is_streamed:
+            # Reading it here would hold the batch open for the whole stream
+            response.close()
+            return app.make_response(ResponseHandler.bad_request("Streaming endpoints cannot be batched"))
+        return response
\ No newline at end of file
@@ -0,0 +1,175 @@
+import json
+import os
+import re
+import subprocess
+import sys
+from collections import defaultdict
+from typing import Dict, Any, Optional
+import click
+from . import db
+
+# Runs in a fresh interpreter under -X importtime; argv[1] is the config name
+STARTUP_PROBE = """
+import json, sys, time
+started = time.perf_counter()
+from FlaskProjectSCD.app import create_app
+imported = time.perf_counter()
+app = create_app(sys.argv[1] or None)
+created = time.perf_counter()
+app.test_client().get('/health')
+served = time.perf_counter()
+print(json.dumps({
+    'import_ms': (imported - started) * 1000,
+    'create_app_ms': (created - imported) * 1000,
+    'first_request_ms': (served - created) * 1000,
+}))
+"""
+
+IMPORT_TIME_LINE = re.compile(r'^import time:\s+(\d+) \|\s+(\d+) \| (\s*)(\S+)$')
+
+
+def init_db() -> None:
+    """Create missing tables, text search indexes and change feed counters; run inside an app context"""
+    db.create_all()
+    
+    from .repositories.supplier_repository import SupplierRepository
+    repository = SupplierRepository()
+    repository.search_backend.ensure_index()
+    if repository.change_feed is not None:
+        repository.change_feed.ensure_sequence()
+
+
+def build_suggest_indexes() -> None:
+    """Build this process's typeahead indexes; run inside an app context"""
+    from .repositories.supplier_repository import SupplierRepository
+    repository = SupplierRepository()
+    if repository.suggest_index is not None:
+        repository.suggest_index.build(repository)
+
+
+def sync_sqlite_replicas(replicas: Dict[str, Any]) -> Dict[str, str]:
+    """
+    Copy the SQLite primary over every SQLite replica; run inside an app context
+    Stands in for replication when trying replica routing with local files
+    Returns the replica bind keys with the files written
+    """
+    if db.engine.dialect.name != 'sqlite':
+        raise click.ClickException("sync-replicas only copies SQLite databases")
+    
+    copied = {}
+    source = db.engine.raw_connection()
+    try:
+        for key, engine in replicas.items():
+            if engine.dialect.name != 'sqlite':
+                raise click.ClickException(f"Replica {key} is not a SQLite database")
+            
+            target = engine.raw_connection()
+            try:
+                source.driver_connection.backup(target.driver_connection)
+            finally:
+                target.close()
+            copied[key] = engine.url.database
+    finally:
+        source.close()
+    
+    return copied
+
+
+def startup_report(config_name: Optional[str] = None, top: int = 15) -> Dict[str, Any]:
+    """
+    Measure a cold start in a fresh interpreter
+    Returns the time to import the app, build it and serve a first request,
+    plus import time per top-level package and the slowest modules (ms)
+    """
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', STARTUP_PROBE, config_name or ''],
+        capture_output=True, text=True, cwd=os.getcwd()
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"Startup probe failed:\n{result.stderr[-2000:]}")
+    
+    packages = defaultdict(float)
+    modules = []
+    for line in result.stderr.splitlines():
+        match = IMPORT_TIME_LINE.match(line)
+        if not match:
+            continue
+        
+        self_us, cumulative_us, indent, name = match.groups()
+        packages[name.split('.')[0]] += int(self_us) / 1000
+        modules.append({
+            'module': name,
+            'self_ms': int(self_us) / 1000,
+            'cumulative_ms': int(cumulative_us) / 1000,
+            'depth': len(indent) // 2,
+        })
+    
+    timings = json.loads(result.stdout.strip().splitlines()[-1])
+    slowest = sorted(modules, key=lambda module: module['self_ms'], reverse=True)[:top]
+    
+    return dict(
+        timings,
+        config=config_name or os.getenv('FLASK_ENV', 'development'),
+        python=sys.version.split()[0],
+        modules_imported=len(modules),
+        packages=dict(sorted(packages.items(), key=lambda item: item[1], reverse=True)[:top]),
+        slowest_modules=[{key: module[key] for key in ('module', 'self_ms', 'cumulative_ms')} for module in slowest],
+    )
+
+
+def format_startup_report(report: Dict[str, Any]) -> str:
+    """Render a startup report as a plain-text table"""
+    lines = [
+        f"Config: {report['config']}  Python: {report['python']}",
+        f"Import app:     {report['import_ms']:8.1f} ms ({report['modules_imported']} modules)",
+        f"create_app():   {report['create_app_ms']:8.1f} ms",
+        f"First request:  {report['first_request_ms']:8.1f} ms",
+        "",
+        "Import time by package (self):",
+    ]
+    lines += [f"  {name:<32} {ms:8.1f} ms" for name, ms in report['packages'].items()]
+    lines += ["", "Slowest modules (self / cumulative):"]
+    lines += [
+        f"  {module['module']:<48} {module['self_ms']:8.1f} / {module['cumulative_ms']:8.1f} ms"
+        for module in report['slowest_modules']
+    ]
+    return '\n'.join(lines)
+
+
+def register_commands(app) -> None:
+    """Register the CLI commands, e.g. flask --app run init-db"""
+    
+    @app.cli.command('init-db')
+    def init_db_command():
+        """Create tables and search indexes"""
+        init_db()
+        click.echo("Database initialized")
+    
+    @app.cli.command('rebuild-stats')
+    @click.option('--chunk-size', default=10000, show_default=True, help="Suppliers read per query")
+    def rebuild_stats_command(chunk_size):
+        """Recompute the supplier summary table from the suppliers table"""
+        from .repositories.supplier_repository import SupplierRepository
+        
+        result = SupplierRepository().rebuild_stats(chunk_size)
+        click.echo(f"Rebuilt {result['cells']} stat cells from {result['rows']} suppliers")
+    
+    @app.cli.command('sync-replicas')
+    def sync_replicas_command():
+        """Copy a SQLite primary to the SQLite read replicas"""
+        from .db_routing import replica_engines
+        
+        replicas = replica_engines(app)
+        if not replicas:
+            raise click.ClickException("No replicas configured (DATABASE_REPLICA_URLS)")
+        
+        for key, path in sync_sqlite_replicas(replicas).items():
+            click.echo(f"{key}: copied to {path}")
+    
+    @app.cli.command('startup-report')
+    @click.option('--json', 'as_json', is_flag=True, help="Print the report as JSON")
+    @click.option('--config', 'config_name', default=None, help="Config to build the app with")
+    def startup_report_command(as_json, config_name):
+        """Report import and startup time of a cold start"""
+        report = startup_report(config_name)
+        click.echo(json.dumps(report, indent=2) if as_json else format_startup_report(report))
\ No newline at end of file
@@ -0,0 +1,214 @@
+import zlib
+from typing import Any, Dict, Iterable, Iterator, Optional, Tuple
+from flask import current_app, request, Response
+from .profiling import timed
+from .repositories.cache_backends import create_cache_backend
+
+# Content codings in the server's order of preference; a client's q-values
+# still decide, the order only breaks ties
+CODINGS = ('br', 'gzip', 'deflate')
+
+# zlib window bits: gzip wrapper, and the zlib wrapper HTTP calls 'deflate'
+WBITS = {'gzip': 16 + zlib.MAX_WBITS, 'deflate': zlib.MAX_WBITS}
+
+
+def compress(level: Optional[int] = None, min_size: Optional[int] = None,
+             brotli_quality: Optional[int] = None, cache: bool = False):
+    """
+    Tune response compression for a view
+    level: gzip/deflate level 1-9, 0 sends the view's responses uncompressed
+    min_size: smallest body in bytes worth compressing
+    cache: keep the encoded bodies of 200 responses by ETag, see cached_response
+    """
+    def decorator(view):
+        view.compression = {
+            'level': level, 'min_size': min_size,
+            'brotli_quality': brotli_quality, 'cache': cache
+        }
+        return view
+    return decorator
+
+
+class Encoder:
+    """Incremental encoder for one content coding"""
+    
+    def __init__(self, coding: str, level: int, brotli_quality: int):
+        if coding == 'br':
+            import brotli
+            self._compressor = brotli.Compressor(quality=brotli_quality)
+            self._compress = self._compressor.process
+        else:
+            self._compressor = zlib.compressobj(level, zlib.DEFLATED, WBITS[coding])
+            self._compress = self._compressor.compress
+        self.coding = coding
+    
+    def encode(self, data: bytes) -> bytes:
+        """Encode a whole body"""
+        return self._compress(data) + self.finish()
+    
+    def chunk(self, data: bytes) -> bytes:
+        """Encode part of a stream and flush it, so the client gets it now"""
+        if self.coding == 'br':
+            return self._compress(data) + self._compressor.flush()
+        return self._compress(data) + self._compressor.flush(zlib.Z_SYNC_FLUSH)
+    
+    def finish(self) -> bytes:
+        if self.coding == 'br':
+            return self._compressor.finish()
+        return self._compressor.flush()
+
+
+def encode_stream(chunks: Iterable[bytes], encoder: Encoder) -> Iterator[bytes]:
+    """Compress a streamed body chunk by chunk"""
+    for data in chunks:
+        encoded = encoder.chunk(data)
+        if encoded:
+            yield encoded
+    yield encoder.finish()
+
+
+class Compression:
+    """Negotiates a content coding per response and encodes the body"""
+    
+    def __init__(self, config):
+        self.codings = [coding.strip() for coding in config['COMPRESSION_CODINGS'].split(',') if coding.strip()]
+        unknown = set(self.codings) - set(CODINGS)
+        if unknown:
+            raise ValueError(f"COMPRESSION_CODINGS must be among: {', '.join(CODINGS)}")
+        if 'br' in self.codings:
+            try:
+                import brotli  # noqa: F401
+            except ImportError:
+                raise RuntimeError("COMPRESSION_CODINGS=br requires the 'brotli' package")
+        
+        self.defaults = {
+            'level': config['COMPRESSION_LEVEL'],
+            'min_size': config['COMPRESSION_MIN_SIZE'],
+            'brotli_quality': config['COMPRESSION_BROTLI_QUALITY'],
+            'cache': False,
+        }
+        self.mimetypes = frozenset(config['COMPRESSION_MIMETYPES'])
+        self.max_cached_size = config['RESPONSE_CACHE_MAX_SIZE']
+        self.cache = create_cache_backend({
+            'CACHE_BACKEND': config['RESPONSE_CACHE_BACKEND'],
+            'CACHE_TTL': config['RESPONSE_CACHE_TTL'],
+            'CACHE_MAX_ENTRIES': config['RESPONSE_CACHE_MAX_ENTRIES'],
+            'CACHE_REDIS_URL': config['CACHE_REDIS_URL'],
+            'CACHE_KEY_PREFIX': config['CACHE_KEY_PREFIX'] + 'body:',
+        })
+    
+    def settings(self, view) -> Dict[str, Any]:
+        """Defaults overridden by the view's @compress arguments"""
+        overrides = getattr(view, 'compression', None)
+        if not overrides:
+            return self.defaults
+        return dict(self.defaults, **{key: value for key, value in overrides.items() if value is not None})
+    
+    def negotiate(self) -> Optional[str]:
+        """Best coding the client accepts, or None for identity"""
+        return request.accept_encodings.best_match(self.codings)
+    
+    def encoder(self, coding: str, settings: Dict[str, Any]) -> Encoder:
+        return Encoder(coding, settings['level'], settings['brotli_quality'])
+    
+    def cache_key(self, etag: str, coding: Optional[str]) -> str:
+        # The ETag already changes with every write; the path and query
+        # keep views that share an ETag apart
+        return f"{request.full_path}|{etag}|{coding or 'identity'}"
+    
+    def process(self, response: Response) -> Response:
+        """Compress a response for the current request when it is worth it"""
+        settings = self.settings(current_app.view_functions.get(request.endpoint))
+        if (not settings['level'] or response.mimetype not in self.mimetypes
+                or response.direct_passthrough or response.status_code in (204, 206, 304)
+                or response.status_code < 200):
+            return response
+        
+        response.vary.add('Accept-Encoding')
+        # Bodies served from the cache arrive encoded already
+        if 'Content-Encoding' not in response.headers:
+            with timed('compress'):
+                self._encode(response, settings)
+        
+        if response.headers.get('Content-Encoding', 'identity') != 'identity':
+            # A strong ETag names one exact byte sequence and the encoded
+            # bytes differ from the identity ones, so only a weak match holds
+            etag, weak = response.get_etag()
+            if etag and not weak:
+                response.set_etag(etag, weak=True)
+        return response
+    
+    def _encode(self, response: Response, settings: Dict[str, Any]) -> None:
+        coding = self.negotiate()
+        if response.is_streamed:
+            if coding is not None:
+                response.response = encode_stream(response.iter_encoded(), self.encoder(coding, settings))
+                response.headers['Content-Encoding'] = coding
+                response.headers.pop('Content-Length', None)
+            return
+        
+        body = response.get_data()
+        etag, weak = response.get_etag()
+        cacheable = (
+            self.cache is not None and settings['cache'] and request.method == 'GET'
+            and response.status_code == 200 and etag and not weak and len(body) <= self.max_cached_size
+        )
+        if cacheable:
+            self.cache.set(self.cache_key(etag, None), (response.mimetype, body))
+        
+        if coding is None or len(body) < settings['min_size']:
+            return
+        
+        data = self.encoder(coding, settings).encode(body)
+        if cacheable:
+            self.cache.set(self.cache_key(etag, coding), (response.mimetype, data))
+        response.set_data(data)
+        response.headers['Content-Encoding'] = coding
+    
+    def cached(self, etag: str) -> Optional[Response]:
+        """
+        The body stored for etag, in the coding the client accepts, or None
+        A body only stored unencoded is encoded once here and stored too
+        """
+        settings = self.settings(current_app.view_functions.get(request.endpoint))
+        coding = self.negotiate()
+        entry = self.cache.get(self.cache_key(etag, coding)) if coding is not None else None
+        if entry is None:
+            entry = self.cache.get(self.cache_key(etag, None))
+            if entry is None:
+                return None
+            
+            mimetype, body = entry
+            if coding is None or len(body) < settings['min_size']:
+                return Response(body, mimetype=mimetype)
+            
+            entry = (mimetype, self.encoder(coding, settings).encode(body))
+            self.cache.set(self.cache_key(etag, coding), entry)
+        
+        mimetype, data = entry
+        response = Response(data, mimetype=mimetype)
+        response.headers['Content-Encoding'] = coding
+        return response
+
+
+def cached_response(etag: str) -> Optional[Tuple[Response, int]]:
+    """
+    A pre-encoded 200 response for etag from a view decorated with
+    @compress(cache=True), or None when it has not been stored yet
+    """
+    compression = current_app.extensions.get('compression')
+    if compression is None or compression.cache is None:
+        return None
+    
+    response = compression.cached(etag)
+    return (response, 200) if response is not None else None
+
+
+def init_compression(app) -> None:
+    """Compress responses after every other after_request handler has run"""
+    compression = Compression(app.config)
+    app.extensions['compression'] = compression
+    
+    @app.after_request
+    def compress_response(response):
+        return compression.process(response)
\ No newline at end of file
@@ -1,4 +1,5 @@
 import os
+import tempfile
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -18,35 +19,253 @@ class Config:
     DB_PASSWORD = os.getenv('DATABASE_PASSWORD', '')
     DB_NAME = os.getenv('DATABASE_NAME', 'product_management_db')
     
-    SQLALCHEMY_DATABASE_URI = (
+    # DATABASE_URL overrides the MySQL settings, e.g. sqlite:///suppliers.db for local runs
+    SQLALCHEMY_DATABASE_URI = os.getenv(
+        'DATABASE_URL',
         f"mysql+pymysql://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
     )
+    # Async routes derive their URL from the one above (pymysql -> aiomysql,
+    # sqlite -> aiosqlite) unless ASYNC_DATABASE_URL is set
+    ASYNC_DATABASE_URL = os.getenv('ASYNC_DATABASE_URL')
     SQLALCHEMY_TRACK_MODIFICATIONS = False
-    SQLALCHEMY_ENGINE_OPTIONS = {
-        'pool_pre_ping': True,
-        'pool_recycle': 3600,
-    }
+    # Create missing tables and search indexes in create_app; off by default so
+    # workers boot without schema round trips (run 'python run.py init-db' instead)
+    DB_CREATE_ON_STARTUP = os.getenv('DB_CREATE_ON_STARTUP', 'False') == 'True'
+    # Extra engine options; the pool itself is tuned with the DB_* settings below
+    SQLALCHEMY_ENGINE_OPTIONS = {}
+    
+    # Connection pool, per worker process: persistent connections, extra ones
+    # allowed under bursts, and seconds to wait for a free one before failing
+    DB_POOL_SIZE = int(os.getenv('DB_POOL_SIZE', '5'))
+    DB_MAX_OVERFLOW = int(os.getenv('DB_MAX_OVERFLOW', '10'))
+    DB_POOL_TIMEOUT = int(os.getenv('DB_POOL_TIMEOUT', '30'))
+    DB_POOL_RECYCLE = int(os.getenv('DB_POOL_RECYCLE', '3600'))
+    DB_CONNECT_TIMEOUT = int(os.getenv('DB_CONNECT_TIMEOUT', '10'))
+    # Pre-ping: always (a round trip on every checkout) | idle (only connections
+    # idle for DB_POOL_PING_IDLE seconds or more) | never
+    DB_POOL_PRE_PING = os.getenv('DB_POOL_PRE_PING', 'idle')
+    DB_POOL_PING_IDLE = int(os.getenv('DB_POOL_PING_IDLE', '30'))
+    
+    # Read replicas, comma-separated URLs pooled like the primary. Repository
+    # reads are spread over them (round_robin | least_loaded, by connections
+    # checked out in this worker); writes, and every read after a write in the
+    # same request, stay on the primary. Clients send 'X-Read-From: primary'
+    # to read from the primary for one request
+    DATABASE_REPLICA_URLS = os.getenv('DATABASE_REPLICA_URLS', '')
+    DB_REPLICA_STRATEGY = os.getenv('DB_REPLICA_STRATEGY', 'round_robin')
     
     # Firebase Configuration
     FIREBASE_CONFIG_PATH = os.getenv('FIREBASE_CONFIG_PATH', 'firebase-config.json')
     
+    # Authentication: firebase | fake (offline verifier for tests and benchmarks)
+    AUTH_VERIFIER = os.getenv('AUTH_VERIFIER', 'firebase')
+    AUTH_FAKE_LATENCY_MS = float(os.getenv('AUTH_FAKE_LATENCY_MS', '0'))
+    # Verified tokens are cached until their exp claim, capped at this many
+    # seconds, so a token revoked at Firebase stops working within it
+    AUTH_TOKEN_CACHE_MAX_TTL = int(os.getenv('AUTH_TOKEN_CACHE_MAX_TTL', '300'))
+    AUTH_TOKEN_CACHE_SIZE = int(os.getenv('AUTH_TOKEN_CACHE_SIZE', '10000'))
+    # User lookups are cached briefly; deactivation through AuthService drops them at once
+    AUTH_USER_CACHE_TTL = int(os.getenv('AUTH_USER_CACHE_TTL', '30'))
+    AUTH_USER_CACHE_SIZE = int(os.getenv('AUTH_USER_CACHE_SIZE', '10000'))
+    
+    # Search backend: auto | mysql_fulltext | sqlite_fts5 | like
+    # auto picks FULLTEXT on MySQL, FTS5 on SQLite and ILIKE elsewhere
+    SEARCH_BACKEND = os.getenv('SEARCH_BACKEND', 'auto')
+    
+    # Repository read-through cache: none | memory | redis
+    # memory is per process; redis is shared by all workers and needs the 'redis' package
+    CACHE_BACKEND = os.getenv('CACHE_BACKEND', 'none')
+    CACHE_TTL = int(os.getenv('CACHE_TTL', '300'))
+    CACHE_MAX_ENTRIES = int(os.getenv('CACHE_MAX_ENTRIES', '10000'))
+    CACHE_REDIS_URL = os.getenv('CACHE_REDIS_URL', 'redis://localhost:6379/0')
+    CACHE_KEY_PREFIX = os.getenv('CACHE_KEY_PREFIX', 'scd:')
+    
+    # Response compression negotiated from Accept-Encoding. Codings in order of
+    # preference: gzip, deflate and br (br needs the 'brotli' package). Views
+    # tune level and size with @compress
+    COMPRESSION_ENABLED = os.getenv('COMPRESSION_ENABLED', 'True') == 'True'
+    COMPRESSION_CODINGS = os.getenv('COMPRESSION_CODINGS', 'gzip,deflate')
+    COMPRESSION_LEVEL = int(os.getenv('COMPRESSION_LEVEL', '6'))
+    COMPRESSION_BROTLI_QUALITY = int(os.getenv('COMPRESSION_BROTLI_QUALITY', '5'))
+    # Smaller bodies fit in a packet or two anyway; encoding them only costs CPU
+    COMPRESSION_MIN_SIZE = int(os.getenv('COMPRESSION_MIN_SIZE', '1024'))
+    COMPRESSION_MIMETYPES = (
+        'application/json', 'application/x-ndjson', 'text/csv', 'text/html',
+        'text/plain', 'text/css', 'application/javascript'
+    )
+    
+    # Encoded bodies of @compress(cache=True) views, keyed by ETag: none | memory | redis
+    RESPONSE_CACHE_BACKEND = os.getenv('RESPONSE_CACHE_BACKEND', 'none')
+    RESPONSE_CACHE_TTL = int(os.getenv('RESPONSE_CACHE_TTL', '300'))
+    RESPONSE_CACHE_MAX_ENTRIES = int(os.getenv('RESPONSE_CACHE_MAX_ENTRIES', '1000'))
+    # Larger bodies (in bytes) are encoded per request instead of stored
+    RESPONSE_CACHE_MAX_SIZE = int(os.getenv('RESPONSE_CACHE_MAX_SIZE', '1048576'))
+    
+    # Production server (python run.py serve); 0 workers means one per CPU
+    SERVER_WORKERS = int(os.getenv('SERVER_WORKERS', '0'))
+    SERVER_THREADS = int(os.getenv('SERVER_THREADS', '1'))
+    # Workers are recycled after MAX_REQUESTS (plus up to JITTER, so they do not
+    # all restart at once) or once their RSS passes MAX_RSS_MB; 0 disables either
+    SERVER_MAX_REQUESTS = int(os.getenv('SERVER_MAX_REQUESTS', '10000'))
+    SERVER_MAX_REQUESTS_JITTER = int(os.getenv('SERVER_MAX_REQUESTS_JITTER', '1000'))
+    SERVER_MAX_RSS_MB = int(os.getenv('SERVER_MAX_RSS_MB', '0'))
+    SERVER_TIMEOUT = int(os.getenv('SERVER_TIMEOUT', '30'))
+    SERVER_GRACEFUL_TIMEOUT = int(os.getenv('SERVER_GRACEFUL_TIMEOUT', '30'))
+    
+    # Prometheus metrics at /metrics
+    METRICS_ENABLED = os.getenv('METRICS_ENABLED', 'True') == 'True'
+    # Directory where worker processes share their samples (one file each,
+    # rewritten every METRICS_FLUSH_INTERVAL seconds by a background thread);
+    # empty keeps them per process. 'run.py serve' uses a temporary one when unset
+    METRICS_DIR = os.getenv('METRICS_DIR', '')
+    METRICS_FLUSH_INTERVAL = float(os.getenv('METRICS_FLUSH_INTERVAL', '1'))
+    
+    # Query tracing: log statements slower than SQL_SLOW_QUERY_MS with their
+    # parameters and route, and flag a statement run SQL_REPEAT_THRESHOLD times
+    # in one request as a likely N+1 pattern; 0 turns either check off
+    SQL_TRACE_ENABLED = os.getenv('SQL_TRACE_ENABLED', 'True') == 'True'
+    SQL_SLOW_QUERY_MS = float(os.getenv('SQL_SLOW_QUERY_MS', '200'))
+    SQL_REPEAT_THRESHOLD = int(os.getenv('SQL_REPEAT_THRESHOLD', '5'))
+    # Fail requests that exceed their view's @query_budget instead of logging
+    SQL_QUERY_BUDGET_STRICT = os.getenv('SQL_QUERY_BUDGET_STRICT', 'False') == 'True'
+    
+    # On-demand profiling, off by default. A request sent with the header
+    # 'X-Profile: <PROFILING_TOKEN>' is profiled in PROFILING_MODE (or the mode
+    # named by its X-Profile-Mode header) and answered with a Server-Timing
+    # header splitting its time into db, serialize, compress and handler.
+    # PROFILING_SAMPLE_RATE of other requests (0.01 = 1%) are profiled in
+    # PROFILING_SAMPLE_MODE, without those headers. Modes: cprofile (.prof
+    # files) | stack (stacks sampled every SAMPLE_INTERVAL_MS, at best every
+    # 5 ms switch interval of the interpreter, as collapsed .folded files for
+    # flame graphs) | timing (timings logged, no file).
+    # Files go to PROFILING_DIR, which keeps the newest MAX_FILES of them
+    PROFILING_ENABLED = os.getenv('PROFILING_ENABLED', 'False') == 'True'
+    PROFILING_TOKEN = os.getenv('PROFILING_TOKEN', '')
+    PROFILING_MODE = os.getenv('PROFILING_MODE', 'cprofile')
+    PROFILING_SAMPLE_RATE = float(os.getenv('PROFILING_SAMPLE_RATE', '0'))
+    PROFILING_SAMPLE_MODE = os.getenv('PROFILING_SAMPLE_MODE', 'stack')
+    PROFILING_SAMPLE_INTERVAL_MS = float(os.getenv('PROFILING_SAMPLE_INTERVAL_MS', '5'))
+    PROFILING_DIR = os.getenv('PROFILING_DIR', 'profiles')
+    PROFILING_MAX_FILES = int(os.getenv('PROFILING_MAX_FILES', '1000'))
+    # Blueprints never picked by the sample rate
+    PROFILING_EXEMPT = ('health', 'metrics')
+    
+    # Rate limiting: token buckets per client (verified user, known API key or
+    # IP address) as 'name=<requests>/<second|minute|hour|day>' pairs. default
+    # applies to every request; other names are endpoints (e.g.
+    # suppliers.export_suppliers) or scopes views declare (search). Off unless
+    # enabled; behind a load balancer set RATE_LIMIT_TRUSTED_PROXIES first, and
+    # with several workers a shared RATE_LIMIT_BACKEND
+    RATE_LIMIT_ENABLED = os.getenv('RATE_LIMIT_ENABLED', 'False') == 'True'
+    RATE_LIMITS = os.getenv(
+        'RATE_LIMITS', 'default=1200/minute,search=120/minute,suppliers.export_suppliers=10/minute'
+    )
+    # Bucket store: memory (per worker process) | redis (shared by all workers)
+    RATE_LIMIT_BACKEND = os.getenv('RATE_LIMIT_BACKEND', 'memory')
+    RATE_LIMIT_REDIS_URL = os.getenv('RATE_LIMIT_REDIS_URL', 'redis://localhost:6379/0')
+    RATE_LIMIT_MAX_BUCKETS = int(os.getenv('RATE_LIMIT_MAX_BUCKETS', '100000'))
+    # Comma-separated keys accepted in X-API-Key; each gets its own buckets
+    RATE_LIMIT_API_KEYS = os.getenv('RATE_LIMIT_API_KEYS', '')
+    RATE_LIMIT_EXEMPT = ('health', 'metrics')
+    # Reverse proxies in front of the app whose X-Forwarded-For entries are
+    # trusted (ProxyFix); the client address limits fall back to. 0 uses the
+    # socket peer, which behind a proxy is the proxy itself
+    RATE_LIMIT_TRUSTED_PROXIES = int(os.getenv('RATE_LIMIT_TRUSTED_PROXIES', '0'))
+    
+    # Load shedding, per worker process: answer 503 while this many requests
+    # are in flight or this many threads wait for a pooled connection; 0 disables
+    LOAD_SHED_MAX_IN_FLIGHT = int(os.getenv('LOAD_SHED_MAX_IN_FLIGHT', '0'))
+    LOAD_SHED_MAX_POOL_WAITERS = int(os.getenv('LOAD_SHED_MAX_POOL_WAITERS', '0'))
+    LOAD_SHED_RETRY_AFTER = int(os.getenv('LOAD_SHED_RETRY_AFTER', '1'))
+    
+    # Delta sync: every supplier write is numbered in a change feed that
+    # GET /api/suppliers/changes pages through, CHANGE_FEED_PAGE_SIZE at a time.
+    # Off by default: each write then also bumps one shared counter row (two
+    # statements without UPDATE ... RETURNING) and upserts the changed ids,
+    # and concurrent writers queue on that row until they commit
+    CHANGE_FEED_ENABLED = os.getenv('CHANGE_FEED_ENABLED', 'False') == 'True'
+    CHANGE_FEED_PAGE_SIZE = int(os.getenv('CHANGE_FEED_PAGE_SIZE', '100'))
+    # Server-sent event stream of the feed. Each open stream holds a worker
+    # thread, so they are off by default and capped per worker process; a
+    # stream polls every POLL_SECONDS, sends a comment after HEARTBEAT_SECONDS
+    # without changes and ends after STREAM_SECONDS for the client to reconnect
+    CHANGE_FEED_STREAM_ENABLED = os.getenv('CHANGE_FEED_STREAM_ENABLED', 'False') == 'True'
+    CHANGE_FEED_MAX_STREAMS = int(os.getenv('CHANGE_FEED_MAX_STREAMS', '10'))
+    CHANGE_FEED_POLL_SECONDS = float(os.getenv('CHANGE_FEED_POLL_SECONDS', '1'))
+    CHANGE_FEED_HEARTBEAT_SECONDS = float(os.getenv('CHANGE_FEED_HEARTBEAT_SECONDS', '15'))
+    CHANGE_FEED_STREAM_SECONDS = float(os.getenv('CHANGE_FEED_STREAM_SECONDS', '300'))
+    
+    # Typeahead: GET /api/suppliers/suggest answers from an in-memory prefix
+    # index of supplier and contact names, one per worker process. It is built
+    # at startup and caught up from the change feed every REFRESH_SECONDS, at
+    # once after a write in the same process. Names that would take it past
+    # MAX_MEMORY_MB are left out and responses report complete=false. Needs
+    # CHANGE_FEED_ENABLED, so it is off by default as well
+    SUGGEST_ENABLED = os.getenv('SUGGEST_ENABLED', 'False') == 'True'
+    SUGGEST_MAX_MEMORY_MB = int(os.getenv('SUGGEST_MAX_MEMORY_MB', '64'))
+    SUGGEST_REFRESH_SECONDS = float(os.getenv('SUGGEST_REFRESH_SECONDS', '2'))
+    SUGGEST_BUILD_WAIT_SECONDS = float(os.getenv('SUGGEST_BUILD_WAIT_SECONDS', '5'))
+    SUGGEST_MAX_RESULTS = int(os.getenv('SUGGEST_MAX_RESULTS', '20'))
+    
     # Pagination
     DEFAULT_PAGE_SIZE = 20
     MAX_PAGE_SIZE = 100
+    
+    # Most ids one GET /api/suppliers?ids= may resolve
+    MULTI_GET_MAX_IDS = int(os.getenv('MULTI_GET_MAX_IDS', '100'))
+    
+    # POST /api/batch: most sub-requests per call, and the caller's headers
+    # every sub-request inherits (its own headers take precedence)
+    BATCH_MAX_REQUESTS = int(os.getenv('BATCH_MAX_REQUESTS', '20'))
+    BATCH_FORWARDED_HEADERS = ('Authorization', 'X-API-Key', 'X-Read-From')
+    
+    # Bulk writes: rows per INSERT/UPDATE/DELETE batch (one commit each)
+    # and the largest batch a single bulk request may carry
+    BULK_CHUNK_SIZE = int(os.getenv('BULK_CHUNK_SIZE', '500'))
+    BULK_MAX_ITEMS = int(os.getenv('BULK_MAX_ITEMS', '10000'))
+    
+    # Streaming export: rows fetched per server-side cursor batch
+    EXPORT_BATCH_SIZE = int(os.getenv('EXPORT_BATCH_SIZE', '1000'))
+    
+    # Streaming import: natural keys rows may be upserted on, the default key,
+    # and how many row-level errors are returned in the report
+    IMPORT_UPSERT_KEYS = ('email', 'supplier_name')
+    IMPORT_UPSERT_KEY = os.getenv('IMPORT_UPSERT_KEY', 'email')
+    IMPORT_MAX_ERRORS = int(os.getenv('IMPORT_MAX_ERRORS', '1000'))
 
 
 class DevelopmentConfig(Config):
     """Development configuration"""
     DEBUG = True
+    DB_CREATE_ON_STARTUP = os.getenv('DB_CREATE_ON_STARTUP', 'True') == 'True'
 
 
 class ProductionConfig(Config):
     """Production configuration"""
     DEBUG = False
+    DB_POOL_SIZE = int(os.getenv('DB_POOL_SIZE', '10'))
+    DB_MAX_OVERFLOW = int(os.getenv('DB_MAX_OVERFLOW', '20'))
+    DB_POOL_TIMEOUT = int(os.getenv('DB_POOL_TIMEOUT', '10'))
+
+
+class TestingConfig(Config):
+    """Testing configuration backed by SQLite"""
+    TESTING = True
+    # A file, not sqlite://, so the aiosqlite engine of the async routes sees
+    # the sync engine's rows with SQLite's normal locking and isolation
+    SQLALCHEMY_DATABASE_URI = os.getenv(
+        'TEST_DATABASE_URL', 'sqlite:///' + os.path.join(tempfile.gettempdir(), 'scd-test.db')
+    )
+    DATABASE_REPLICA_URLS = os.getenv('TEST_DATABASE_REPLICA_URLS', '')
+    AUTH_VERIFIER = 'fake'
+    DB_POOL_PRE_PING = 'never'
+    DB_CREATE_ON_STARTUP = True
+    SQL_QUERY_BUDGET_STRICT = True
 
 
 config_by_name = {
     'development': DevelopmentConfig,
     'production': ProductionConfig,
+    'testing': TestingConfig,
     'default': DevelopmentConfig
 }
\ No newline at end of file
@@ -1,5 +1,11 @@
 from .supplier_controller import supplier_bp
+from .supplier_async_controller import supplier_async_bp
+from .health_controller import health_bp
+from .metrics_controller import metrics_bp
 
 __all__ = [
-    'supplier_bp'
+    'supplier_bp',
+    'supplier_async_bp',
+    'health_bp',
+    'metrics_bp'
 ]
\ No newline at end of file
@@ -0,0 +1,44 @@
+from flask import Blueprint, request, current_app
+from ..batch import parse_subrequest, run_subrequest
+from ..utils.response_handler import ResponseHandler
+
+batch_bp = Blueprint('batch', __name__, url_prefix='/api/batch')
+
+
+@batch_bp.route('', methods=['POST'])
+def run_batch():
+    """
+    Run several API requests in one round trip, in order
+    Request body: {"requests": [{"method": "GET", "path": "/api/suppliers/1"},
+                                {"method": "PATCH", "path": "/api/suppliers/2",
+                                 "body": {...}, "headers": {"If-Match": "..."}}]}
+    Sub-requests inherit the caller's Authorization, X-API-Key and X-Read-From
+    headers and share its database session. Each is authorized, rate limited
+    and budgeted on its own; one failing does not stop the rest. Streaming
+    endpoints (exports, change streams) cannot be batched
+    Returns one {status, headers, body} per sub-request
+    """
+    try:
+        data = request.get_json(silent=True) or {}
+        specs = data.get('requests') if isinstance(data, dict) else None
+        
+        if not isinstance(specs, list) or not specs:
+            return ResponseHandler.bad_request("requests must be a non-empty list")
+        
+        max_requests = current_app.config['BATCH_MAX_REQUESTS']
+        if len(specs) > max_requests:
+            return ResponseHandler.bad_request(f"A batch may contain at most {max_requests} requests")
+        
+        subrequests = [parse_subrequest(spec) for spec in specs]
+        responses = [run_subrequest(**subrequest) for subrequest in subrequests]
+        
+        failed = sum(1 for response in responses if response['status'] >= 400)
+        return ResponseHandler.success(
+            responses,
+            f"{len(responses) - failed} requests succeeded, {failed} failed"
+        )
+    
+    except ValueError as e:
+        return ResponseHandler.bad_request(str(e))
+    except Exception as e:
+        return ResponseHandler.error(f"Failed to run batch: {str(e)}", 500)
\ No newline at end of file
@@ -0,0 +1,72 @@
+import time
+from flask import Blueprint, current_app
+from sqlalchemy import text
+from sqlalchemy.exc import SQLAlchemyError, TimeoutError as PoolTimeoutError
+from .. import db
+from ..db_pool import pool_status
+from ..db_routing import replica_engines
+from ..utils.response_handler import ResponseHandler
+
+health_bp = Blueprint('health', __name__, url_prefix='/health')
+
+
+@health_bp.route('', methods=['GET'])
+def health_check():
+    """Liveness: the process is up, without touching the database"""
+    return {'success': True, 'message': 'Server is running'}, 200
+
+
+@health_bp.route('/ready', methods=['GET'])
+def readiness_check():
+    """
+    Readiness: round trip to the database and each read replica, plus this
+    worker's pool statistics
+    Returns 503 when any of them cannot be reached
+    Pool figures are per worker process
+    """
+    database = _probe(db.engine)
+    report = {'database': database, 'pool': pool_status(db.engine, current_app.config)}
+    
+    replicas = replica_engines(current_app) or {}
+    if replicas:
+        report['replicas'] = {
+            key: dict(_probe(engine), pool=pool_status(engine, current_app.config))
+            for key, engine in replicas.items()
+        }
+    
+    # The asyncio engine only exists once an async route has been used
+    async_database = current_app.extensions.get('async_database')
+    if async_database is not None:
+        report['async_pool'] = pool_status(async_database.engine.sync_engine, current_app.config)
+        serving = async_database.serving_engines()
+        if serving:
+            report['async_serving_pools'] = [pool_status(engine.sync_engine, current_app.config) for engine in serving]
+    
+    if database['status'] != 'up':
+        return ResponseHandler.error("Database unavailable", 503, errors=report)
+    
+    # Routed reads would fail against a replica that is down
+    if any(replica['status'] != 'up' for replica in report.get('replicas', {}).values()):
+        return ResponseHandler.error("Read replica unavailable", 503, errors=report)
+    
+    return ResponseHandler.success(report, "Ready")
+
+
+def _probe(engine) -> dict:
+    """Time a connection checkout and a SELECT 1 on engine"""
+    started = time.perf_counter()
+    try:
+        with engine.connect() as connection:
+            checked_out = time.perf_counter()
+            connection.execute(text('SELECT 1'))
+            finished = time.perf_counter()
+    except SQLAlchemyError as e:
+        # Driver messages can carry hosts and user names; the log keeps them
+        current_app.logger.exception("Readiness probe failed for %s", engine.url)
+        return {'status': 'down', 'error': 'pool_timeout' if isinstance(e, PoolTimeoutError) else 'unreachable'}
+    
+    return {
+        'status': 'up',
+        'checkout_ms': round((checked_out - started) * 1000, 3),
+        'latency_ms': round((finished - checked_out) * 1000, 3)
+    }
\ No newline at end of file
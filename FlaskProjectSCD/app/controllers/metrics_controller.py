@@ -0,0 +1,14 @@
+from flask import Blueprint, Response, current_app
+from ..metrics import CONTENT_TYPE, collect, render
+
+metrics_bp = Blueprint('metrics', __name__)
+
+
+@metrics_bp.route('/metrics', methods=['GET'])
+def metrics():
+    """
+    Request, SQL and error metrics in Prometheus text format
+    With METRICS_DIR set, covers every worker process sharing it
+    """
+    snapshot = collect(current_app.extensions['metrics'], current_app.config['METRICS_DIR'])
+    return Response(render(snapshot), content_type=CONTENT_TYPE)
\ No newline at end of file
@@ -0,0 +1,242 @@
+from flask import Blueprint, request
+from ..services.async_supplier_service import AsyncSupplierService
+from ..compression import compress, cached_response
+from ..middleware.rate_limit import rate_limit_scope
+from ..profiling import timed
+from ..query_trace import query_budget
+from ..utils.response_handler import ResponseHandler
+from ..utils.conditional import make_etag, make_version_etag, is_not_modified, VersionConflict
+from .supplier_controller import _get_fields, _get_expected_version, _version_conflict, _with_version_etag
+
+# Same contract as /api/suppliers, served by async views over the asyncio engine,
+# so both paths can be load-tested side by side
+supplier_async_bp = Blueprint('suppliers_async', __name__, url_prefix='/api/async/suppliers')
+supplier_service = AsyncSupplierService()
+
+
+@supplier_async_bp.route('', methods=['GET'])
+@query_budget(3)
+@compress(cache=True)
+@rate_limit_scope('search', when=lambda: bool(request.args.get('search')))
+async def get_suppliers():
+    """
+    Get all suppliers with pagination
+    Query params: page, per_page, search, fields, after, sort, total (see /api/suppliers)
+    """
+    try:
+        page = request.args.get('page', 1, type=int)
+        per_page = request.args.get('per_page', 20, type=int)
+        search = request.args.get('search', None)
+        fields = _get_fields()
+        
+        count, last_modified = await supplier_service.get_suppliers_fingerprint()
+        etag = make_etag('suppliers', count, last_modified, request.query_string.decode())
+        
+        if is_not_modified(etag):
+            return ResponseHandler.not_modified(etag, last_modified)
+        
+        # The same page encoded for an earlier request, when its body is cached
+        cached = cached_response(etag)
+        if cached is not None:
+            return ResponseHandler.with_validators(cached, etag, last_modified)
+        
+        if 'after' in request.args:
+            result = await _get_suppliers_after(search, per_page, fields)
+        else:
+            if search:
+                suppliers, total = await supplier_service.search_suppliers(search, page, per_page, fields)
+            else:
+                suppliers, total = await supplier_service.get_all_suppliers(page, per_page, fields)
+            
+            with timed('serialize'):
+                suppliers_data = suppliers if fields else [s.to_dict() for s in suppliers]
+            
+            result = ResponseHandler.paginated(
+                suppliers_data, total, page, per_page,
+                "Suppliers retrieved successfully"
+            )
+        
+        if result[1] != 200:
+            return result
+        
+        return ResponseHandler.with_validators(result, etag, last_modified)
+    
+    except ValueError as e:
+        return ResponseHandler.bad_request(str(e))
+    except Exception as e:
+        return ResponseHandler.error(f"Failed to get suppliers: {str(e)}", 500)
+
+
+async def _get_suppliers_after(search, per_page, fields=None):
+    """Serve a keyset-paginated suppliers page"""
+    after = request.args.get('after')
+    sort = request.args.get('sort', 'supplier_id')
+    total = request.args.get('total', 'none')
+    
+    if total not in ('none', 'estimate', 'exact'):
+        return ResponseHandler.bad_request("total must be one of: none, estimate, exact")
+    
+    if search:
+        result = await supplier_service.search_suppliers_after(search, after, sort, per_page, total, fields)
+    else:
+        result = await supplier_service.get_suppliers_after(after, sort, per_page, total, fields)
+    
+    with timed('serialize'):
+        suppliers_data = result['items'] if fields else [s.to_dict() for s in result['items']]
+    
+    return ResponseHandler.paginated(
+        suppliers_data, result['total'], None, per_page,
+        "Suppliers retrieved successfully",
+        next_cursor=result['next_cursor'],
+        total_estimated=result['total_estimated']
+    )
+
+
+@supplier_async_bp.route('/<int:supplier_id>', methods=['GET'])
+@query_budget(2)
+async def get_supplier(supplier_id):
+    """
+    Get supplier by ID
+    Query params: fields (comma-separated column names)
+    """
+    try:
+        fields = _get_fields()
+        validators = await supplier_service.get_supplier_validators(supplier_id)
+        
+        if validators is None:
+            return ResponseHandler.not_found("Supplier not found")
+        
+        updated_at, version = validators
+        etag = make_version_etag(version, 'supplier', supplier_id, updated_at, request.query_string.decode())
+        if is_not_modified(etag, updated_at):
+            return ResponseHandler.not_modified(etag, updated_at)
+        
+        if fields:
+            supplier_data = await supplier_service.get_supplier_fields(supplier_id, fields)
+        else:
+            supplier = await supplier_service.get_supplier(supplier_id)
+            supplier_data = supplier.to_dict() if supplier else None
+        
+        if not supplier_data:
+            return ResponseHandler.not_found("Supplier not found")
+        
+        return ResponseHandler.with_validators(
+            ResponseHandler.success(
+                supplier_data,
+                "Supplier retrieved successfully"
+            ),
+            etag, updated_at
+        )
+    
+    except ValueError as e:
+        return ResponseHandler.bad_request(str(e))
+    except Exception as e:
+        return ResponseHandler.error(f"Failed to get supplier: {str(e)}", 500)
+
+
+@supplier_async_bp.route('', methods=['POST'])
+@query_budget(5)
+async def create_supplier():
+    """Create a new supplier (same body as POST /api/suppliers)"""
+    try:
+        data = request.get_json()
+        
+        # Validate required fields
+        if 'supplier_name' not in data:
+            return ResponseHandler.bad_request("supplier_name is required")
+        
+        supplier = await supplier_service.create_supplier(data)
+        
+        return ResponseHandler.created(
+            supplier.to_dict(),
+            "Supplier created successfully"
+        )
+    
+    except ValueError as e:
+        return ResponseHandler.bad_request(str(e))
+    except Exception as e:
+        return ResponseHandler.error(f"Failed to create supplier: {str(e)}", 500)
+
+
+@supplier_async_bp.route('/<int:supplier_id>', methods=['PUT'])
+@query_budget(6)
+async def update_supplier(supplier_id):
+    """
+    Update supplier
+    Conditional on If-Match or a "version" field like PATCH
+    """
+    try:
+        data = request.get_json()
+        expected_version = _get_expected_version(data)
+        
+        supplier = await supplier_service.update_supplier(supplier_id, data, expected_version)
+        
+        return _with_version_etag(ResponseHandler.success(
+            supplier.to_dict(),
+            "Supplier updated successfully"
+        ), supplier)
+    
+    except VersionConflict as e:
+        return _version_conflict(e)
+    except ValueError as e:
+        return ResponseHandler.bad_request(str(e))
+    except Exception as e:
+        return ResponseHandler.error(f"Failed to update supplier: {str(e)}", 500)
+
+
+@supplier_async_bp.route('/<int:supplier_id>', methods=['PATCH'])
+# Worst case as for PATCH /api/suppliers/<id>
+@query_budget(7)
+async def patch_supplier(supplier_id):
+    """
+    Change some fields of a supplier with one conditional UPDATE
+    (same body, If-Match and version rules as PATCH /api/suppliers/<id>)
+    """
+    try:
+        data = request.get_json()
+        if not isinstance(data, dict):
+            return ResponseHandler.bad_request("Request body must be a JSON object")
+        expected_version = _get_expected_version(data)
+        
+        supplier = await supplier_service.patch_supplier(supplier_id, data, expected_version)
+        
+        if not supplier:
+            return ResponseHandler.not_found("Supplier not found")
+        
+        return _with_version_etag(ResponseHandler.success(
+            supplier.to_dict(),
+            "Supplier updated successfully"
+        ), supplier)
+    
+    except VersionConflict as e:
+        return _version_conflict(e)
+    except ValueError as e:
+        return ResponseHandler.bad_request(str(e))
+    except Exception as e:
+        return ResponseHandler.error(f"Failed to update supplier: {str(e)}", 500)
+
+
+@supplier_async_bp.route('/<int:supplier_id>', methods=['DELETE'])
+# Worst case as for DELETE /api/suppliers/<id>
+@query_budget(6)
+async def delete_supplier(supplier_id):
+    """
+    Delete supplier with one DELETE and no read before it
+    Conditional on If-Match (412 when stale) or ?version= (409 when stale)
+    """
+    try:
+        expected_version = _get_expected_version({'version': request.args.get('version', type=int)})
+        
+        await supplier_service.delete_supplier(supplier_id, expected_version)
+        
+        return ResponseHandler.success(
+            None,
+            "Supplier deleted successfully"
+        )
+    
+    except VersionConflict as e:
+        return _version_conflict(e)
+    except ValueError as e:
+        return ResponseHandler.bad_request(str(e))
+    except Exception as e:
+        return ResponseHandler.error(f"Failed to delete supplier: {str(e)}", 500)
\ No newline at end of file
@@ -1,57 +1,394 @@
-from flask import Blueprint, request
+import io
+import threading
+from flask import Blueprint, request, current_app, Response, stream_with_context
 from ..services.supplier_service import SupplierService
+from ..models.supplier import Supplier
+from ..compression import compress, cached_response
+from ..middleware.rate_limit import rate_limit_scope
+from ..profiling import timed
+from ..query_trace import query_budget
 from ..utils.response_handler import ResponseHandler
+from ..utils.streaming import ndjson_stream, csv_stream, sse_event, iter_ndjson, iter_csv
+from ..utils.conditional import (
+    make_etag, make_version_etag, is_not_modified, if_match_version, VersionConflict
+)
 
 supplier_bp = Blueprint('suppliers', __name__, url_prefix='/api/suppliers')
 supplier_service = SupplierService()
 
 
 @supplier_bp.route('', methods=['GET'])
+@query_budget(3)
+@compress(cache=True)
+@rate_limit_scope('search', when=lambda: bool(request.args.get('search')))
 def get_suppliers():
     """
     Get all suppliers with pagination
-    Query params: page, per_page, search
+    Query params: page, per_page, search, fields (comma-separated column names)
+    Multi-get: ids (comma-separated) resolves those suppliers with one query
+        instead, in the order given; ids that do not exist are listed in missing
+    Cursor mode (opt-in): after, sort, total
+        after: opaque cursor from the previous page's next_cursor (empty for the first page)
+        sort: supplier_id | supplier_name | created_at
+        total: none | estimate | exact
+    Supports If-None-Match / If-Modified-Since, answered from a count and
+    MAX(updated_at) fingerprint before any supplier row is loaded
     """
     try:
         page = request.args.get('page', 1, type=int)
         per_page = request.args.get('per_page', 20, type=int)
         search = request.args.get('search', None)
+        fields = _get_fields()
         
-        if search:
-            suppliers, total = supplier_service.search_suppliers(search, page, per_page)
+        if 'ids' in request.args:
+            return _get_suppliers_by_ids(fields)
+        
+        # Every write changes the count or MAX(updated_at), so the pair
+        # validates any page of the list; the query string selects the page
+        count, last_modified = supplier_service.get_suppliers_fingerprint()
+        etag = make_etag('suppliers', count, last_modified, request.query_string.decode())
+        
+        # A delete can leave MAX(updated_at) unchanged, so a date alone is
+        # never enough to answer 304 for a list
+        if is_not_modified(etag):
+            return ResponseHandler.not_modified(etag, last_modified)
+        
+        # The same page encoded for an earlier request, when its body is cached
+        cached = cached_response(etag)
+        if cached is not None:
+            return ResponseHandler.with_validators(cached, etag, last_modified)
+        
+        if 'after' in request.args:
+            result = _get_suppliers_after(search, per_page, fields)
         else:
-            suppliers, total = supplier_service.get_all_suppliers(page, per_page)
+            if search:
+                suppliers, total = supplier_service.search_suppliers(search, page, per_page, fields)
+            else:
+                suppliers, total = supplier_service.get_all_suppliers(page, per_page, fields)
+            
+            with timed('serialize'):
+                suppliers_data = suppliers if fields else [s.to_dict() for s in suppliers]
+            
+            result = ResponseHandler.paginated(
+                suppliers_data, total, page, per_page,
+                "Suppliers retrieved successfully"
+            )
         
-        suppliers_data = [s.to_dict() for s in suppliers]
+        if result[1] != 200:
+            return result
         
-        return ResponseHandler.paginated(
-            suppliers_data, total, page, per_page,
-            "Suppliers retrieved successfully"
-        )
+        return ResponseHandler.with_validators(result, etag, last_modified)
     
+    except ValueError as e:
+        return ResponseHandler.bad_request(str(e))
     except Exception as e:
         return ResponseHandler.error(f"Failed to get suppliers: {str(e)}", 500)
 
 
+def _get_fields():
+    """Parse ?fields=a,b,c into a list, or None when absent"""
+    fields = request.args.get('fields')
+    if not fields:
+        return None
+    return [field.strip() for field in fields.split(',') if field.strip()]
+
+
+def _get_suppliers_by_ids(fields=None):
+    """Serve ?ids=1,2,3 from one IN query, skipping the list fingerprint"""
+    try:
+        supplier_ids = [int(value) for value in request.args['ids'].split(',') if value.strip()]
+    except ValueError:
+        return ResponseHandler.bad_request("ids must be comma-separated integers")
+    
+    suppliers, missing = supplier_service.get_suppliers_by_ids(supplier_ids, fields)
+    with timed('serialize'):
+        suppliers_data = suppliers if fields else [s.to_dict() for s in suppliers]
+    
+    return ResponseHandler.success(
+        suppliers_data,
+        f"{len(suppliers_data)} suppliers retrieved, {len(missing)} not found",
+        missing=missing
+    )
+
+
+def _get_suppliers_after(search, per_page, fields=None):
+    """Serve a keyset-paginated suppliers page"""
+    after = request.args.get('after')
+    sort = request.args.get('sort', 'supplier_id')
+    total = request.args.get('total', 'none')
+    
+    if total not in ('none', 'estimate', 'exact'):
+        return ResponseHandler.bad_request("total must be one of: none, estimate, exact")
+    
+    if search:
+        result = supplier_service.search_suppliers_after(search, after, sort, per_page, total, fields)
+    else:
+        result = supplier_service.get_suppliers_after(after, sort, per_page, total, fields)
+    
+    with timed('serialize'):
+        suppliers_data = result['items'] if fields else [s.to_dict() for s in result['items']]
+    
+    return ResponseHandler.paginated(
+        suppliers_data, result['total'], None, per_page,
+        "Suppliers retrieved successfully",
+        next_cursor=result['next_cursor'],
+        total_estimated=result['total_estimated']
+    )
+
+
+@supplier_bp.route('/suggest', methods=['GET'])
+@query_budget(0)
+def suggest_suppliers():
+    """
+    Typeahead for supplier pickers, served from memory
+    Query params: q (matched against the start of any word of the supplier
+    name or contact person, ignoring case and accents), limit (default 10)
+    complete is false while the index is still building or when it hit
+    SUGGEST_MAX_MEMORY_MB, so some suppliers may be missing
+    """
+    try:
+        if not current_app.config['SUGGEST_ENABLED']:
+            return ResponseHandler.not_found("Suggestions are disabled")
+        
+        suggestions = supplier_service.suggest_suppliers(
+            request.args.get('q', ''),
+            request.args.get('limit', 10, type=int)
+        )
+        
+        return ResponseHandler.success(suggestions, "Suggestions retrieved successfully")
+    
+    except ValueError as e:
+        return ResponseHandler.bad_request(str(e))
+    except Exception as e:
+        return ResponseHandler.error(f"Failed to get suggestions: {str(e)}", 500)
+
+
+@supplier_bp.route('/export', methods=['GET'])
+@compress(level=4)
+def export_suppliers():
+    """
+    Stream all suppliers without loading them into memory
+    Query params: format (ndjson | csv), search, fields
+    Compressed at a lower level than pages: exports are large, so CPU per
+    byte matters more than the last few percent of ratio
+    """
+    try:
+        export_format = request.args.get('format', 'ndjson')
+        search = request.args.get('search', None)
+        fields = _get_fields()
+        batch_size = current_app.config['EXPORT_BATCH_SIZE']
+        
+        if export_format not in ('ndjson', 'csv'):
+            return ResponseHandler.bad_request("format must be one of: ndjson, csv")
+        
+        rows = supplier_service.export_suppliers(search, fields)
+        
+        if export_format == 'csv':
+            fieldnames = fields or [column.key for column in Supplier.__table__.columns]
+            body, mimetype = csv_stream(rows, fieldnames, batch_size), 'text/csv'
+        else:
+            body, mimetype = ndjson_stream(rows, batch_size), 'application/x-ndjson'
+        
+        return Response(
+            stream_with_context(body),
+            mimetype=mimetype,
+            headers={'Content-Disposition': f'attachment; filename=suppliers.{export_format}'}
+        )
+    
+    except ValueError as e:
+        return ResponseHandler.bad_request(str(e))
+    except Exception as e:
+        return ResponseHandler.error(f"Failed to export suppliers: {str(e)}", 500)
+
+
+@supplier_bp.route('/stats', methods=['GET'])
+@query_budget(2)
+def get_supplier_stats():
+    """
+    Supplier counts for dashboards, read from pre-aggregated summary cells
+    Query params:
+        by: day | week | month | domain | completeness (default month)
+        from, to: first and last bucket, e.g. 2024-01-01, 2024-W05, 2024-01
+        limit: most buckets returned (default 100); domains come largest first
+    """
+    try:
+        stats = supplier_service.get_supplier_stats(
+            request.args.get('by', 'month'),
+            request.args.get('from'),
+            request.args.get('to'),
+            request.args.get('limit', 100, type=int)
+        )
+        
+        return ResponseHandler.success(stats, "Supplier stats retrieved successfully")
+    
+    except ValueError as e:
+        return ResponseHandler.bad_request(str(e))
+    except Exception as e:
+        return ResponseHandler.error(f"Failed to get supplier stats: {str(e)}", 500)
+
+
+@supplier_bp.route('/changes', methods=['GET'])
+@query_budget(2)
+def get_supplier_changes():
+    """
+    Delta sync: suppliers created, updated or deleted since a token
+    Query params:
+        since: next_token of the previous response; omit it to get the
+            current token without any items
+        limit: most changes returned (default CHANGE_FEED_PAGE_SIZE)
+    Each supplier appears once, at its latest write; deletes are tombstones
+    with supplier set to null. Keep requesting with next_token while has_more
+    """
+    try:
+        if not current_app.config['CHANGE_FEED_ENABLED']:
+            return ResponseHandler.not_found("Change feed is disabled")
+        
+        changes = supplier_service.get_supplier_changes(
+            _get_change_token(request.args.get('since')),
+            request.args.get('limit', current_app.config['CHANGE_FEED_PAGE_SIZE'], type=int)
+        )
+        
+        return ResponseHandler.success(changes, "Supplier changes retrieved successfully")
+    
+    except ValueError as e:
+        return ResponseHandler.bad_request(str(e))
+    except Exception as e:
+        return ResponseHandler.error(f"Failed to get supplier changes: {str(e)}", 500)
+
+
+@supplier_bp.route('/changes/stream', methods=['GET'])
+@query_budget(1)
+def stream_supplier_changes():
+    """
+    The change feed as server-sent events, one 'change' event per item of
+    GET /changes with the sequence number as its id
+    Starts after the Last-Event-ID header or the since query param, else at
+    the current token. The stream ends after CHANGE_FEED_STREAM_SECONDS and
+    EventSource reconnects from the last id it received
+    """
+    try:
+        config = current_app.config
+        if not config['CHANGE_FEED_ENABLED'] or not config['CHANGE_FEED_STREAM_ENABLED']:
+            return ResponseHandler.not_found("Change stream is disabled")
+        
+        since = _get_change_token(request.headers.get('Last-Event-ID') or request.args.get('since'))
+        if since is None:
+            since = supplier_service.get_supplier_changes()['next_token']
+        
+        slots = _change_stream_slots()
+        if not slots.acquire(blocking=False):
+            return ResponseHandler.unavailable(
+                "Too many change streams open, retry shortly", int(config['CHANGE_FEED_POLL_SECONDS']) + 1
+            )
+        
+        pages = supplier_service.poll_supplier_changes(
+            since, config['CHANGE_FEED_PAGE_SIZE'], config['CHANGE_FEED_POLL_SECONDS'],
+            config['CHANGE_FEED_HEARTBEAT_SECONDS'], config['CHANGE_FEED_STREAM_SECONDS']
+        )
+        
+        def events():
+            yield f"retry: {int(config['CHANGE_FEED_POLL_SECONDS'] * 1000)}\n\n"
+            for page in pages:
+                if page is None:
+                    # A comment line keeps proxies from closing an idle connection
+                    yield ': heartbeat\n\n'
+                    continue
+                for item in page['items']:
+                    yield sse_event(item, event='change', event_id=item['seq'])
+        
+        response = Response(
+            stream_with_context(events()),
+            mimetype='text/event-stream',
+            headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+        )
+        # Released when the server closes the response, even if the stream never started
+        response.call_on_close(slots.release)
+        return response
+    
+    except ValueError as e:
+        return ResponseHandler.bad_request(str(e))
+    except Exception as e:
+        return ResponseHandler.error(f"Failed to stream supplier changes: {str(e)}", 500)
+
+
+@supplier_bp.route('/import', methods=['POST'])
+def import_suppliers():
+    """
+    Upsert suppliers from a CSV or NDJSON file, parsed as it streams in
+    Send the file as the raw request body or as a multipart 'file' field
+    Query params: format (ndjson | csv), key (email | supplier_name)
+    """
+    try:
+        import_format = request.args.get('format', 'ndjson')
+        key = request.args.get('key', current_app.config['IMPORT_UPSERT_KEY'])
+        
+        if import_format not in ('ndjson', 'csv'):
+            return ResponseHandler.bad_request("format must be one of: ndjson, csv")
+        
+        upload = request.files.get('file')
+        raw = upload.stream if upload else io.BufferedReader(request.stream)
+        text_stream = io.TextIOWrapper(raw, encoding='utf-8-sig', newline='')
+        
+        rows = iter_csv(text_stream) if import_format == 'csv' else iter_ndjson(text_stream)
+        report = supplier_service.import_suppliers(rows, key)
+        
+        return ResponseHandler.success(
+            report,
+            f"{report['accepted']} suppliers imported, {report['rejected']} rejected"
+        )
+    
+    except ValueError as e:
+        return ResponseHandler.bad_request(str(e))
+    except Exception as e:
+        return ResponseHandler.error(f"Failed to import suppliers: {str(e)}", 500)
+
+
 @supplier_bp.route('/<int:supplier_id>', methods=['GET'])
+@query_budget(2)
 def get_supplier(supplier_id):
-    """Get supplier by ID"""
+    """
+    Get supplier by ID
+    Query params: fields (comma-separated column names)
+    Supports If-None-Match / If-Modified-Since, answered from updated_at and
+    version alone; the ETag carries the version for If-Match on writes
+    """
     try:
-        supplier = supplier_service.get_supplier(supplier_id)
+        fields = _get_fields()
+        validators = supplier_service.get_supplier_validators(supplier_id)
         
-        if not supplier:
+        if validators is None:
             return ResponseHandler.not_found("Supplier not found")
         
-        return ResponseHandler.success(
-            supplier.to_dict(),
-            "Supplier retrieved successfully"
+        updated_at, version = validators
+        etag = make_version_etag(version, 'supplier', supplier_id, updated_at, request.query_string.decode())
+        if is_not_modified(etag, updated_at):
+            return ResponseHandler.not_modified(etag, updated_at)
+        
+        if fields:
+            supplier_data = supplier_service.get_supplier_fields(supplier_id, fields)
+        else:
+            supplier = supplier_service.get_supplier(supplier_id)
+            supplier_data = supplier.to_dict() if supplier else None
+        
+        if not supplier_data:
+            return ResponseHandler.not_found("Supplier not found")
+        
+        return ResponseHandler.with_validators(
+            ResponseHandler.success(
+                supplier_data,
+                "Supplier retrieved successfully"
+            ),
+            etag, updated_at
         )
     
+    except ValueError as e:
+        return ResponseHandler.bad_request(str(e))
     except Exception as e:
         return ResponseHandler.error(f"Failed to get supplier: {str(e)}", 500)
 
 
 @supplier_bp.route('', methods=['POST'])
+@query_budget(6)
 def create_supplier():
     """
     Create a new supplier
@@ -84,21 +421,68 @@ def create_supplier():
 
 
 @supplier_bp.route('/<int:supplier_id>', methods=['PUT'])
+@query_budget(7)
 def update_supplier(supplier_id):
-    """Update supplier"""
+    """
+    Update supplier
+    Conditional on If-Match or a "version" field like PATCH
+    """
     try:
         data = request.get_json()
+        expected_version = _get_expected_version(data)
         
-        supplier = supplier_service.update_supplier(supplier_id, data)
+        supplier = supplier_service.update_supplier(supplier_id, data, expected_version)
         
         if not supplier:
             return ResponseHandler.not_found("Supplier not found")
         
-        return ResponseHandler.success(
+        return _with_version_etag(ResponseHandler.success(
             supplier.to_dict(),
             "Supplier updated successfully"
-        )
+        ), supplier)
     
+    except VersionConflict as e:
+        return _version_conflict(e)
+    except ValueError as e:
+        return ResponseHandler.bad_request(str(e))
+    except Exception as e:
+        return ResponseHandler.error(f"Failed to update supplier: {str(e)}", 500)
+
+
+@supplier_bp.route('/<int:supplier_id>', methods=['PATCH'])
+# At most: locking read, UPDATE, SELECT without RETURNING, summary upsert and
+# three change feed statements; a plain field on SQLite takes the UPDATE and
+# the FTS5 sync
+@query_budget(7)
+def patch_supplier(supplier_id):
+    """
+    Change some fields of a supplier with one conditional UPDATE and no read
+    before it (fields the stats count by, such as email or phone, lock and
+    read the row first so the summary counts move from the old values; the
+    search index sync and the change feed add their own statements)
+    Request body: {"phone": "+1234567890", "version": 3}
+    The write only applies while the supplier is still at the version from
+    If-Match (an ETag from GET; 412 when stale) or from the "version" field
+    (409 when stale); with neither, the last writer wins
+    """
+    try:
+        data = request.get_json()
+        if not isinstance(data, dict):
+            return ResponseHandler.bad_request("Request body must be a JSON object")
+        expected_version = _get_expected_version(data)
+        
+        supplier = supplier_service.patch_supplier(supplier_id, data, expected_version)
+        
+        if not supplier:
+            return ResponseHandler.not_found("Supplier not found")
+        
+        return _with_version_etag(ResponseHandler.success(
+            supplier.to_dict(),
+            "Supplier updated successfully"
+        ), supplier)
+    
+    except VersionConflict as e:
+        return _version_conflict(e)
     except ValueError as e:
         return ResponseHandler.bad_request(str(e))
     except Exception as e:
@@ -106,10 +490,19 @@ def update_supplier(supplier_id):
 
 
 @supplier_bp.route('/<int:supplier_id>', methods=['DELETE'])
+# At most: locking read without DELETE RETURNING, DELETE, summary upsert and
+# three change feed statements
+@query_budget(6)
 def delete_supplier(supplier_id):
-    """Delete supplier"""
+    """
+    Delete supplier with one DELETE and no read before it, besides the
+    summary, search index and change feed statements
+    Conditional on If-Match (412 when stale) or ?version= (409 when stale)
+    """
     try:
-        success = supplier_service.delete_supplier(supplier_id)
+        expected_version = _get_expected_version({'version': request.args.get('version', type=int)})
+        
+        success = supplier_service.delete_supplier(supplier_id, expected_version)
         
         if not success:
             return ResponseHandler.not_found("Supplier not found")
@@ -119,7 +512,144 @@ def delete_supplier(supplier_id):
             "Supplier deleted successfully"
         )
     
+    except VersionConflict as e:
+        return _version_conflict(e)
     except ValueError as e:
         return ResponseHandler.bad_request(str(e))
     except Exception as e:
-        return ResponseHandler.error(f"Failed to delete supplier: {str(e)}", 500)
\ No newline at end of file
+        return ResponseHandler.error(f"Failed to delete supplier: {str(e)}", 500)
+
+
+@supplier_bp.route('/bulk', methods=['POST'])
+def bulk_create_suppliers():
+    """
+    Create many suppliers in one request
+    Request body: {"items": [{"supplier_name": "...", ...}, ...]}
+    """
+    try:
+        items, error = _get_bulk_payload('items')
+        if error:
+            return error
+        
+        results = supplier_service.bulk_create_suppliers(items)
+        return _bulk_response(results, "created")
+    
+    except Exception as e:
+        return ResponseHandler.error(f"Failed to create suppliers: {str(e)}", 500)
+
+
+@supplier_bp.route('/bulk', methods=['PATCH'])
+def bulk_update_suppliers():
+    """
+    Update many suppliers in one request
+    Request body: {"items": [{"supplier_id": 1, "phone": "..."}, ...]}
+    """
+    try:
+        items, error = _get_bulk_payload('items')
+        if error:
+            return error
+        
+        results = supplier_service.bulk_update_suppliers(items)
+        return _bulk_response(results, "updated")
+    
+    except Exception as e:
+        return ResponseHandler.error(f"Failed to update suppliers: {str(e)}", 500)
+
+
+@supplier_bp.route('/bulk', methods=['DELETE'])
+def bulk_delete_suppliers():
+    """
+    Delete many suppliers in one request
+    Request body: {"ids": [1, 2, 3]}
+    """
+    try:
+        supplier_ids, error = _get_bulk_payload('ids')
+        if error:
+            return error
+        
+        if not all(isinstance(supplier_id, int) for supplier_id in supplier_ids):
+            return ResponseHandler.bad_request("ids must be a list of integers")
+        
+        results = supplier_service.bulk_delete_suppliers(supplier_ids)
+        return _bulk_response(results, "deleted")
+    
+    except Exception as e:
+        return ResponseHandler.error(f"Failed to delete suppliers: {str(e)}", 500)
+
+
+def _get_change_token(value):
+    """Parse a change feed token, None when absent"""
+    if value is None or value == '':
+        return None
+    try:
+        return int(value)
+    except ValueError:
+        raise ValueError("since must be a token from a previous response")
+
+
+def _change_stream_slots():
+    """Semaphore capping this worker process's open change streams"""
+    slots = current_app.extensions.get('change_streams')
+    if slots is None:
+        slots = current_app.extensions.setdefault(
+            'change_streams', threading.BoundedSemaphore(current_app.config['CHANGE_FEED_MAX_STREAMS'])
+        )
+    return slots
+
+
+def _get_expected_version(data):
+    """
+    Version a write is conditional on: the If-Match ETag, else data["version"]
+    The version is always removed from data, since clients never set it
+    """
+    version = data.pop('version', None) if isinstance(data, dict) else None
+    if version is not None and (isinstance(version, bool) or not isinstance(version, int)):
+        raise ValueError("version must be an integer")
+    
+    if_match = if_match_version()
+    return if_match if if_match is not None else version
+
+
+def _version_conflict(error):
+    """412 when the write was pinned by If-Match, 409 when by a version in the request"""
+    errors = {'current_version': error.current_version}
+    if request.if_match:
+        return ResponseHandler.precondition_failed(str(error), errors)
+    return ResponseHandler.conflict(str(error), errors)
+
+
+def _with_version_etag(result, supplier):
+    """Attach the ETag a GET of the written supplier would return, for the next If-Match"""
+    etag = make_version_etag(supplier.version, 'supplier', supplier.supplier_id, supplier.updated_at, '')
+    return ResponseHandler.with_validators(result, etag, supplier.updated_at)
+
+
+def _get_bulk_payload(key):
+    """
+    Read the list under key from the JSON body
+    Returns: (items, None) or (None, error_response)
+    """
+    data = request.get_json(silent=True) or {}
+    items = data.get(key) if isinstance(data, dict) else None
+    
+    if not isinstance(items, list) or not items:
+        return None, ResponseHandler.bad_request(f"{key} must be a non-empty list")
+    
+    max_items = current_app.config['BULK_MAX_ITEMS']
+    if len(items) > max_items:
+        return None, ResponseHandler.bad_request(f"A bulk request may contain at most {max_items} items")
+    
+    return items, None
+
+
+def _bulk_response(results, action):
+    """Summarize per-item bulk results"""
+    failed = sum(1 for result in results if not result['success'])
+    succeeded = len(results) - failed
+    
+    return ResponseHandler.success(
+        results,
+        f"{succeeded} suppliers {action}, {failed} failed",
+        succeeded=succeeded,
+        failed=failed
+    )
\ No newline at end of file
@@ -0,0 +1,202 @@
+import os
+import threading
+import time
+from collections import deque
+from typing import Any, Dict, Optional
+from sqlalchemy import event, exc
+from sqlalchemy.engine import make_url
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+
+def is_memory_sqlite(url) -> bool:
+    """True for in-memory SQLite URLs, whose single connection cannot be pooled"""
+    url = make_url(url)
+    return url.get_backend_name() == 'sqlite' and url.database in (None, '', ':memory:')
+
+
+def engine_options(config, url: Optional[str] = None, poolclass=None) -> Dict[str, Any]:
+    """
+    Engine keyword arguments built from the DB_POOL_* settings
+    Explicit SQLALCHEMY_ENGINE_OPTIONS entries win over the settings
+    """
+    url = make_url(url or config['SQLALCHEMY_DATABASE_URI'])
+    options = dict(config.get('SQLALCHEMY_ENGINE_OPTIONS') or {})
+    if is_memory_sqlite(url):
+        return options
+    
+    options.setdefault('pool_size', config['DB_POOL_SIZE'])
+    options.setdefault('max_overflow', config['DB_MAX_OVERFLOW'])
+    options.setdefault('pool_timeout', config['DB_POOL_TIMEOUT'])
+    options.setdefault('pool_recycle', config['DB_POOL_RECYCLE'])
+    options.setdefault('pool_pre_ping', config['DB_POOL_PRE_PING'] == 'always')
+    # A pool class set explicitly wins, unless it is one of ours built for
+    # the other engine flavour (sync and asyncio engines need different pools)
+    configured = options.get('poolclass')
+    if poolclass is not None and (configured is None or issubclass(configured, MonitoredPool)):
+        options['poolclass'] = poolclass
+    
+    if url.get_backend_name() == 'mysql':
+        connect_args = dict(options.get('connect_args') or {})
+        connect_args.setdefault('connect_timeout', config['DB_CONNECT_TIMEOUT'])
+        options['connect_args'] = connect_args
+    
+    return options
+
+
+class CheckoutStats:
+    """Thread-safe checkout counters plus a window of recent wait times"""
+    
+    def __init__(self, window: int = 1000):
+        self.checkouts = 0
+        self.timeouts = 0
+        # Threads inside a checkout right now; load shedding watches this
+        self.waiting = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+        self._recent = deque(maxlen=window)
+        self._lock = threading.Lock()
+    
+    def begin(self) -> None:
+        with self._lock:
+            self.waiting += 1
+    
+    def cancel(self) -> None:
+        """End a checkout that failed for another reason than a timeout"""
+        with self._lock:
+            self.waiting -= 1
+    
+    def record(self, wait: float, timed_out: bool = False) -> None:
+        with self._lock:
+            self.waiting -= 1
+            if timed_out:
+                self.timeouts += 1
+            else:
+                self.checkouts += 1
+                self.total_wait += wait
+            self.max_wait = max(self.max_wait, wait)
+            self._recent.append(wait)
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Counters since the pool was created and wait percentiles over the window (ms)"""
+        with self._lock:
+            recent = sorted(self._recent)
+            checkouts, timeouts, waiting = self.checkouts, self.timeouts, self.waiting
+            total_wait, max_wait = self.total_wait, self.max_wait
+        
+        def percentile(fraction):
+            if not recent:
+                return 0.0
+            return round(recent[min(len(recent) - 1, int(len(recent) * fraction))] * 1000, 3)
+        
+        return {
+            'checkouts': checkouts,
+            'timeouts': timeouts,
+            'waiting': waiting,
+            'wait_ms': {
+                'avg': round(total_wait / checkouts * 1000, 3) if checkouts else 0.0,
+                'p50': percentile(0.50),
+                'p95': percentile(0.95),
+                'p99': percentile(0.99),
+                'max': round(max_wait * 1000, 3),
+            }
+        }
+
+
+class MonitoredPool:
+    """
+    Pool mixin that times every checkout, including waits for a free connection
+    Pools rebuilt by dispose() (e.g. after fork) start with fresh statistics
+    """
+    
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.stats = CheckoutStats()
+    
+    def connect(self):
+        started = time.perf_counter()
+        self.stats.begin()
+        try:
+            connection = super().connect()
+        except exc.TimeoutError:
+            self.stats.record(time.perf_counter() - started, timed_out=True)
+            raise
+        except BaseException:
+            self.stats.cancel()
+            raise
+        self.stats.record(time.perf_counter() - started)
+        return connection
+
+
+class MonitoredQueuePool(MonitoredPool, QueuePool):
+    """QueuePool with checkout statistics, for the sync engine"""
+    
+    # Log as the stock pool; under this package the app logger, which is at
+    # DEBUG level in development, would print every checkout
+    _sqla_logger_namespace = 'sqlalchemy.pool.impl.QueuePool'
+
+
+class MonitoredAsyncQueuePool(MonitoredPool, AsyncAdaptedQueuePool):
+    """AsyncAdaptedQueuePool with checkout statistics, for the asyncio engine"""
+    
+    _sqla_logger_namespace = 'sqlalchemy.pool.impl.AsyncAdaptedQueuePool'
+
+
+def install_pool_events(engine, config) -> None:
+    """
+    Apply the 'idle' pre-ping strategy to engine's pool
+    Only connections idle longer than DB_POOL_PING_IDLE seconds are pinged on
+    checkout, instead of every checkout paying a round trip ('always')
+    """
+    if config['DB_POOL_PRE_PING'] != 'idle':
+        return
+    
+    idle_seconds = config['DB_POOL_PING_IDLE']
+    
+    @event.listens_for(engine, 'checkin')
+    def checkin(dbapi_connection, connection_record):
+        connection_record.info['checked_in_at'] = time.monotonic()
+    
+    @event.listens_for(engine, 'checkout')
+    def checkout(dbapi_connection, connection_record, connection_proxy):
+        checked_in_at = connection_record.info.get('checked_in_at')
+        if checked_in_at is None or time.monotonic() - checked_in_at < idle_seconds:
+            return
+        
+        try:
+            cursor = dbapi_connection.cursor()
+            try:
+                cursor.execute('SELECT 1')
+            finally:
+                cursor.close()
+        except Exception:
+            # The pool discards this connection and retries with a new one
+            raise exc.DisconnectionError("Idle connection failed pre-ping")
+
+
+def pool_status(engine, config) -> Dict[str, Any]:
+    """Current occupancy of engine's pool and its checkout statistics"""
+    pool = engine.pool
+    status = {'pid': os.getpid(), 'class': type(pool).__name__}
+    
+    if not isinstance(pool, QueuePool):
+        return status
+    
+    max_overflow = config['DB_MAX_OVERFLOW']
+    # A negative max_overflow means the pool may grow without bound
+    capacity = pool.size() + max_overflow if max_overflow >= 0 else None
+    checked_out = pool.checkedout()
+    
+    status.update({
+        'size': pool.size(),
+        'max_overflow': max_overflow,
+        'checked_out': checked_out,
+        'idle': pool.checkedin(),
+        'overflow': max(pool.overflow(), 0),
+        'utilization': round(checked_out / capacity, 3) if capacity else None,
+        'timeout_seconds': pool.timeout(),
+        'pre_ping': config['DB_POOL_PRE_PING'],
+    })
+    if isinstance(pool, MonitoredPool):
+        status['checkout'] = pool.stats.to_dict()
+    
+    return status
\ No newline at end of file
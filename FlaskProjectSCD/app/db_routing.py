@@ -0,0 +1,126 @@
+import contextvars
+import functools
+import itertools
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional
+from flask import current_app, g, request
+from flask_sqlalchemy.session import Session
+from sqlalchemy.sql.dml import UpdateBase
+from .db_pool import engine_options, MonitoredQueuePool
+
+# Request header a client sends (with the value 'primary') to read its own
+# writes from an earlier request, e.g. right after a POST
+OVERRIDE_HEADER = 'X-Read-From'
+
+STRATEGIES = ('round_robin', 'least_loaded')
+
+# Where reads go inside the current block: None (primary), 'replica' or 'primary'
+read_target = contextvars.ContextVar('db_read_target', default=None)
+
+
+@contextmanager
+def reads_from(target: str) -> Iterator[None]:
+    """
+    Route the reads of the block to 'replica' or 'primary'
+    'primary' wins over an enclosing or nested 'replica', so an override
+    around a repository call always holds
+    """
+    current = read_target.get()
+    token = read_target.set('primary' if 'primary' in (current, target) else target)
+    try:
+        yield
+    finally:
+        read_target.reset(token)
+
+
+def replica_read(method):
+    """Run a repository read method on a replica when one is configured"""
+    @functools.wraps(method)
+    def wrapper(*args, **kwargs):
+        with reads_from('replica'):
+            return method(*args, **kwargs)
+    return wrapper
+
+
+def replica_binds(config) -> Dict[str, Dict[str, Any]]:
+    """SQLALCHEMY_BINDS entries for DATABASE_REPLICA_URLS, pooled like the primary"""
+    urls = [url.strip() for url in config['DATABASE_REPLICA_URLS'].split(',') if url.strip()]
+    return {
+        f'replica_{number}': dict(engine_options(config, url, MonitoredQueuePool), url=url)
+        for number, url in enumerate(urls, 1)
+    }
+
+
+class ReplicaRouter:
+    """Picks the replica engine for each routed read"""
+    
+    def __init__(self, engines: Dict[str, Any], strategy: str = 'round_robin'):
+        if strategy not in STRATEGIES:
+            raise ValueError(f"DB_REPLICA_STRATEGY must be one of: {', '.join(STRATEGIES)}")
+        
+        self.engines = engines
+        self.strategy = strategy
+        self._keys: List[str] = list(engines)
+        self._turn = itertools.count()
+    
+    def choose(self):
+        # next() on a count is atomic, so threads never need a lock here
+        start = next(self._turn) % len(self._keys)
+        keys = self._keys[start:] + self._keys[:start]
+        
+        if self.strategy == 'least_loaded':
+            # Fewest connections checked out right now; ties rotate
+            return min((self.engines[key] for key in keys), key=self._load)
+        
+        return self.engines[keys[0]]
+    
+    @staticmethod
+    def _load(engine) -> int:
+        checkedout = getattr(engine.pool, 'checkedout', None)
+        return checkedout() if checkedout is not None else 0
+
+
+class RoutingSession(Session):
+    """
+    Session sending routed reads to a replica and everything else to the primary
+    Once the session flushes or runs an INSERT/UPDATE/DELETE it sticks to the
+    primary until it is removed at the end of the request, so a request
+    always reads its own writes
+    """
+    
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None and self._routes_to_replica(clause):
+            router = current_app.extensions.get('db_router')
+            if router is not None:
+                return router.choose()
+        
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+    
+    def _routes_to_replica(self, clause) -> bool:
+        if self._flushing or isinstance(clause, UpdateBase):
+            self.info['wrote'] = True
+            return False
+        
+        return read_target.get() == 'replica' and not self.info.get('wrote')
+
+
+def init_db_routing(app, engines: Dict[str, Any]) -> None:
+    """Route replica reads over engines and honour the per-request override header"""
+    app.extensions['db_router'] = ReplicaRouter(engines, app.config['DB_REPLICA_STRATEGY'])
+    
+    @app.before_request
+    def read_override():
+        if request.headers.get(OVERRIDE_HEADER, '').lower() == 'primary':
+            g.read_target_token = read_target.set('primary')
+    
+    @app.teardown_request
+    def end_read_override(error=None):
+        token = g.pop('read_target_token', None)
+        if token is not None:
+            read_target.reset(token)
+
+
+def replica_engines(app) -> Optional[Dict[str, Any]]:
+    """Replica engines by bind key, or None when no replica is configured"""
+    router = app.extensions.get('db_router')
+    return router.engines if router is not None else None
\ No newline at end of file
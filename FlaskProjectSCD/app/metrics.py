@@ -0,0 +1,375 @@
+import contextvars
+import glob
+import json
+import os
+import sys
+import threading
+import time
+from bisect import bisect_left
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from flask import request
+from sqlalchemy import event
+
+try:
+    import fcntl
+except ImportError:  # Windows: no worker processes share a directory there
+    fcntl = None
+
+# Upper bounds (seconds) of the latency histogram buckets
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+ARCHIVE_FILE = 'metrics-archive.json'
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+# SQL statistics of the request being served; async views carry it onto the
+# database loop (see AsyncDatabase.run)
+current_request = contextvars.ContextVar('metrics_request', default=None)
+
+
+class RequestStats:
+    """Query count and SQL time of one request"""
+    
+    __slots__ = ('started', 'labels', 'queries', 'sql_seconds')
+    
+    def __init__(self, labels: Tuple[str, ...]):
+        self.started = time.perf_counter()
+        self.labels = labels
+        self.queries = 0
+        self.sql_seconds = 0.0
+
+
+class Registry:
+    """
+    Counters, gauges and histograms of one process
+    Samples are keyed by label values in the order given at declaration
+    """
+    
+    def __init__(self):
+        self.metrics = {}
+        self.pid = os.getpid()
+        self.changes = 0
+        self.flushed_changes = 0
+        self.flusher = None
+        self._lock = threading.Lock()
+        # A forked worker starts from zero instead of repeating the parent's samples
+        os.register_at_fork(after_in_child=self._after_fork)
+    
+    def declare(self, name: str, kind: str, help_text: str, labels: Tuple[str, ...] = (),
+                buckets: Optional[Tuple[float, ...]] = None) -> None:
+        """Register a metric; kind is counter, gauge or histogram"""
+        self.metrics[name] = {
+            'kind': kind, 'help': help_text, 'labels': list(labels),
+            'buckets': list(buckets) if buckets else None, 'samples': {}
+        }
+    
+    def inc(self, name: str, labels: Tuple[str, ...] = (), amount: float = 1) -> None:
+        """Add amount to a counter or gauge"""
+        with self._lock:
+            samples = self.metrics[name]['samples']
+            samples[labels] = samples.get(labels, 0) + amount
+            self.changes += 1
+    
+    def observe(self, name: str, labels: Tuple[str, ...], value: float) -> None:
+        """Record one histogram observation"""
+        metric = self.metrics[name]
+        index = bisect_left(metric['buckets'], value)
+        with self._lock:
+            sample = metric['samples'].get(labels)
+            if sample is None:
+                # Per-bucket counts (the last one is +Inf), then sum
+                sample = metric['samples'][labels] = [0] * (len(metric['buckets']) + 1) + [0.0]
+            sample[index] += 1
+            sample[-1] += value
+            self.changes += 1
+    
+    def _after_fork(self) -> None:
+        # The lock may have been held by another thread of the parent
+        self._lock = threading.Lock()
+        for metric in self.metrics.values():
+            metric['samples'] = {}
+        self.pid = os.getpid()
+        self.changes = self.flushed_changes = 0
+        # Threads do not survive fork
+        self.flusher = None
+    
+    def start_flusher(self, directory: str, interval: float) -> None:
+        """
+        Write this process's samples to directory every interval seconds
+        from a background thread, so requests never wait on file I/O
+        """
+        if self.flusher is not None:
+            return
+        
+        def run():
+            while True:
+                time.sleep(interval)
+                if self.changes != self.flushed_changes:
+                    flush(self, directory)
+        
+        self.flusher = threading.Thread(target=run, name='metrics-flusher', daemon=True)
+        self.flusher.start()
+    
+    def snapshot(self) -> Dict[str, Any]:
+        """JSON-safe copy of every metric"""
+        with self._lock:
+            return {
+                name: dict(metric, samples=[
+                    [list(labels), list(value) if isinstance(value, list) else value]
+                    for labels, value in metric['samples'].items()
+                ])
+                for name, metric in self.metrics.items()
+            }
+
+
+def create_registry() -> Registry:
+    """Registry with the HTTP, SQL and error metrics of this application"""
+    registry = Registry()
+    route = ('method', 'blueprint', 'route')
+    registry.declare('http_requests_total', 'counter',
+                     'HTTP requests by route and status code', route + ('status',))
+    registry.declare('http_request_duration_seconds', 'histogram',
+                     'Time from request start to response headers', route, LATENCY_BUCKETS)
+    registry.declare('http_requests_in_progress', 'gauge',
+                     'Requests currently being served', route)
+    registry.declare('http_request_db_queries', 'histogram',
+                     'SQL statements executed per request', route, QUERY_COUNT_BUCKETS)
+    registry.declare('http_request_db_seconds', 'histogram',
+                     'Time spent in SQL per request', route, LATENCY_BUCKETS)
+    registry.declare('db_queries_total', 'counter',
+                     'SQL statements executed, inside requests or not', ('engine',))
+    registry.declare('db_query_duration_seconds', 'histogram',
+                     'Duration of single SQL statements', ('engine',), LATENCY_BUCKETS)
+    registry.declare('app_handled_errors_total', 'counter',
+                     'Server errors caught by controllers and answered by ResponseHandler',
+                     route + ('status', 'exception'))
+    return registry
+
+
+def init_metrics(app) -> None:
+    """Register the request hooks that feed app's registry"""
+    registry = create_registry()
+    app.extensions['metrics'] = registry
+    config = app.config
+    
+    @app.before_request
+    def start_request():
+        rule = request.url_rule
+        labels = (request.method, request.blueprint or '', rule.rule if rule else '<unmatched>')
+        stats = RequestStats(labels)
+        current_request.set(stats)
+        registry.inc('http_requests_in_progress', labels)
+    
+    @app.after_request
+    def finish_request(response):
+        stats = current_request.get()
+        if stats is None:
+            return response
+        
+        labels = stats.labels
+        registry.inc('http_requests_total', labels + (str(response.status_code),))
+        registry.observe('http_request_duration_seconds', labels, time.perf_counter() - stats.started)
+        registry.observe('http_request_db_queries', labels, stats.queries)
+        registry.observe('http_request_db_seconds', labels, stats.sql_seconds)
+        
+        if config['METRICS_DIR'] and registry.flusher is None:
+            registry.start_flusher(config['METRICS_DIR'], config['METRICS_FLUSH_INTERVAL'])
+        return response
+    
+    @app.teardown_request
+    def end_request(error=None):
+        stats = current_request.get()
+        if stats is not None:
+            registry.inc('http_requests_in_progress', stats.labels, -1)
+            current_request.set(None)
+
+
+def install_query_events(engine, registry: Registry, name: str = 'default') -> None:
+    """Time every statement on engine and charge it to the current request"""
+    
+    @event.listens_for(engine, 'before_cursor_execute')
+    def before(connection, cursor, statement, parameters, context, executemany):
+        context._metrics_started = time.perf_counter()
+    
+    @event.listens_for(engine, 'after_cursor_execute')
+    def after(connection, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - context._metrics_started
+        registry.inc('db_queries_total', (name,))
+        registry.observe('db_query_duration_seconds', (name,), elapsed)
+        
+        stats = current_request.get()
+        if stats is not None:
+            stats.queries += 1
+            stats.sql_seconds += elapsed
+
+
+def record_handled_error(registry: Optional[Registry], status_code: int) -> None:
+    """Count an error response built inside an except block of a controller"""
+    stats = current_request.get()
+    if registry is None or stats is None:
+        return
+    
+    error_type = sys.exc_info()[0]
+    registry.inc('app_handled_errors_total', stats.labels + (
+        str(status_code), error_type.__name__ if error_type else ''
+    ))
+
+
+def flush(registry: Registry, directory: str) -> None:
+    """
+    Write this process's samples to its own file in directory
+    Each process owns one file and replaces it atomically, so writers need no lock
+    """
+    changes = registry.changes
+    path = os.path.join(directory, f'metrics-{registry.pid}.json')
+    _write_json(path, {'pid': registry.pid, 'metrics': registry.snapshot()})
+    registry.flushed_changes = changes
+
+
+def clear(directory: str) -> None:
+    """Remove metric files left by a previous server run"""
+    os.makedirs(directory, exist_ok=True)
+    for path in glob.glob(os.path.join(directory, 'metrics-*.json')):
+        os.remove(path)
+
+
+def collect(registry: Registry, directory: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Samples of this process, or of every worker sharing directory
+    Files of exited workers are folded into an archive file, minus their gauges
+    """
+    if not directory:
+        return registry.snapshot()
+    
+    flush(registry, directory)
+    archive_path = os.path.join(directory, ARCHIVE_FILE)
+    with _locked(directory):
+        archived = _read_json(archive_path) or {'pid': None, 'metrics': {}}
+        live, dead = [], []
+        for path in glob.glob(os.path.join(directory, 'metrics-*.json')):
+            data = None if path == archive_path else _read_json(path)
+            if data is None:
+                continue
+            if _alive(data['pid']):
+                live.append(data['metrics'])
+            else:
+                dead.append(path)
+                archived['metrics'] = merge([archived['metrics'], _without_gauges(data['metrics'])])
+        
+        if dead:
+            _write_json(archive_path, archived)
+            for path in dead:
+                os.remove(path)
+    
+    return merge([archived['metrics']] + live)
+
+
+def merge(snapshots: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+    """Sum samples with equal labels across snapshots"""
+    merged = {}
+    for snapshot in snapshots:
+        for name, metric in snapshot.items():
+            target = merged.setdefault(name, dict(metric, samples={}))['samples']
+            for labels, value in metric['samples']:
+                key = tuple(labels)
+                if key not in target:
+                    target[key] = list(value) if isinstance(value, list) else value
+                elif isinstance(value, list):
+                    target[key] = [a + b for a, b in zip(target[key], value)]
+                else:
+                    target[key] += value
+    
+    return {
+        name: dict(metric, samples=[[list(labels), value] for labels, value in metric['samples'].items()])
+        for name, metric in merged.items()
+    }
+
+
+def render(snapshot: Dict[str, Any]) -> str:
+    """Prometheus text exposition format (version 0.0.4)"""
+    lines = []
+    for name, metric in snapshot.items():
+        lines.append(f'# HELP {name} {metric["help"]}')
+        lines.append(f'# TYPE {name} {metric["kind"]}')
+        label_names = metric['labels']
+        
+        for labels, value in sorted(metric['samples'], key=lambda sample: sample[0]):
+            pairs = list(zip(label_names, labels))
+            if metric['kind'] != 'histogram':
+                lines.append(f'{name}{_labels(pairs)} {_number(value)}')
+                continue
+            
+            cumulative = 0
+            for bound, count in zip(metric['buckets'] + ['+Inf'], value[:-1]):
+                cumulative += count
+                le = bound if bound == '+Inf' else _number(bound)
+                lines.append(f'{name}_bucket{_labels(pairs + [("le", le)])} {cumulative}')
+            lines.append(f'{name}_sum{_labels(pairs)} {_number(value[-1])}')
+            lines.append(f'{name}_count{_labels(pairs)} {cumulative}')
+    
+    return '\n'.join(lines) + '\n'
+
+
+def _labels(pairs: List[tuple]) -> str:
+    if not pairs:
+        return ''
+    return '{' + ','.join(f'{key}="{_escape(value)}"' for key, value in pairs) + '}'
+
+
+def _escape(value) -> str:
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _number(value: float) -> str:
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def _without_gauges(snapshot: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        name: dict(metric, samples=[] if metric['kind'] == 'gauge' else metric['samples'])
+        for name, metric in snapshot.items()
+    }
+
+
+def _alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+def _read_json(path: str) -> Optional[dict]:
+    try:
+        with open(path) as file:
+            return json.load(file)
+    except (OSError, ValueError):
+        return None
+
+
+def _write_json(path: str, data: dict) -> None:
+    # Write then rename, so readers never see a half-written file
+    temporary = f'{path}.{threading.get_ident()}.tmp'
+    with open(temporary, 'w') as file:
+        json.dump(data, file)
+    os.replace(temporary, path)
+
+
+class _locked:
+    """Directory-wide flock, so concurrent scrapes archive a dead worker once"""
+    
+    def __init__(self, directory: str):
+        self.path = os.path.join(directory, '.lock')
+        self.file = None
+    
+    def __enter__(self):
+        if fcntl is not None:
+            self.file = open(self.path, 'a')
+            fcntl.flock(self.file, fcntl.LOCK_EX)
+        return self
+    
+    def __exit__(self, *exc_info):
+        if self.file is not None:
+            self.file.close()
\ No newline at end of file
@@ -1,6 +1,8 @@
 from .auth_middleware import token_required, role_required
+from .rate_limit import rate_limit_scope
 
 __all__ = [
     'token_required',
-    'role_required'
+    'role_required',
+    'rate_limit_scope'
 ]
\ No newline at end of file
@@ -6,6 +6,7 @@ from ..services.auth_service import AuthService
 def token_required(f):
     """
     Decorator to protect routes with Firebase authentication
+    Token verification and user lookups are cached by the app's AuthService
     """
     @wraps(f)
     def decorated(*args, **kwargs):
@@ -29,7 +30,7 @@ def token_required(f):
             }), 401
         
         # Verify token
-        auth_service = AuthService()
+        auth_service = AuthService.get_instance()
         decoded_token = auth_service.verify_token(token)
         
         if not decoded_token:
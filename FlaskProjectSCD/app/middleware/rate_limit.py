@@ -0,0 +1,204 @@
+import hashlib
+import math
+import threading
+from typing import Callable, Dict, List, Optional, Tuple
+from flask import g, request
+from ..db_pool import MonitoredPool
+from ..services.auth_service import AuthService
+from ..utils.response_handler import ResponseHandler
+from .rate_limit_backends import create_rate_limit_backend
+
+PERIODS = {'second': 1, 'minute': 60, 'hour': 3600, 'day': 86400}
+
+
+class Limit:
+    """'<requests>/<period>': a bucket of requests tokens refilled over period"""
+    
+    def __init__(self, spec: str):
+        try:
+            requests, period = spec.strip().split('/')
+            self.capacity = int(requests)
+            self.period = PERIODS[period.strip()]
+        except (KeyError, ValueError):
+            raise ValueError(f"Invalid rate limit '{spec}', expected e.g. 60/minute")
+        
+        if self.capacity <= 0:
+            raise ValueError(f"Invalid rate limit '{spec}', expected a positive count")
+        self.rate = self.capacity / self.period
+        self.spec = spec.strip()
+
+
+def parse_limits(value: str) -> Dict[str, Limit]:
+    """Parse 'name=limit' pairs, e.g. 'default=600/minute,search=60/minute'"""
+    limits = {}
+    for pair in filter(None, (part.strip() for part in value.split(','))):
+        name, _, spec = pair.partition('=')
+        limits[name.strip()] = Limit(spec)
+    return limits
+
+
+def rate_limit_scope(name: str, when: Optional[Callable[[], bool]] = None):
+    """
+    Charge requests to a view against the RATE_LIMITS bucket called name too
+    when, if given, picks the requests per call, e.g. only the searches of a
+    list endpoint
+    """
+    def decorator(view):
+        view.rate_limit_scopes = getattr(view, 'rate_limit_scopes', ()) + ((name, when),)
+        return view
+    return decorator
+
+
+def client_key(api_keys: frozenset) -> str:
+    """
+    Who a request is counted against: a verified user, a known API key
+    (X-API-Key), or else the client address
+    A bearer token counts against its user only once it is in the verified
+    token cache; the limiter never verifies tokens itself, so a flood of
+    forged or fresh tokens is charged to the address before any of them
+    costs a signature check
+    """
+    user = g.get('current_user')
+    if user is not None:
+        return f'user:{user.firebase_uid}'
+    
+    scheme, _, token = request.headers.get('Authorization', '').partition(' ')
+    if scheme == 'Bearer' and token:
+        claims = AuthService.get_instance().cached_claims(token)
+        if claims and claims.get('uid'):
+            return f"user:{claims['uid']}"
+    
+    api_key = request.headers.get('X-API-Key')
+    if api_key and api_key in api_keys:
+        return 'key:' + hashlib.sha256(api_key.encode('utf-8')).hexdigest()[:16]
+    
+    return f'ip:{request.remote_addr}'
+
+
+class LoadShedder:
+    """
+    Per-process admission control: refuses new requests while too many are
+    already in flight or too many threads wait for a pooled connection
+    """
+    
+    def __init__(self, max_in_flight: int = 0, max_pool_waiters: int = 0, engines: List = ()):
+        self.max_in_flight = max_in_flight
+        self.max_pool_waiters = max_pool_waiters
+        self.engines = list(engines)
+        self.in_flight = 0
+        self._lock = threading.Lock()
+    
+    def admit(self) -> Optional[str]:
+        """Count the request in, or return why it is refused"""
+        if self.max_pool_waiters and self.pool_waiters() >= self.max_pool_waiters:
+            return 'connection pool waiters'
+        
+        with self._lock:
+            if self.max_in_flight and self.in_flight >= self.max_in_flight:
+                return 'requests in flight'
+            self.in_flight += 1
+        return None
+    
+    def release(self) -> None:
+        with self._lock:
+            self.in_flight -= 1
+    
+    def pool_waiters(self) -> int:
+        """Threads of this process blocked on a connection checkout right now"""
+        # engine.pool is looked up each time; dispose() after a fork replaces it
+        return sum(
+            engine.pool.stats.waiting for engine in self.engines
+            if isinstance(engine.pool, MonitoredPool)
+        )
+
+
+class RateLimiter:
+    """Token buckets from RATE_LIMITS, checked before each request"""
+    
+    def __init__(self, config):
+        self.limits = parse_limits(config['RATE_LIMITS'])
+        self.backend = create_rate_limit_backend(config)
+        self.api_keys = frozenset(key.strip() for key in config['RATE_LIMIT_API_KEYS'].split(',') if key.strip())
+    
+    def buckets(self, endpoint: Optional[str], view) -> List[str]:
+        """Limits a request is charged to: its view's scopes, its endpoint, then default"""
+        names = [
+            name for name, when in getattr(view, 'rate_limit_scopes', ())
+            if when is None or when()
+        ]
+        names += [endpoint, 'default']
+        return [name for name in names if name in self.limits]
+    
+    def check(self, client: str, names: List[str]) -> Tuple[bool, Optional[Limit], float, float]:
+        """
+        Take a token from every bucket, or from none when one of them is empty
+        Returns: (allowed, tightest limit, tokens left in it, seconds to wait);
+        when refused, the tightest limit is the one that takes longest to refill
+        """
+        limits = [self.limits[name] for name in names]
+        allowed, states = self.backend.consume(
+            [(f'{name}:{client}', limit.capacity, limit.rate) for name, limit in zip(names, limits)]
+        )
+        if allowed:
+            limit, (tokens, _) = min(zip(limits, states), key=lambda pair: pair[1][0])
+            return True, limit, tokens, 0.0
+        
+        limit, (tokens, wait) = max(zip(limits, states), key=lambda pair: pair[1][1])
+        return False, limit, tokens, wait
+
+
+def init_rate_limiting(app, engines: List) -> None:
+    """
+    Shed load and enforce rate limits before every request, except on the
+    RATE_LIMIT_EXEMPT blueprints (health checks and metrics)
+    Shedding runs first, so an overloaded worker does not even pay for a
+    round trip to a shared bucket store
+    """
+    config = app.config
+    exempt = set(config['RATE_LIMIT_EXEMPT'])
+    shedder = LoadShedder(config['LOAD_SHED_MAX_IN_FLIGHT'], config['LOAD_SHED_MAX_POOL_WAITERS'], engines)
+    limiter = RateLimiter(config) if config['RATE_LIMIT_ENABLED'] else None
+    app.extensions['load_shedder'] = shedder
+    app.extensions['rate_limiter'] = limiter
+    
+    @app.before_request
+    def admit_request():
+        if request.blueprint in exempt or request.endpoint == 'static':
+            return None
+        
+        refused = shedder.admit()
+        if refused is not None:
+            # Not logged per request: under overload that would add to the load
+            return ResponseHandler.unavailable(
+                f"Server is overloaded ({refused}), retry shortly", config['LOAD_SHED_RETRY_AFTER']
+            )
+        g.load_shed_admitted = True
+        
+        if limiter is None:
+            return None
+        
+        names = limiter.buckets(request.endpoint, app.view_functions.get(request.endpoint))
+        if not names:
+            return None
+        
+        allowed, limit, remaining, wait = limiter.check(client_key(limiter.api_keys), names)
+        g.rate_limit = (limit, remaining)
+        if not allowed:
+            return ResponseHandler.too_many_requests(
+                f"Rate limit of {limit.spec} exceeded", math.ceil(wait)
+            )
+        return None
+    
+    @app.after_request
+    def rate_limit_headers(response):
+        state = g.get('rate_limit')
+        if state is not None and state[0] is not None:
+            limit, remaining = state
+            response.headers['RateLimit-Limit'] = str(limit.capacity)
+            response.headers['RateLimit-Remaining'] = str(max(int(remaining), 0))
+        return response
+    
+    @app.teardown_request
+    def release_request(error=None):
+        if g.pop('load_shed_admitted', False):
+            shedder.release()
\ No newline at end of file
@@ -0,0 +1,146 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import List, Sequence, Tuple
+
+# Atomic token buckets on Redis; the server clock keeps every worker consistent
+# KEYS: buckets, ARGV: cost, then capacity and refill rate per second of each
+# bucket. Tokens are taken from every bucket, or from none if one lacks them
+TOKEN_BUCKET_SCRIPT = """
+local cost = tonumber(ARGV[1])
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+local levels = {}
+local allowed = 1
+for i, key in ipairs(KEYS) do
+    local capacity = tonumber(ARGV[i * 2])
+    local rate = tonumber(ARGV[i * 2 + 1])
+    local state = redis.call('HMGET', key, 'tokens', 'stamp')
+    local tokens = tonumber(state[1]) or capacity
+    local stamp = tonumber(state[2]) or now
+    levels[i] = math.min(capacity, tokens + math.max(0, now - stamp) * rate)
+    if levels[i] < cost then
+        allowed = 0
+    end
+end
+local result = {allowed}
+for i, key in ipairs(KEYS) do
+    local capacity = tonumber(ARGV[i * 2])
+    local rate = tonumber(ARGV[i * 2 + 1])
+    local wait = 0
+    if allowed == 1 then
+        levels[i] = levels[i] - cost
+    elseif levels[i] < cost then
+        wait = (cost - levels[i]) / rate
+    end
+    redis.call('HSET', key, 'tokens', levels[i], 'stamp', now)
+    redis.call('PEXPIRE', key, math.ceil(capacity / rate * 1000))
+    table.insert(result, tostring(levels[i]))
+    table.insert(result, tostring(wait))
+end
+return result
+"""
+
+
+class RateLimitBackend:
+    """
+    Token bucket store used by the rate limiter
+    A bucket holds up to capacity tokens and refills at rate tokens per second
+    """
+    
+    name = 'base'
+    
+    def consume(self, buckets: Sequence[Tuple[str, float, float]],
+                cost: float = 1) -> Tuple[bool, List[Tuple[float, float]]]:
+        """
+        Take cost tokens from every (key, capacity, rate) bucket, or from none
+        when any of them lacks them, so a refused request costs nothing
+        Returns: (allowed, [(tokens left, seconds until cost tokens are available)] per bucket)
+        """
+        raise NotImplementedError
+
+
+class MemoryRateLimitBackend(RateLimitBackend):
+    """
+    Buckets in this process, bounded to max_buckets least recently used ones
+    Each worker process counts on its own, so with N workers a client may get
+    up to N times the limit; use a shared backend to enforce it exactly
+    """
+    
+    name = 'memory'
+    
+    def __init__(self, max_buckets: int = 100000):
+        self.max_buckets = max_buckets
+        self._buckets = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def consume(self, buckets: Sequence[Tuple[str, float, float]],
+                cost: float = 1) -> Tuple[bool, List[Tuple[float, float]]]:
+        """Refill the buckets for the time since their last use, then take from all or none"""
+        now = time.monotonic()
+        
+        with self._lock:
+            levels = []
+            for key, capacity, rate in buckets:
+                tokens, stamp = self._buckets.get(key, (capacity, now))
+                levels.append(min(capacity, tokens + (now - stamp) * rate))
+            allowed = all(tokens >= cost for tokens in levels)
+            
+            states = []
+            for (key, capacity, rate), tokens in zip(buckets, levels):
+                wait = 0.0
+                if allowed:
+                    tokens -= cost
+                elif tokens < cost:
+                    wait = (cost - tokens) / rate
+                states.append((tokens, wait))
+                self._buckets[key] = (tokens, now)
+                self._buckets.move_to_end(key)
+            # An evicted bucket comes back full, which only ever favours the client
+            while len(self._buckets) > self.max_buckets:
+                self._buckets.popitem(last=False)
+        
+        return allowed, states
+
+
+class RedisRateLimitBackend(RateLimitBackend):
+    """
+    Buckets on a Redis-compatible server, shared by every worker process
+    One round trip per request; requires the optional 'redis' package
+    """
+    
+    name = 'redis'
+    
+    def __init__(self, url: str, key_prefix: str = ''):
+        try:
+            import redis
+        except ImportError:
+            raise RuntimeError("RATE_LIMIT_BACKEND=redis requires the 'redis' package")
+        
+        self.client = redis.Redis.from_url(url)
+        self.key_prefix = key_prefix
+        self._script = self.client.register_script(TOKEN_BUCKET_SCRIPT)
+    
+    def consume(self, buckets: Sequence[Tuple[str, float, float]],
+                cost: float = 1) -> Tuple[bool, List[Tuple[float, float]]]:
+        """Run the token bucket script on the server"""
+        args = [cost]
+        for _, capacity, rate in buckets:
+            args += [capacity, rate]
+        allowed, *values = self._script(keys=[self.key_prefix + key for key, _, _ in buckets], args=args)
+        states = [(float(values[i]), float(values[i + 1])) for i in range(0, len(values), 2)]
+        return bool(allowed), states
+
+
+def create_rate_limit_backend(config) -> RateLimitBackend:
+    """Build the configured rate limit backend"""
+    backend_name = config.get('RATE_LIMIT_BACKEND', 'memory')
+    
+    if backend_name == MemoryRateLimitBackend.name:
+        return MemoryRateLimitBackend(config.get('RATE_LIMIT_MAX_BUCKETS', 100000))
+    if backend_name == RedisRateLimitBackend.name:
+        return RedisRateLimitBackend(
+            config['RATE_LIMIT_REDIS_URL'], config.get('CACHE_KEY_PREFIX', '') + 'ratelimit:'
+        )
+    
+    raise ValueError(f"Unknown rate limit backend '{backend_name}'")
\ No newline at end of file
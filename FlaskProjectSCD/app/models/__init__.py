@@ -1,5 +1,13 @@
+from .change_sequence import ChangeSequence
 from .supplier import Supplier
+from .supplier_change import SupplierChange
+from .supplier_stat import SupplierStat
+from .user import User
 
 __all__ = [
-    'Supplier'
+    'ChangeSequence',
+    'Supplier',
+    'SupplierChange',
+    'SupplierStat',
+    'User'
 ]
\ No newline at end of file
@@ -0,0 +1,16 @@
+from .. import db
+
+
+class ChangeSequence(db.Model):
+    """
+    Named counter handing out change feed sequence numbers
+    Writers bump it in their own transaction, so the row lock orders the
+    numbers by commit and a reader never sees a smaller one appear later
+    """
+    __tablename__ = 'change_sequences'
+    
+    name = db.Column(db.String(50), primary_key=True)
+    value = db.Column(db.BigInteger, nullable=False, default=0)
+    
+    def __repr__(self):
+        return f'<ChangeSequence {self.name}={self.value}>'
\ No newline at end of file
@@ -1,12 +1,28 @@
 from datetime import datetime
+from sqlalchemy.dialects import mysql
 from .. import db
 
+# Microsecond precision on MySQL so back-to-back writes get distinct timestamps
+PreciseDateTime = db.DateTime().with_variant(mysql.DATETIME(fsp=6), 'mysql')
+
 
 class Supplier(db.Model):
     """
     Supplier model for managing product suppliers
     """
     __tablename__ = 'suppliers'
+    __table_args__ = (
+        # Backs keyset pagination sorted by creation time; supplier_name
+        # already has an index that carries the primary key
+        db.Index('ix_suppliers_created_at_supplier_id', 'created_at', 'supplier_id'),
+        # Natural-key lookups when importing with upsert on email
+        db.Index('ix_suppliers_email', 'email'),
+        # Backs the MySQL full-text search backend; SQLite uses an FTS5 table instead
+        db.Index(
+            'ft_suppliers_search', 'supplier_name', 'contact_person', 'email',
+            mysql_prefix='FULLTEXT'
+        ).ddl_if(dialect='mysql'),
+    )
     
     supplier_id = db.Column(db.Integer, primary_key=True, autoincrement=True)
     supplier_name = db.Column(db.String(150), nullable=False, index=True)
@@ -15,6 +31,16 @@ class Supplier(db.Model):
     phone = db.Column(db.String(20), nullable=True)
     address = db.Column(db.Text, nullable=True)
     created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+    # Drives ETag / Last-Modified validators; indexed so MAX(updated_at) is a single seek
+    updated_at = db.Column(
+        PreciseDateTime, default=datetime.utcnow, onupdate=datetime.utcnow,
+        nullable=False, index=True
+    )
+    # Row version for optimistic concurrency: every write bumps it and checks
+    # the value it read, and conditional PATCH / DELETE compare against it
+    version = db.Column(db.Integer, nullable=False, default=1, server_default='1')
+    
+    __mapper_args__ = {'version_id_col': version}
     
     def __repr__(self):
         return f'<Supplier {self.supplier_name}>'
@@ -28,7 +54,9 @@ class Supplier(db.Model):
             'email': self.email,
             'phone': self.phone,
             'address': self.address,
-            'created_at': self.created_at.isoformat() if self.created_at else None
+            'created_at': self.created_at.isoformat() if self.created_at else None,
+            'updated_at': self.updated_at.isoformat() if self.updated_at else None,
+            'version': self.version
         }
         
         return data
\ No newline at end of file
@@ -0,0 +1,29 @@
+from datetime import datetime
+from .. import db
+
+
+class SupplierChange(db.Model):
+    """
+    Latest change of one supplier in the change feed
+    One row per supplier: each write moves it to a new sequence number, and
+    a delete leaves it behind as a tombstone
+    """
+    __tablename__ = 'supplier_changes'
+    
+    supplier_id = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    # Feed order; the unique index serves 'seq > :since ORDER BY seq' as a range scan
+    seq = db.Column(db.BigInteger, nullable=False, unique=True, index=True)
+    operation = db.Column(db.String(10), nullable=False)
+    changed_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+    
+    def __repr__(self):
+        return f'<SupplierChange {self.seq} {self.operation} {self.supplier_id}>'
+    
+    def to_dict(self):
+        """Convert change to dictionary"""
+        return {
+            'seq': self.seq,
+            'operation': self.operation,
+            'supplier_id': self.supplier_id,
+            'changed_at': self.changed_at.isoformat() if self.changed_at else None
+        }
\ No newline at end of file
@@ -0,0 +1,28 @@
+from .. import db
+
+
+class SupplierStat(db.Model):
+    """
+    Pre-aggregated supplier count for one (dimension, bucket) cell
+    Kept in step by the supplier repository's write paths, so dashboards
+    never aggregate the suppliers table itself
+    """
+    __tablename__ = 'supplier_stats'
+    __table_args__ = (
+        # Top buckets of a dimension (e.g. the largest email domains) as an index scan
+        db.Index('ix_supplier_stats_dimension_row_count', 'dimension', 'row_count'),
+    )
+    
+    dimension = db.Column(db.String(20), primary_key=True)
+    bucket = db.Column(db.String(100), primary_key=True)
+    row_count = db.Column(db.Integer, nullable=False, default=0)
+    
+    def __repr__(self):
+        return f'<SupplierStat {self.dimension}:{self.bucket}={self.row_count}>'
+    
+    def to_dict(self):
+        """Convert stat to dictionary"""
+        return {
+            'bucket': self.bucket,
+            'count': self.row_count
+        }
\ No newline at end of file
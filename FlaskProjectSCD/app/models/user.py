@@ -0,0 +1,34 @@
+from datetime import datetime
+from .. import db
+
+
+class User(db.Model):
+    """
+    Application user linked to a Firebase account
+    """
+    __tablename__ = 'users'
+    
+    user_id = db.Column(db.Integer, primary_key=True, autoincrement=True)
+    firebase_uid = db.Column(db.String(128), nullable=False, unique=True, index=True)
+    email = db.Column(db.String(100), nullable=True)
+    display_name = db.Column(db.String(100), nullable=True)
+    role = db.Column(db.String(20), nullable=False, default='staff')
+    is_active = db.Column(db.Boolean, nullable=False, default=True)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+    
+    def __repr__(self):
+        return f'<User {self.email or self.firebase_uid}>'
+    
+    def to_dict(self):
+        """Convert user to dictionary"""
+        data = {
+            'user_id': self.user_id,
+            'firebase_uid': self.firebase_uid,
+            'email': self.email,
+            'display_name': self.display_name,
+            'role': self.role,
+            'is_active': self.is_active,
+            'created_at': self.created_at.isoformat() if self.created_at else None
+        }
+        
+        return data
\ No newline at end of file
@@ -0,0 +1,329 @@
+import contextvars
+import cProfile
+import hmac
+import itertools
+import os
+import random
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import nullcontext
+from datetime import datetime, timezone
+from functools import partial
+from typing import Dict, Optional, Tuple
+from flask import g, request
+from sqlalchemy import event
+
+# cprofile: every call, written as .prof (pstats, snakeviz)
+# stack: the thread's stack sampled every interval, written as .folded
+#   collapsed stacks (flamegraph.pl, speedscope)
+# timing: phase timings only, no file
+MODES = ('cprofile', 'stack', 'timing')
+EXTENSIONS = {'cprofile': 'prof', 'stack': 'folded'}
+
+# Phases timed with timed() besides db; the rest of a request is handler time
+PHASES = ('serialize', 'compress')
+
+# Longest import roots first, so frames are labelled by module path
+PATH_PREFIXES = sorted(
+    {os.path.join(os.path.abspath(path), '') for path in sys.path if path}, key=len, reverse=True
+)
+
+# Profile of the request being served, None when it is not profiled; async
+# views carry it onto the database loop (see AsyncDatabase.run)
+current_profile = contextvars.ContextVar('request_profile', default=None)
+
+# What timed() returns outside profiled requests; stateless, so shared
+NOT_PROFILED = nullcontext()
+
+
+class RequestProfile:
+    """Phase timings of one profiled request, and what its mode collects"""
+    
+    __slots__ = ('mode', 'route', 'authorized', 'name', 'started', 'elapsed',
+                 'queries', 'phases', 'profiler', 'samples')
+    
+    def __init__(self, mode: str, route: str, authorized: bool, name: Optional[str]):
+        self.mode = mode
+        self.route = route
+        self.authorized = authorized
+        self.name = name
+        self.started = time.perf_counter()
+        self.elapsed = None
+        self.queries = 0
+        self.phases = dict.fromkeys(('db',) + PHASES, 0.0)
+        self.profiler = None
+        self.samples = None
+    
+    def add(self, phase: str, seconds: float) -> None:
+        self.phases[phase] += seconds
+    
+    def server_timing(self) -> str:
+        """Server-Timing header value, in milliseconds"""
+        elapsed = self.elapsed if self.elapsed is not None else time.perf_counter() - self.started
+        handler = max(elapsed - sum(self.phases.values()), 0.0)
+        entries = [f'db;dur={self.phases["db"] * 1000:.2f};desc="{self.queries} queries"']
+        entries += [f'{phase};dur={self.phases[phase] * 1000:.2f}' for phase in PHASES]
+        entries += [f'handler;dur={handler * 1000:.2f}', f'total;dur={elapsed * 1000:.2f}']
+        return ', '.join(entries)
+
+
+class PhaseTimer:
+    """Adds the time spent in its block to one phase of a profile"""
+    
+    __slots__ = ('profile', 'phase', 'started')
+    
+    def __init__(self, profile: RequestProfile, phase: str):
+        self.profile = profile
+        self.phase = phase
+    
+    def __enter__(self):
+        self.started = time.perf_counter()
+    
+    def __exit__(self, *exc_info):
+        self.profile.add(self.phase, time.perf_counter() - self.started)
+
+
+def timed(phase: str):
+    """Charge a with block to a phase of the profiled request; a no-op otherwise"""
+    profile = current_profile.get()
+    if profile is None:
+        return NOT_PROFILED
+    return PhaseTimer(profile, phase)
+
+
+class StackSampler:
+    """
+    Samples the stacks of registered threads from one background thread,
+    counting them collapsed: 'outermost;...;innermost' -> samples
+    The thread runs only while some thread is registered
+    """
+    
+    def __init__(self, interval: float):
+        self.interval = interval
+        self.targets: Dict[int, Counter] = {}
+        self.labels = {}
+        self._lock = threading.Lock()
+        self._thread = None
+        os.register_at_fork(after_in_child=self._after_fork)
+    
+    def add(self, thread_id: int) -> Counter:
+        """Start sampling a thread; returns the counter its samples go to"""
+        samples = Counter()
+        with self._lock:
+            self.targets[thread_id] = samples
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='profile-sampler', daemon=True)
+                self._thread.start()
+        return samples
+    
+    def discard(self, thread_id: int) -> None:
+        with self._lock:
+            self.targets.pop(thread_id, None)
+    
+    def collapse(self, frame) -> str:
+        names = []
+        while frame is not None:
+            code = frame.f_code
+            label = self.labels.get(code)
+            if label is None:
+                name = getattr(code, 'co_qualname', code.co_name)
+                label = f'{name} ({_module_path(code.co_filename)}:{code.co_firstlineno})'.replace(';', ':')
+                self.labels[code] = label
+            names.append(label)
+            frame = frame.f_back
+        return ';'.join(reversed(names))
+    
+    def _run(self) -> None:
+        while True:
+            # Sampled under the lock, so no counter is written once discarded
+            with self._lock:
+                if not self.targets:
+                    self._thread = None
+                    return
+                frames = sys._current_frames()
+                for thread_id, samples in self.targets.items():
+                    frame = frames.get(thread_id)
+                    if frame is not None:
+                        samples[self.collapse(frame)] += 1
+                del frames, frame
+            time.sleep(self.interval)
+    
+    def _after_fork(self) -> None:
+        # Threads do not survive fork, and the lock may have been held
+        self._lock = threading.Lock()
+        self.targets = {}
+        self._thread = None
+
+
+class Profiler:
+    """Picks the requests to profile and writes their profiles to PROFILING_DIR"""
+    
+    def __init__(self, config):
+        for setting in ('PROFILING_MODE', 'PROFILING_SAMPLE_MODE'):
+            if config[setting] not in MODES:
+                raise ValueError(f"{setting} must be one of: {', '.join(MODES)}")
+        
+        self.token = config['PROFILING_TOKEN'].encode('utf-8')
+        self.mode = config['PROFILING_MODE']
+        self.sample_rate = config['PROFILING_SAMPLE_RATE']
+        self.sample_mode = config['PROFILING_SAMPLE_MODE']
+        self.exempt = frozenset(config['PROFILING_EXEMPT'])
+        self.directory = config['PROFILING_DIR']
+        self.max_files = config['PROFILING_MAX_FILES']
+        self.sampler = StackSampler(config['PROFILING_SAMPLE_INTERVAL_MS'] / 1000)
+        self._sequence = itertools.count()
+    
+    def select(self) -> Optional[Tuple[str, bool]]:
+        """(mode, authorized) when the current request is to be profiled"""
+        header = request.headers.get('X-Profile')
+        if header and self.token and hmac.compare_digest(header.encode('utf-8'), self.token):
+            mode = request.headers.get('X-Profile-Mode', self.mode)
+            return (mode if mode in MODES else self.mode), True
+        
+        if (self.sample_rate and request.blueprint not in self.exempt
+                and random.random() < self.sample_rate):
+            return self.sample_mode, False
+        return None
+    
+    def start(self, mode: str, authorized: bool) -> RequestProfile:
+        rule = request.url_rule
+        route = f"{request.method} {rule.rule if rule else request.path}"
+        name = None
+        if mode in EXTENSIONS:
+            slug = re.sub(r'[^A-Za-z0-9_]+', '-', route).strip('-').lower()
+            name = (
+                f"{datetime.now(timezone.utc):%Y%m%dT%H%M%S}-{os.getpid()}-"
+                f"{next(self._sequence)}-{slug}.{EXTENSIONS[mode]}"
+            )
+        
+        profile = RequestProfile(mode, route, authorized, name)
+        if mode == 'stack':
+            profile.samples = self.sampler.add(threading.get_ident())
+        elif mode == 'cprofile':
+            profile.profiler = cProfile.Profile()
+            profile.profiler.enable()
+        return profile
+    
+    def stop(self, profile: RequestProfile) -> None:
+        """Stop collecting; safe to call twice"""
+        if profile.elapsed is not None:
+            return
+        
+        if profile.profiler is not None:
+            profile.profiler.disable()
+        elif profile.samples is not None:
+            self.sampler.discard(threading.get_ident())
+        profile.elapsed = time.perf_counter() - profile.started
+    
+    def save(self, profile: RequestProfile) -> Optional[str]:
+        """Write the profile's file, if its mode has one; returns its path"""
+        if profile.name is None:
+            return None
+        
+        os.makedirs(self.directory, exist_ok=True)
+        path = os.path.join(self.directory, profile.name)
+        if profile.profiler is not None:
+            profile.profiler.dump_stats(path)
+        else:
+            with open(path, 'w') as file:
+                file.writelines(f'{stack} {count}\n' for stack, count in profile.samples.items())
+        
+        self.prune()
+        return path
+    
+    def prune(self) -> None:
+        """Keep the newest max_files profiles; names start with their time"""
+        if not self.max_files:
+            return
+        
+        names = sorted(
+            name for name in os.listdir(self.directory)
+            if name.endswith(tuple('.' + extension for extension in EXTENSIONS.values()))
+        )
+        for name in names[:-self.max_files]:
+            try:
+                os.remove(os.path.join(self.directory, name))
+            except FileNotFoundError:
+                # Another worker pruned it first
+                pass
+
+
+def init_profiling(app) -> None:
+    """Profile requests selected by X-Profile or PROFILING_SAMPLE_RATE"""
+    profiler = Profiler(app.config)
+    app.extensions['profiler'] = profiler
+    
+    def save(profile: RequestProfile) -> None:
+        try:
+            path = profiler.save(profile)
+        except OSError:
+            app.logger.exception("Could not write the profile of %s", profile.route)
+            return
+        app.logger.info("Profiled %s: %s%s", profile.route, profile.server_timing(),
+                        f" -> {path}" if path else '')
+    
+    @app.before_request
+    def start_profile():
+        # A batch sub-request is profiled as part of its batch
+        if current_profile.get() is not None:
+            return
+        
+        selected = profiler.select()
+        if selected is None:
+            return
+        
+        profile = profiler.start(*selected)
+        g.profile = profile
+        g.profile_token = current_profile.set(profile)
+    
+    @app.after_request
+    def finish_profile(response):
+        profile = g.pop('profile', None)
+        if profile is None:
+            return response
+        
+        profiler.stop(profile)
+        if profile.authorized:
+            response.headers['Server-Timing'] = profile.server_timing()
+            if profile.name is not None:
+                response.headers['X-Profile-Id'] = profile.name
+        # Written once the response is sent, so the client does not wait on the file
+        response.call_on_close(partial(save, profile))
+        return response
+    
+    @app.teardown_request
+    def end_profile(error=None):
+        token = g.pop('profile_token', None)
+        if token is not None:
+            current_profile.reset(token)
+        
+        # Still here when an unhandled exception skipped after_request
+        profile = g.pop('profile', None)
+        if profile is not None:
+            profiler.stop(profile)
+            save(profile)
+
+
+def install_profiling_events(engine) -> None:
+    """Charge statement time on engine to the profiled request"""
+    
+    @event.listens_for(engine, 'before_cursor_execute')
+    def before(connection, cursor, statement, parameters, context, executemany):
+        context._profile_started = time.perf_counter()
+    
+    @event.listens_for(engine, 'after_cursor_execute')
+    def after(connection, cursor, statement, parameters, context, executemany):
+        profile = current_profile.get()
+        if profile is not None:
+            profile.queries += 1
+            profile.add('db', time.perf_counter() - context._profile_started)
+
+
+def _module_path(filename: str) -> str:
+    for prefix in PATH_PREFIXES:
+        if filename.startswith(prefix):
+            return filename[len(prefix):]
+    return filename
\ No newline at end of file
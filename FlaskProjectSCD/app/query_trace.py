@@ -0,0 +1,152 @@
+import contextvars
+import time
+from collections import Counter
+from contextlib import contextmanager
+from typing import Iterator, List, Optional, Tuple
+from flask import g, request
+from sqlalchemy import event
+
+# Longest bind parameter repr written to the slow-query log
+MAX_LOGGED_PARAMETERS = 500
+
+# Query logs currently collecting; a request pushes one and so does
+# capture_queries, so a test can wrap a test-client call
+active_logs = contextvars.ContextVar('query_logs', default=())
+
+
+class QueryBudgetExceeded(Exception):
+    """A view ran more statements than its @query_budget allows"""
+
+
+class QueryLog:
+    """Statements executed while the log is active, counted by SQL text"""
+    
+    def __init__(self, route: Optional[str] = None):
+        self.route = route
+        self.count = 0
+        self.seconds = 0.0
+        self.statements = Counter()
+    
+    def record(self, statement: str, elapsed: float, batch: bool = False) -> None:
+        self.count += 1
+        self.seconds += elapsed
+        # Chunked executemany batches repeat by design; they are not N+1 lookups
+        if not batch:
+            self.statements[statement] += 1
+    
+    def repeated(self, threshold: int) -> List[Tuple[str, int]]:
+        """Statements run at least threshold times, most frequent first"""
+        return [(statement, n) for statement, n in self.statements.most_common() if n >= threshold]
+    
+    def summary(self, limit: int = 10) -> str:
+        """Most frequent statements, one per line, for error messages"""
+        return '\n'.join(f'{n}x {statement}' for statement, n in self.statements.most_common(limit))
+
+
+def query_budget(max_queries: int):
+    """
+    Declare the most SQL statements a view may run per request
+    Over budget, the request logs a warning, or fails when
+    SQL_QUERY_BUDGET_STRICT is set (as in testing) so regressions break CI
+    """
+    def decorator(view):
+        view.query_budget = max_queries
+        return view
+    return decorator
+
+
+@contextmanager
+def capture_queries() -> Iterator[QueryLog]:
+    """Collect every statement run inside the block, including by test-client requests"""
+    log = QueryLog()
+    token = active_logs.set(active_logs.get() + (log,))
+    try:
+        yield log
+    finally:
+        active_logs.reset(token)
+
+
+@contextmanager
+def assert_max_queries(max_queries: int) -> Iterator[QueryLog]:
+    """
+    Test helper failing when the block runs more than max_queries statements
+        with assert_max_queries(3):
+            client.get('/api/suppliers')
+    """
+    with capture_queries() as log:
+        yield log
+    
+    if log.count > max_queries:
+        raise AssertionError(
+            f"Expected at most {max_queries} queries, {log.count} ran:\n{log.summary()}"
+        )
+
+
+def init_query_trace(app) -> None:
+    """Give every request its own query log and check it when the request ends"""
+    config = app.config
+    
+    @app.before_request
+    def start_query_log():
+        rule = request.url_rule
+        log = QueryLog(f"{request.method} {rule.rule if rule else request.path}")
+        g.query_log = log
+        g.query_log_token = active_logs.set(active_logs.get() + (log,))
+    
+    @app.after_request
+    def check_query_log(response):
+        log = g.get('query_log')
+        if log is None:
+            return response
+        
+        threshold = config['SQL_REPEAT_THRESHOLD']
+        if threshold:
+            for statement, n in log.repeated(threshold):
+                app.logger.warning(
+                    "Possible N+1 on %s: the same statement ran %d times: %s", log.route, n, statement
+                )
+        
+        view = app.view_functions.get(request.endpoint)
+        budget = getattr(view, 'query_budget', None)
+        if budget is not None and log.count > budget:
+            message = f"{log.route} ran {log.count} queries, budget is {budget}"
+            if config['SQL_QUERY_BUDGET_STRICT']:
+                raise QueryBudgetExceeded(f"{message}:\n{log.summary()}")
+            app.logger.warning(message)
+        
+        return response
+    
+    @app.teardown_request
+    def end_query_log(error=None):
+        token = g.pop('query_log_token', None)
+        if token is not None:
+            active_logs.reset(token)
+
+
+def install_query_trace(engine, app) -> None:
+    """Feed active query logs from engine and log its slow statements"""
+    slow_seconds = app.config['SQL_SLOW_QUERY_MS'] / 1000
+    
+    @event.listens_for(engine, 'before_cursor_execute')
+    def before(connection, cursor, statement, parameters, context, executemany):
+        context._trace_started = time.perf_counter()
+    
+    @event.listens_for(engine, 'after_cursor_execute')
+    def after(connection, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - context._trace_started
+        logs = active_logs.get()
+        for log in logs:
+            log.record(statement, elapsed, executemany)
+        
+        if slow_seconds and elapsed >= slow_seconds:
+            route = next((log.route for log in reversed(logs) if log.route), '-')
+            app.logger.warning(
+                "Slow query (%.1f ms) on %s: %s | parameters: %s",
+                elapsed * 1000, route, statement, _truncate(repr(parameters))
+            )
+
+
+def _truncate(text: str) -> str:
+    if len(text) <= MAX_LOGGED_PARAMETERS:
+        return text
+    return text[:MAX_LOGGED_PARAMETERS] + f'... ({len(text)} chars)'
\ No newline at end of file
@@ -1,7 +1,13 @@
 from .base_repository import BaseRepository
 from .supplier_repository import SupplierRepository
+from .user_repository import UserRepository
+from .async_base_repository import AsyncBaseRepository
+from .async_supplier_repository import AsyncSupplierRepository
 
 __all__ = [
     'BaseRepository',
-    'SupplierRepository'
+    'SupplierRepository',
+    'UserRepository',
+    'AsyncBaseRepository',
+    'AsyncSupplierRepository'
 ]
\ No newline at end of file
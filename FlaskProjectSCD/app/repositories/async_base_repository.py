@@ -0,0 +1,489 @@
+import uuid
+from datetime import datetime
+from typing import TypeVar, Generic, List, Optional, Dict, Any, Callable, Awaitable, TYPE_CHECKING
+from flask import current_app
+from sqlalchemy import delete, func, select, update
+from sqlalchemy.orm import make_transient_to_detached
+from sqlalchemy.orm.exc import StaleDataError
+from .. import db
+from ..utils.conditional import VersionConflict
+from .base_repository import BaseRepository
+from .change_feed import ChangeFeed, DELETE, UPSERT
+from .search_backends import SearchBackend
+
+if TYPE_CHECKING:
+    from .async_database import AsyncDatabase
+
+T = TypeVar('T')
+
+
+class AsyncBaseRepository(Generic[T]):
+    """
+    Asyncio counterpart of BaseRepository for I/O-bound endpoints
+    Wraps the sync repository to reuse its fields, search backend and cache
+    keys, so writes on either path invalidate the other's cached reads
+    """
+    
+    def __init__(self, repository: BaseRepository):
+        self.repository = repository
+        self.model = repository.model
+        self.primary_key = repository.primary_key
+    
+    @property
+    def database(self) -> 'AsyncDatabase':
+        """Async engine shared by all async repositories, built once per application"""
+        extensions = current_app.extensions
+        if 'async_database' not in extensions:
+            # asyncio and the async engine are only imported once an async route is used
+            from .async_database import AsyncDatabase, to_async_url
+            from ..db_pool import engine_options, install_pool_events, MonitoredAsyncQueuePool
+            
+            config = current_app.config
+            app = current_app._get_current_object()
+            
+            def instrument(engine):
+                install_pool_events(engine, config)
+                if 'metrics' in extensions:
+                    from ..metrics import install_query_events
+                    install_query_events(engine, extensions['metrics'], 'async')
+                if config['SQL_TRACE_ENABLED']:
+                    from ..query_trace import install_query_trace
+                    install_query_trace(engine, app)
+                if 'profiler' in extensions:
+                    from ..profiling import install_profiling_events
+                    install_profiling_events(engine)
+            
+            url = config.get('ASYNC_DATABASE_URL') or to_async_url(config['SQLALCHEMY_DATABASE_URI'])
+            database = AsyncDatabase(url, engine_options(config, url, MonitoredAsyncQueuePool), instrument)
+            
+            # The sync engine's in-memory database is invisible to this one
+            if database.in_memory:
+                database.run_sync(db.metadata.create_all)
+            
+            extensions['async_database'] = database
+        
+        database = extensions['async_database']
+        table = self.model.__tablename__
+        if database.in_memory and self.repository.search_fields and table not in database.indexed_tables:
+            database.run_sync(self.repository.search_backend.ensure_index)
+            database.indexed_tables.add(table)
+            feed = self.repository.change_feed
+            if feed is not None:
+                database.run_sync(feed.ensure_sequence)
+        
+        return database
+    
+    async def create(self, **kwargs) -> T:
+        """Create a new entity"""
+        instance = self.model(**kwargs)
+        backend = self._search_backend()
+        summary = self.repository.summary
+        feed = self.repository.change_feed
+        
+        async def work(session):
+            session.add(instance)
+            await session.flush()
+            if backend is not None:
+                await self._execute(session, backend.index_statement(instance))
+            if summary is not None:
+                await self._execute(session, summary.delta_statement([(None, summary.row(instance))]))
+            await self._record_changes(session, feed, [(getattr(instance, self.primary_key.key), UPSERT)])
+            await session.commit()
+            return instance
+        
+        instance = await self.database.run(work)
+        self.repository._after_commit([getattr(instance, self.primary_key.key)])
+        return instance
+    
+    async def get_by_id(self, entity_id: int) -> Optional[T]:
+        """
+        Get entity by ID
+        Uses the same cache entries and version tokens as the sync repository
+        """
+        cache = self.repository.cache
+        if cache is None:
+            return await self._load(entity_id)
+        
+        version_key, data_key = self.repository._entity_keys(entity_id)
+        version, entry = cache.get_many([version_key, data_key])
+        
+        if version is not None and entry is not None and entry[0] == version:
+            return self._restore(entry[1])
+        
+        if version is None:
+            cache.add(version_key, uuid.uuid4().hex)
+            version = cache.get(version_key)
+        
+        instance = await self._load(entity_id)
+        if instance is not None and version is not None:
+            cache.set(data_key, (version, self.repository.snapshot(instance)))
+        
+        return instance
+    
+    async def get_row_by_id(self, entity_id: int, fields: List[str]) -> Optional[Dict[str, Any]]:
+        """Lean read of selected columns of one entity as a plain dict"""
+        query = self._base_select(fields).where(self.primary_key == entity_id)
+        
+        async def work(session):
+            return (await session.execute(query)).first()
+        
+        row = await self.database.run(work)
+        return self.repository._row_dict(row, fields) if row is not None else None
+    
+    async def get_all(self, filters: Optional[Dict[str, Any]] = None,
+                      page: int = 1, per_page: int = 20,
+                      fields: Optional[List[str]] = None) -> tuple:
+        """
+        Get all entities with optional filters and pagination
+        The page and the COUNT run concurrently on separate connections
+        Returns: (items, total_count)
+        """
+        async def load():
+            query = self.repository._apply_filters(self._base_select(fields), filters)
+            items, total = await self._paginate(query, page, per_page, fields)
+            return self.repository._project(items, fields), total
+        
+        return await self._cached_list('all', {
+            'filters': filters, 'page': page, 'per_page': per_page, 'fields': fields
+        }, load, projected=fields is not None)
+    
+    async def get_page_after(self, filters: Optional[Dict[str, Any]] = None,
+                             after: Optional[str] = None, sort: Optional[str] = None,
+                             per_page: int = 20, total: str = 'none',
+                             fields: Optional[List[str]] = None) -> dict:
+        """
+        Get one page of entities using keyset (cursor) pagination
+        Returns: {'items', 'next_cursor', 'total', 'total_estimated'}
+        """
+        async def load():
+            query = self.repository._apply_filters(self._base_select(fields, sort), filters)
+            counted = total if total != 'estimate' or not filters else 'none'
+            return await self._keyset_page(query, after, sort, per_page, counted, fields)
+        
+        return await self._cached_list('after', {
+            'filters': filters, 'after': after, 'sort': sort,
+            'per_page': per_page, 'total': total, 'fields': fields
+        }, load, projected=fields is not None)
+    
+    async def update(self, entity_id: int, expected_version: Optional[int] = None, **kwargs) -> Optional[T]:
+        """
+        Update an entity
+        Raises VersionConflict when expected_version is not the current version
+        """
+        backend = self._search_backend()
+        summary = self.repository.summary
+        feed = self.repository.change_feed
+        version_field = self.repository.version_field
+        
+        async def work(session):
+            instance = await session.get(self.model, entity_id)
+            if instance is None:
+                return None
+            
+            current_version = getattr(instance, version_field) if version_field else None
+            if expected_version is not None and current_version != expected_version:
+                raise VersionConflict(current_version)
+            
+            before = summary.row(instance) if summary is not None else None
+            for key, value in kwargs.items():
+                # The version is bumped by the mapper, never taken from the client
+                if key != version_field and hasattr(instance, key):
+                    setattr(instance, key, value)
+            
+            try:
+                await session.flush()
+            except StaleDataError:
+                # Another writer committed between the load and this UPDATE
+                await session.rollback()
+                raise VersionConflict(await self._current_version(session, entity_id))
+            
+            if backend is not None:
+                await self._execute(session, backend.index_statement(instance))
+            if summary is not None:
+                await self._execute(session, summary.delta_statement([(before, summary.row(instance))]))
+            await self._record_changes(session, feed, [(entity_id, UPSERT)])
+            await session.commit()
+            return instance
+        
+        instance = await self.database.run(work)
+        if instance is not None:
+            self.repository._after_commit([entity_id])
+        return instance
+    
+    async def patch(self, entity_id: int, changes: Dict[str, Any],
+                    expected_version: Optional[int] = None) -> Optional[T]:
+        """
+        Update some columns of an entity with one conditional UPDATE and no
+        read before it, like BaseRepository.patch
+        Raises VersionConflict when expected_version is not the current version
+        Returns the updated entity, or None when it does not exist
+        """
+        values = self.repository._validate_changes(changes)
+        backend = self._search_backend()
+        summary = self.repository.summary
+        feed = self.repository.change_feed
+        lock_summary = summary is not None and bool(set(values) & set(summary.columns))
+        
+        version_field = self.repository.version_field
+        if version_field is not None:
+            values[version_field] = getattr(self.model, version_field) + 1
+        statement = self.repository._where_version(
+            update(self.model).where(self.primary_key == entity_id), expected_version
+        ).values(values).execution_options(synchronize_session=False)
+        returning = self.database.engine.dialect.update_returning
+        
+        async def work(session):
+            # Summary counts need the old values, read only when the patch can move them
+            before = await self._lock_summary_row(session, entity_id) if lock_summary else None
+            if returning:
+                instance = (await session.execute(statement.returning(self.model))).scalar_one_or_none()
+            elif (await session.execute(statement)).rowcount:
+                instance = await session.get(self.model, entity_id, populate_existing=True)
+            else:
+                instance = None
+            
+            if instance is None:
+                await self._raise_if_conflict(session, entity_id, expected_version)
+                return None
+            
+            if backend is not None:
+                await self._execute(session, backend.index_statement(instance))
+            if before is not None:
+                await self._execute(session, summary.delta_statement([(before, summary.row(instance))]))
+            await self._record_changes(session, feed, [(entity_id, UPSERT)])
+            await session.commit()
+            return instance
+        
+        instance = await self.database.run(work)
+        if instance is not None:
+            self.repository._after_commit([entity_id])
+        return instance
+    
+    async def delete(self, entity_id: int, expected_version: Optional[int] = None) -> bool:
+        """
+        Delete an entity with one DELETE and no read before it, like BaseRepository.delete
+        Raises VersionConflict when expected_version is not the current version
+        """
+        backend = self._search_backend()
+        summary = self.repository.summary
+        feed = self.repository.change_feed
+        statement = self.repository._where_version(
+            delete(self.model).where(self.primary_key == entity_id), expected_version
+        ).execution_options(synchronize_session=False)
+        delete_returning = self.database.engine.dialect.delete_returning
+        
+        async def work(session):
+            if summary is None:
+                deleted, before = (await session.execute(statement)).rowcount, None
+            elif delete_returning:
+                # The summary counts need the deleted values; RETURNING hands them back
+                columns = [getattr(self.model, column) for column in summary.columns]
+                before = (await session.execute(statement.returning(*columns))).mappings().first()
+                deleted = before is not None
+            else:
+                before = await self._lock_summary_row(session, entity_id)
+                deleted = before is not None and (await session.execute(statement)).rowcount
+            
+            if not deleted:
+                await self._raise_if_conflict(session, entity_id, expected_version)
+                return False
+            
+            if backend is not None:
+                await self._execute(session, backend.remove_statement(entity_id))
+            if before is not None:
+                await self._execute(session, summary.delta_statement([(dict(before), None)]))
+            await self._record_changes(session, feed, [(entity_id, DELETE)])
+            await session.commit()
+            return True
+        
+        deleted = await self.database.run(work)
+        if deleted:
+            self.repository._after_commit([entity_id])
+        return deleted
+    
+    async def get_fingerprint(self) -> tuple:
+        """
+        Cheap change fingerprint of the whole table without loading rows
+        Returns: (row_count, latest timestamp_field value)
+        """
+        timestamp = getattr(self.model, self.repository.timestamp_field)
+        query = select(func.count(self.primary_key), func.max(timestamp))
+        
+        async def work(session):
+            return (await session.execute(query)).one()
+        
+        row = await self.database.run(work)
+        return row[0], row[1]
+    
+    async def get_entity_validators(self, entity_id: int) -> Optional[tuple]:
+        """
+        Read only the timestamp_field and version_field of one entity
+        Returns (timestamp, version or None), or None when the entity does not exist
+        """
+        version_field = self.repository.version_field
+        columns = [getattr(self.model, self.repository.timestamp_field)]
+        if version_field is not None:
+            columns.append(getattr(self.model, version_field))
+        query = select(*columns).where(self.primary_key == entity_id)
+        
+        async def work(session):
+            return (await session.execute(query)).first()
+        
+        row = await self.database.run(work)
+        if row is None:
+            return None
+        return row[0], row[1] if version_field is not None else None
+    
+    def _search_backend(self) -> Optional[SearchBackend]:
+        """Resolve the search backend in the caller's app context, before leaving it"""
+        return self.repository.search_backend if self.repository.search_fields else None
+    
+    @staticmethod
+    async def _execute(session, statement: Optional[tuple]) -> None:
+        """Execute a (statement, params) pair from a search backend or summary, if any"""
+        if statement is not None:
+            await session.execute(*statement)
+    
+    @staticmethod
+    async def _record_changes(session, feed: Optional[ChangeFeed], entries: List[tuple]) -> None:
+        """Async counterpart of ChangeFeed.record, run last in the write transaction"""
+        if feed is None:
+            return
+        
+        entries = feed.compact(entries)
+        if not entries:
+            return
+        
+        if not feed.sequence_ready:
+            # As in ChangeFeed.prepare_sequence
+            if session.bind.dialect.name == 'sqlite':
+                await session.run_sync(lambda sync_session: feed.ensure_sequence(sync_session.connection()))
+            else:
+                async with session.bind.begin() as connection:
+                    await connection.run_sync(feed.ensure_sequence)
+        
+        result = None
+        for statement in feed.allocate_statements(len(entries)):
+            result = await session.execute(*statement)
+        await session.execute(*feed.record_statement(feed.allocated(result.scalar()), entries, datetime.utcnow()))
+    
+    async def _lock_summary_row(self, session, entity_id: int) -> Optional[Dict[str, Any]]:
+        """Async counterpart of BaseRepository._lock_summary_row"""
+        columns = [getattr(self.model, column) for column in self.repository.summary.columns]
+        row = (await session.execute(
+            select(*columns).where(self.primary_key == entity_id).with_for_update()
+        )).mappings().first()
+        return dict(row) if row is not None else None
+    
+    async def _raise_if_conflict(self, session, entity_id: int, expected_version: Optional[int]) -> None:
+        """Async counterpart of BaseRepository._raise_if_conflict"""
+        if expected_version is None:
+            return
+        
+        current = await self._current_version(session, entity_id)
+        if current is not None:
+            raise VersionConflict(current)
+    
+    async def _current_version(self, session, entity_id: int) -> Optional[int]:
+        version = getattr(self.model, self.repository.version_field)
+        return (await session.execute(select(version).where(self.primary_key == entity_id))).scalar()
+    
+    async def _load(self, entity_id: int) -> Optional[T]:
+        """Load an entity from the database, bypassing the cache"""
+        async def work(session):
+            return await session.get(self.model, entity_id)
+        
+        return await self.database.run(work)
+    
+    def _restore(self, row: Dict[str, Any]) -> T:
+        """Rebuild a cached row as a detached entity without a query"""
+        instance = self.model(**row)
+        make_transient_to_detached(instance)
+        return instance
+    
+    async def _cached_list(self, kind: str, params: Dict[str, Any],
+                           load: Callable[[], Awaitable[Any]], projected: bool = False):
+        """Serve a list or search page from the cache shared with the sync repository"""
+        cache = self.repository.cache
+        if cache is None:
+            return await load()
+        
+        key = self.repository._list_cache_key(cache, kind, params)
+        snapshot = cache.get(key) if key is not None else None
+        if snapshot is not None:
+            return snapshot if projected else self.repository._restore_result(snapshot, self._restore)
+        
+        result = await load()
+        if key is not None:
+            cache.set(key, result if projected else self.repository._snapshot_result(result))
+        return result
+    
+    def _base_select(self, fields: Optional[List[str]] = None, sort: Optional[str] = None):
+        """Entity select, or a column-only select when fields are given"""
+        if fields is None:
+            return select(self.model)
+        return select(*self.repository._columns(fields, sort))
+    
+    async def _fetch(self, session, query, fields: Optional[List[str]]) -> list:
+        """Run a select and return entities, or rows when fields are given"""
+        result = await session.execute(query)
+        return list(result.scalars() if fields is None else result)
+    
+    async def _paginate(self, query, page: int, per_page: int,
+                        fields: Optional[List[str]], order_by=None) -> tuple:
+        """
+        Offset pagination with a stable primary-key order
+        Returns: (items, total)
+        """
+        page = max(page, 1)
+        count_query = select(func.count()).select_from(query.order_by(None).subquery())
+        
+        if order_by is not None:
+            query = query.order_by(order_by)
+        query = query.order_by(self.primary_key).limit(per_page).offset((page - 1) * per_page)
+        
+        async def items(session):
+            return await self._fetch(session, query, fields)
+        
+        async def total(session):
+            return (await session.execute(count_query)).scalar_one()
+        
+        page_items, page_total = await self.database.gather(items, total)
+        return page_items, page_total
+    
+    async def _keyset_page(self, query, after: Optional[str], sort: Optional[str],
+                           per_page: int, total: str, fields: Optional[List[str]]) -> dict:
+        """
+        Keyset page using the sync repository's seek condition and cursor format
+        total is 'exact', 'estimate' or 'none'
+        """
+        count_query = select(func.count()).select_from(query.order_by(None).subquery())
+        estimate = self.repository._estimate_count_statement(self.database.engine.dialect.name)
+        query, sort = self.repository._keyset_query(query, after, sort)
+        query = query.limit(per_page + 1)
+        
+        async def rows(session):
+            return await self._fetch(session, query, fields)
+        
+        async def exact(session):
+            return (await session.execute(count_query)).scalar_one()
+        
+        async def estimated(session):
+            row = (await session.execute(*estimate)).first()
+            return int(row[0]) if row and row[0] is not None else None
+        
+        works = [rows]
+        if total == 'exact':
+            works.append(exact)
+        elif total == 'estimate' and estimate is not None:
+            works.append(estimated)
+        
+        results = await self.database.gather(*works)
+        page = self.repository._keyset_result(results[0], sort, per_page)
+        page['items'] = self.repository._project(page['items'], fields)
+        
+        if len(results) > 1:
+            page['total'] = results[1]
+            page['total_estimated'] = total == 'estimate' and page['total'] is not None
+        
+        return page
\ No newline at end of file
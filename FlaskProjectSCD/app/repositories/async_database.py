@@ -0,0 +1,137 @@
+import asyncio
+import contextvars
+import threading
+import weakref
+from typing import Any, Awaitable, Callable, List, Optional
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import StaticPool
+from ..db_pool import is_memory_sqlite
+
+# asyncio drivers replacing the sync ones when ASYNC_DATABASE_URL is not set
+async_drivers = {
+    'mysql': 'mysql+aiomysql',
+    'mysql+pymysql': 'mysql+aiomysql',
+    'sqlite': 'sqlite+aiosqlite',
+    'sqlite+pysqlite': 'sqlite+aiosqlite',
+}
+
+# Event loop of the ASGI server handling the current request, set by AsgiApp;
+# sessions opened on it stay on it instead of hopping to the database loop
+serving_loop = contextvars.ContextVar('serving_loop', default=None)
+
+
+def to_async_url(url: str) -> str:
+    """Swap the driver of a sync database URL for its asyncio counterpart"""
+    parsed = make_url(url)
+    if parsed.drivername in async_drivers.values():
+        return url
+    
+    if parsed.drivername not in async_drivers:
+        raise ValueError(f"No asyncio driver known for '{parsed.drivername}', set ASYNC_DATABASE_URL")
+    
+    return parsed.set(drivername=async_drivers[parsed.drivername]).render_as_string(hide_password=False)
+
+
+class AsyncDatabase:
+    """
+    SQLAlchemy asyncio engines, one per long-lived event loop
+    Pooled connections belong to the loop that opened them. Requests served
+    natively by an ASGI server (see AsgiApp) run their sessions on the
+    server's loop, with an engine of its own. Flask runs async views reached
+    through WSGI on a short-lived loop per request, so those sessions run on
+    one background loop instead, whose engine every such request shares
+    """
+    
+    def __init__(self, url: str, engine_options: Optional[dict] = None,
+                 instrument: Optional[Callable[[Any], None]] = None):
+        self.url = url
+        self.options = dict(engine_options or {})
+        self.instrument = instrument
+        
+        # An in-memory SQLite database lives and dies with its connection, so
+        # it gets a single engine on the background loop
+        self.in_memory = is_memory_sqlite(url)
+        if self.in_memory:
+            self.options = {'poolclass': StaticPool}
+        # Tables whose text index was built on this engine (in-memory only)
+        self.indexed_tables = set()
+        
+        self.engine, self.sessionmaker = self._create_engine()
+        self._serving = weakref.WeakKeyDictionary()
+        self._serving_lock = threading.Lock()
+        self.loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self.loop.run_forever, name='async-database', daemon=True)
+        self._thread.start()
+    
+    async def run(self, work: Callable[[AsyncSession], Awaitable[Any]]) -> Any:
+        """Run work(session) on the caller's loop when it is served natively, else on the database loop"""
+        loop = asyncio.get_running_loop()
+        if loop is self.loop:
+            return await self._session(work, self.sessionmaker)
+        if serving_loop.get() is loop and not self.in_memory:
+            return await self._session(work, self._serving_sessionmaker(loop))
+        
+        # The task runs in a copy of the caller's context, so per-request
+        # instrumentation sees queries run on this loop
+        future = asyncio.run_coroutine_threadsafe(self._session(work, self.sessionmaker), self.loop)
+        return await asyncio.wrap_future(future)
+    
+    def serving_engines(self) -> List[Any]:
+        """Engines of the server loops sessions ran on so far"""
+        with self._serving_lock:
+            return [engine for engine, _ in self._serving.values()]
+    
+    async def gather(self, *works: Callable[[AsyncSession], Awaitable[Any]]) -> list:
+        """
+        Run several works concurrently, each in its own session
+        With a single shared connection they run one after another instead
+        """
+        if self.in_memory:
+            return [await self.run(work) for work in works]
+        return list(await asyncio.gather(*[self.run(work) for work in works]))
+    
+    def run_sync(self, fn: Callable[[Any], Any]) -> Any:
+        """
+        Block until fn(connection) has run in a transaction on the database loop
+        fn receives a sync Connection, e.g. for metadata.create_all at startup
+        """
+        async def begin():
+            async with self.engine.begin() as connection:
+                return await connection.run_sync(fn)
+        
+        # An empty context keeps setup work out of the triggering request's metrics
+        return contextvars.Context().run(asyncio.run_coroutine_threadsafe, begin(), self.loop).result()
+    
+    def dispose(self) -> None:
+        """Close pooled connections and stop the loop"""
+        asyncio.run_coroutine_threadsafe(self.engine.dispose(), self.loop).result()
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        
+        # A server loop closes its own connections; it may be the caller's
+        with self._serving_lock:
+            serving = list(self._serving.items())
+            self._serving.clear()
+        for loop, (engine, _) in serving:
+            if loop.is_running():
+                asyncio.run_coroutine_threadsafe(engine.dispose(), loop)
+    
+    def _create_engine(self):
+        engine = create_async_engine(self.url, **self.options)
+        if self.instrument is not None:
+            self.instrument(engine.sync_engine)
+        return engine, async_sessionmaker(engine, expire_on_commit=False)
+    
+    def _serving_sessionmaker(self, loop):
+        entry = self._serving.get(loop)
+        if entry is None:
+            with self._serving_lock:
+                entry = self._serving.get(loop)
+                if entry is None:
+                    entry = self._serving[loop] = self._create_engine()
+        return entry[1]
+    
+    @staticmethod
+    async def _session(work, sessionmaker):
+        async with sessionmaker() as session:
+            return await work(session)
\ No newline at end of file
@@ -0,0 +1,46 @@
+from typing import Optional, Dict, Any, List
+from ..models.supplier import Supplier
+from .async_base_repository import AsyncBaseRepository
+from .supplier_repository import SupplierRepository
+
+
+class AsyncSupplierRepository(AsyncBaseRepository[Supplier]):
+    """
+    Async supplier repository, the counterpart of SupplierRepository
+    """
+    
+    def __init__(self):
+        super().__init__(SupplierRepository())
+    
+    async def search_suppliers(self, search_term: str, page: int = 1, per_page: int = 20,
+                               fields: Optional[List[str]] = None) -> tuple:
+        """
+        Search suppliers by name, contact person, or email
+        Results are ordered by relevance when the backend can rank them
+        """
+        async def load():
+            query, rank = self._search_backend().apply(self._base_select(fields), search_term)
+            items, total = await self._paginate(query, page, per_page, fields, order_by=rank)
+            return self.repository._project(items, fields), total
+        
+        return await self._cached_list('search', {
+            'term': search_term, 'page': page, 'per_page': per_page, 'fields': fields
+        }, load, projected=fields is not None)
+    
+    async def search_suppliers_after(self, search_term: str, after: Optional[str] = None,
+                                     sort: Optional[str] = None, per_page: int = 20,
+                                     total: str = 'none',
+                                     fields: Optional[List[str]] = None) -> Dict[str, Any]:
+        """
+        Search suppliers using keyset (cursor) pagination
+        An estimated total is not available for searches, so only 'exact' counts
+        """
+        async def load():
+            query, _ = self._search_backend().apply(self._base_select(fields, sort), search_term)
+            counted = 'exact' if total == 'exact' else 'none'
+            return await self._keyset_page(query, after, sort, per_page, counted, fields)
+        
+        return await self._cached_list('search_after', {
+            'term': search_term, 'after': after, 'sort': sort,
+            'per_page': per_page, 'total': total, 'fields': fields
+        }, load, projected=fields is not None)
\ No newline at end of file
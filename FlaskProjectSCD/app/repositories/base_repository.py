@@ -1,5 +1,22 @@
-from typing import TypeVar, Generic, List, Optional, Dict, Any
+import hashlib
+import json
+import uuid
+from datetime import datetime
+from typing import TypeVar, Generic, List, Optional, Dict, Any, Iterator, Callable
+from flask import current_app
+from sqlalchemy import delete, func, select, text, update
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import make_transient_to_detached
+from sqlalchemy.orm.exc import StaleDataError
 from .. import db
+from ..db_routing import reads_from, replica_read
+from ..utils.conditional import VersionConflict
+from ..utils.cursor import encode_cursor, decode_cursor
+from .search_backends import SearchBackend, create_search_backend
+from .cache_backends import CacheBackend, create_cache_backend
+from .summary_tables import SummaryTable
+from .change_feed import ChangeFeed, DELETE, UPSERT
+from .suggest_index import SuggestIndex
 
 T = TypeVar('T')
 
@@ -10,61 +27,534 @@ class BaseRepository(Generic[T]):
     Follows Repository Pattern and Open/Closed Principle
     """
     
+    # Columns that keyset pagination may sort on; subclasses extend this
+    # with non-nullable, indexed columns only
+    sortable_fields = ()
+    
+    # Text columns indexed by the configured search backend
+    search_fields = ()
+    
+    # Column bumped on every write; backs HTTP validators (ETag / Last-Modified)
+    timestamp_field = None
+    
+    # Integer row version bumped on every write (the mapper's version_id_col);
+    # makes updates and deletes conditional on the version a client read
+    version_field = None
+    
+    # SummaryTable subclass kept in step with every write, or None
+    summary_table = None
+    
+    # ChangeFeed subclass recording every write for delta sync, or None
+    change_feed_class = None
+    
+    # Columns the in-memory typeahead index matches word prefixes of
+    suggest_fields = ()
+    
     def __init__(self, model: T):
         self.model = model
+        self.primary_key = self.model.__mapper__.primary_key[0]
+    
+    @property
+    def search_backend(self) -> SearchBackend:
+        """Search backend for this model, built once per application"""
+        backends = current_app.extensions.setdefault('search_backends', {})
+        table = self.model.__tablename__
+        
+        if table not in backends:
+            backends[table] = create_search_backend(
+                current_app.config.get('SEARCH_BACKEND', 'auto'),
+                self.model, list(self.search_fields)
+            )
+        
+        return backends[table]
+    
+    @property
+    def cache(self) -> Optional[CacheBackend]:
+        """Read-through cache shared by all repositories, or None when disabled"""
+        extensions = current_app.extensions
+        if 'repository_cache' not in extensions:
+            extensions['repository_cache'] = create_cache_backend(current_app.config)
+        return extensions['repository_cache']
+    
+    @property
+    def summary(self) -> Optional[SummaryTable]:
+        """Summary table of this model, built once per application, or None"""
+        if self.summary_table is None:
+            return None
+        
+        summaries = current_app.extensions.setdefault('summary_tables', {})
+        table = self.model.__tablename__
+        if table not in summaries:
+            summaries[table] = self.summary_table(db.engine.dialect.name)
+        return summaries[table]
+    
+    @property
+    def change_feed(self) -> Optional[ChangeFeed]:
+        """Change feed of this model, built once per application, or None when off"""
+        if self.change_feed_class is None or not current_app.config.get('CHANGE_FEED_ENABLED', False):
+            return None
+        
+        feeds = current_app.extensions.setdefault('change_feeds', {})
+        table = self.model.__tablename__
+        if table not in feeds:
+            dialect = db.engine.dialect
+            feeds[table] = self.change_feed_class(dialect.name, dialect.update_returning)
+        return feeds[table]
+    
+    @property
+    def suggest_index(self) -> Optional[SuggestIndex]:
+        """Typeahead index of this model in this process, or None when off"""
+        config = current_app.config
+        # Other processes' writes only reach this one through the feed
+        if not self.suggest_fields or not config.get('SUGGEST_ENABLED', False) or self.change_feed is None:
+            return None
+        
+        indexes = current_app.extensions.setdefault('suggest_indexes', {})
+        table = self.model.__tablename__
+        if table not in indexes:
+            indexes[table] = SuggestIndex(
+                self.primary_key.key, self.suggest_fields, config['SUGGEST_MAX_MEMORY_MB'] * 1024 * 1024,
+                config['SUGGEST_REFRESH_SECONDS']
+            )
+        return indexes[table]
     
     def create(self, **kwargs) -> T:
         """Create a new entity"""
         instance = self.model(**kwargs)
         db.session.add(instance)
+        db.session.flush()
+        self._after_save(instance)
+        self._after_change([(None, instance)])
+        self._record_changes([(getattr(instance, self.primary_key.key), UPSERT)])
         db.session.commit()
+        self._after_commit([getattr(instance, self.primary_key.key)])
         return instance
     
+    @replica_read
     def get_by_id(self, entity_id: int) -> Optional[T]:
-        """Get entity by ID"""
-        return self.model.query.get(entity_id)
+        """
+        Get entity by ID
+        Served from the cache when enabled; the cached row is only trusted
+        while its per-entity version token is unchanged
+        """
+        cache = self.cache
+        if cache is None:
+            return self._load(entity_id)
+        
+        version_key, data_key = self._entity_keys(entity_id)
+        version, entry = cache.get_many([version_key, data_key])
+        
+        if version is not None and entry is not None and entry[0] == version:
+            return self.restore(entry[1])
+        
+        if version is None:
+            cache.add(version_key, uuid.uuid4().hex)
+            version = cache.get(version_key)
+        
+        # A lagging replica could store an old row under the new version
+        with reads_from('primary'):
+            instance = self._load(entity_id)
+        if instance is not None and version is not None:
+            cache.set(data_key, (version, self.snapshot(instance)))
+        
+        return instance
+    
+    @replica_read
+    def get_row_by_id(self, entity_id: int, fields: List[str]) -> Optional[Dict[str, Any]]:
+        """
+        Lean read of selected columns of one entity, without an ORM instance
+        Returns a plain dict or None when the entity does not exist
+        """
+        row = self._base_query(fields).filter(self.primary_key == entity_id).first()
+        return self._row_dict(row, fields) if row is not None else None
+    
+    @replica_read
+    def get_many(self, entity_ids: List[int], fields: Optional[List[str]] = None) -> Dict[int, Any]:
+        """
+        Load several entities with one IN query, keyed by primary key
+        With fields, values are plain dicts of those columns; ids that do
+        not exist are simply absent
+        """
+        if fields is None:
+            return self._get_many(entity_ids)
+        
+        rows = self._base_query(fields).filter(self.primary_key.in_(entity_ids)).all()
+        return {row._mapping[self.primary_key.key]: self._row_dict(row, fields) for row in rows}
     
-    def get_all(self, filters: Optional[Dict[str, Any]] = None, 
-                page: int = 1, per_page: int = 20) -> tuple:
+    @replica_read
+    def get_all(self, filters: Optional[Dict[str, Any]] = None,
+                page: int = 1, per_page: int = 20,
+                fields: Optional[List[str]] = None) -> tuple:
         """
         Get all entities with optional filters and pagination
+        With fields, only those columns are selected and items are plain dicts
         Returns: (items, total_count)
         """
-        query = self.model.query
-        
-        if filters:
-            for key, value in filters.items():
-                if hasattr(self.model, key):
-                    query = query.filter(getattr(self.model, key) == value)
+        def load():
+            query = self._apply_filters(self._base_query(fields), filters)
+            items, total = self._paginate(query, page, per_page)
+            return self._project(items, fields), total
         
-        total = query.count()
-        items = query.paginate(page=page, per_page=per_page, error_out=False).items
+        return self._cached_list('all', {
+            'filters': filters, 'page': page, 'per_page': per_page, 'fields': fields
+        }, load, projected=fields is not None)
+    
+    @replica_read
+    def get_page_after(self, filters: Optional[Dict[str, Any]] = None,
+                       after: Optional[str] = None, sort: Optional[str] = None,
+                       per_page: int = 20, total: str = 'none',
+                       fields: Optional[List[str]] = None) -> dict:
+        """
+        Get one page of entities using keyset (cursor) pagination
+        With fields, only those columns are selected and items are plain dicts
+        Returns: {'items', 'next_cursor', 'total', 'total_estimated'}
+        """
+        def load():
+            query = self._apply_filters(self._base_query(fields, sort), filters)
+            page = self._keyset_page(query, after, sort, per_page)
+            page['items'] = self._project(page['items'], fields)
+            
+            if total == 'exact':
+                page['total'] = query.order_by(None).count()
+            elif total == 'estimate' and not filters:
+                page['total'] = self.estimate_count()
+                page['total_estimated'] = page['total'] is not None
+            
+            return page
         
-        return items, total
+        return self._cached_list('after', {
+            'filters': filters, 'after': after, 'sort': sort,
+            'per_page': per_page, 'total': total, 'fields': fields
+        }, load, projected=fields is not None)
     
-    def update(self, entity_id: int, **kwargs) -> Optional[T]:
-        """Update an entity"""
-        instance = self.get_by_id(entity_id)
+    def iter_all(self, filters: Optional[Dict[str, Any]] = None,
+                 batch_size: Optional[int] = None,
+                 fields: Optional[List[str]] = None) -> Iterator[Any]:
+        """
+        Stream all matching entities in primary-key order
+        Uses a server-side cursor and fetches batch_size rows at a time
+        With fields, yields plain dicts of those columns instead of entities
+        """
+        query = self._apply_filters(self._base_query(fields), filters)
+        return self._iter_query(query, batch_size, fields)
+    
+    def update(self, entity_id: int, expected_version: Optional[int] = None, **kwargs) -> Optional[T]:
+        """
+        Update an entity
+        Raises VersionConflict when expected_version is not the current version
+        """
+        instance = self._load(entity_id, refresh=True)
         if not instance:
             return None
         
+        current_version = getattr(instance, self.version_field) if self.version_field else None
+        if expected_version is not None and current_version != expected_version:
+            raise VersionConflict(current_version)
+        
+        before = self._summary_row(instance)
         for key, value in kwargs.items():
-            if hasattr(instance, key):
+            if key != self.version_field and hasattr(instance, key):
                 setattr(instance, key, value)
         
+        try:
+            db.session.flush()
+        except StaleDataError:
+            # Another writer committed between the load and this UPDATE
+            db.session.rollback()
+            raise VersionConflict(self._current_version(entity_id))
+        
+        self._after_save(instance)
+        self._after_change([(before, instance)])
+        self._record_changes([(entity_id, UPSERT)])
         db.session.commit()
+        self._after_commit([entity_id])
         return instance
     
-    def delete(self, entity_id: int) -> bool:
-        """Delete an entity"""
-        instance = self.get_by_id(entity_id)
-        if not instance:
+    def patch(self, entity_id: int, changes: Dict[str, Any],
+              expected_version: Optional[int] = None) -> Optional[T]:
+        """
+        Update some columns of an entity with one UPDATE and no read before it
+        The version check and bump are part of the statement
+        (UPDATE ... WHERE id = ? AND version = ?), so concurrent writers cannot
+        overwrite each other. The row comes back through RETURNING where the
+        dialect supports it, otherwise from one SELECT after the UPDATE
+        Changing a column the summary table counts by locks and reads the row
+        first; the write hooks (search index, summary, change feed) add their
+        own statements to the transaction
+        Raises VersionConflict when expected_version is not the current version
+        Returns the updated entity, or None when it does not exist
+        """
+        values = self._validate_changes(changes)
+        # Summary counts need the old values, read only when the patch can move them
+        summary = self.summary
+        before = None
+        if summary is not None and set(values) & set(summary.columns):
+            before = self._lock_summary_row(entity_id)
+        
+        if self.version_field is not None:
+            values[self.version_field] = getattr(self.model, self.version_field) + 1
+        
+        statement = self._where_version(
+            update(self.model).where(self.primary_key == entity_id), expected_version
+        ).values(values).execution_options(synchronize_session=False)
+        
+        if db.engine.dialect.update_returning:
+            instance = db.session.execute(
+                statement.returning(self.model), execution_options={'populate_existing': True}
+            ).scalar_one_or_none()
+        elif db.session.execute(statement).rowcount:
+            instance = self._load(entity_id, refresh=True)
+        else:
+            instance = None
+        
+        if instance is None:
+            self._raise_if_conflict(entity_id, expected_version)
+            return None
+        
+        self._after_save(instance)
+        if before is not None:
+            self._after_change([(before, instance)])
+        self._record_changes([(entity_id, UPSERT)])
+        row = self.snapshot(instance)
+        db.session.commit()
+        self._after_commit([entity_id])
+        # The committed values are known, so the caller never reloads the expired row
+        return self.restore(row)
+    
+    def delete(self, entity_id: int, expected_version: Optional[int] = None) -> bool:
+        """
+        Delete an entity with one DELETE and no read before it
+        With a summary table the deleted values come back through RETURNING,
+        or from a locking read first where the dialect has no DELETE RETURNING
+        Raises VersionConflict when expected_version is not the current version
+        """
+        statement = self._where_version(
+            delete(self.model).where(self.primary_key == entity_id), expected_version
+        ).execution_options(synchronize_session=False)
+        
+        summary = self.summary
+        if summary is None:
+            deleted, before = db.session.execute(statement).rowcount, None
+        elif db.engine.dialect.delete_returning:
+            # The summary counts need the deleted values; RETURNING hands them back
+            columns = [getattr(self.model, column) for column in summary.columns]
+            before = db.session.execute(statement.returning(*columns)).mappings().first()
+            deleted = before is not None
+        else:
+            before = self._lock_summary_row(entity_id)
+            deleted = before is not None and db.session.execute(statement).rowcount
+        
+        if not deleted:
+            self._raise_if_conflict(entity_id, expected_version)
             return False
         
-        db.session.delete(instance)
+        self._after_delete(entity_id)
+        if before is not None:
+            self._after_change([(dict(before), None)])
+        self._record_changes([(entity_id, DELETE)])
         db.session.commit()
+        self._after_commit([entity_id])
         return True
     
+    def bulk_create(self, items: List[Dict[str, Any]],
+                    chunk_size: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Create many entities, committing once per chunk
+        Rows in a chunk are flushed together so the dialect can batch the INSERT
+        Returns one result per item: {'index', 'success', 'id' | 'error'}
+        """
+        results = [None] * len(items)
+        pending = []
+        
+        for index, data in enumerate(items):
+            error = self._validate_new(data)
+            if error:
+                results[index] = self._bulk_error(index, error)
+            else:
+                pending.append(index)
+        
+        for chunk in self._chunks(pending, chunk_size):
+            def write(indexes):
+                instances = [self.model(**items[index]) for index in indexes]
+                db.session.add_all(instances)
+                db.session.flush()
+                for instance in instances:
+                    self._after_save(instance)
+                self._after_change([(None, instance) for instance in instances])
+                ids = [getattr(instance, self.primary_key.key) for instance in instances]
+                self._record_changes([(entity_id, UPSERT) for entity_id in ids])
+                return ids
+            
+            self._write_chunk(chunk, write, results)
+        
+        return results
+    
+    def bulk_update(self, items: List[Dict[str, Any]],
+                    chunk_size: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Update many entities, each item carrying its primary key
+        Each chunk loads its rows with one IN query and commits once
+        An item carrying version_field fails unless that is still the current version
+        Returns one result per item: {'index', 'success', 'id' | 'error'}
+        """
+        pk_name = self.primary_key.key
+        results = [None] * len(items)
+        pending = []
+        
+        for index, data in enumerate(items):
+            if not isinstance(data, dict) or data.get(pk_name) is None:
+                results[index] = self._bulk_error(index, f"{pk_name} is required")
+            else:
+                pending.append(index)
+        
+        for chunk in self._chunks(pending, chunk_size):
+            found = self._get_many([items[index][pk_name] for index in chunk])
+            existing = []
+            
+            for index in chunk:
+                if items[index][pk_name] in found:
+                    existing.append(index)
+                else:
+                    results[index] = self._bulk_error(index, f"{self.model.__name__} not found")
+            
+            def write(indexes):
+                instances = []
+                # (row before this write, instance) once per instance, since an id may repeat
+                written = {}
+                for index in indexes:
+                    instance = found[items[index][pk_name]]
+                    if self.version_field and items[index].get(self.version_field) is not None:
+                        current_version = getattr(instance, self.version_field)
+                        if items[index][self.version_field] != current_version:
+                            raise VersionConflict(current_version)
+                    
+                    if id(instance) not in written:
+                        written[id(instance)] = (self._summary_row(instance), instance)
+                    for key, value in items[index].items():
+                        if key not in (pk_name, self.version_field) and hasattr(instance, key):
+                            setattr(instance, key, value)
+                    instances.append(instance)
+                
+                db.session.flush()
+                for _, instance in written.values():
+                    self._after_save(instance)
+                self._after_change(list(written.values()))
+                ids = [getattr(instance, pk_name) for instance in instances]
+                self._record_changes([(entity_id, UPSERT) for entity_id in ids])
+                return ids
+            
+            self._write_chunk(existing, write, results)
+        
+        return results
+    
+    def bulk_delete(self, entity_ids: List[int],
+                    chunk_size: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Delete many entities with one DELETE ... WHERE id IN (...) per chunk
+        Returns one result per id: {'index', 'success', 'id' | 'error'}
+        """
+        results = [None] * len(entity_ids)
+        
+        for chunk in self._chunks(list(range(len(entity_ids))), chunk_size):
+            found = self._get_many([entity_ids[index] for index in chunk])
+            existing = []
+            
+            for index in chunk:
+                if entity_ids[index] in found:
+                    existing.append(index)
+                else:
+                    results[index] = self._bulk_error(index, f"{self.model.__name__} not found")
+            
+            def write(indexes):
+                ids = [entity_ids[index] for index in indexes]
+                before = [self._summary_row(found[entity_id]) for entity_id in ids]
+                self.model.query.filter(self.primary_key.in_(ids)).delete()
+                for entity_id in ids:
+                    self._after_delete(entity_id)
+                self._after_change([(row, None) for row in before])
+                self._record_changes([(entity_id, DELETE) for entity_id in ids])
+                return ids
+            
+            self._write_chunk(existing, write, results)
+        
+        return results
+    
+    def bulk_upsert(self, items: List[Dict[str, Any]], key: str,
+                    chunk_size: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Insert or update many entities matched on a natural key column
+        Each chunk resolves existing rows with one IN query, then flushes the
+        inserts and updates together and commits once
+        Returns one result per item: {'index', 'success', 'id', 'action' | 'error'}
+        """
+        if key not in self.model.__table__.columns:
+            raise ValueError(f"Unknown upsert key '{key}'")
+        
+        key_column = getattr(self.model, key)
+        results = [None] * len(items)
+        pending = []
+        
+        for index, data in enumerate(items):
+            error = self._validate_new(data)
+            if error:
+                results[index] = self._bulk_error(index, error)
+            else:
+                pending.append(index)
+        
+        for chunk in self._chunks(pending, chunk_size):
+            keys = {items[index].get(key) for index in chunk} - {None}
+            found = {}
+            for instance in self.model.query.filter(key_column.in_(keys)).order_by(self.primary_key):
+                found.setdefault(getattr(instance, key), instance)
+            actions = {}
+            
+            def write(indexes):
+                # Work on a copy so a rolled-back attempt leaves found untouched
+                known = dict(found)
+                instances = []
+                # (row before this write, instance) once per instance, since
+                # a key may repeat; a repeat of a new row has no row before
+                written = {}
+                
+                for index in indexes:
+                    data = items[index]
+                    instance = known.get(data.get(key))
+                    
+                    if instance is None:
+                        instance = self.model(**data)
+                        db.session.add(instance)
+                        actions[index] = 'created'
+                        written[id(instance)] = (None, instance)
+                        if data.get(key) is not None:
+                            known[data[key]] = instance
+                    else:
+                        if id(instance) not in written:
+                            written[id(instance)] = (self._summary_row(instance), instance)
+                        for field, value in data.items():
+                            setattr(instance, field, value)
+                        actions[index] = 'updated'
+                    
+                    instances.append(instance)
+                
+                db.session.flush()
+                for _, instance in written.values():
+                    self._after_save(instance)
+                self._after_change(list(written.values()))
+                ids = [getattr(instance, self.primary_key.key) for instance in instances]
+                self._record_changes([(entity_id, UPSERT) for entity_id in ids])
+                
+                found.update(known)
+                return ids
+            
+            self._write_chunk(chunk, write, results)
+            
+            for index in chunk:
+                if results[index]['success']:
+                    results[index]['action'] = actions[index]
+        
+        return results
+    
+    @replica_read
     def exists(self, **kwargs) -> bool:
         """Check if entity exists with given criteria"""
         query = self.model.query
@@ -73,13 +563,518 @@ class BaseRepository(Generic[T]):
                 query = query.filter(getattr(self.model, key) == value)
         return query.first() is not None
     
+    @replica_read
     def count(self, filters: Optional[Dict[str, Any]] = None) -> int:
         """Count entities with optional filters"""
-        query = self.model.query
+        return self._apply_filters(self.model.query, filters).count()
+    
+    @replica_read
+    def get_fingerprint(self) -> tuple:
+        """
+        Cheap change fingerprint of the whole table without loading rows
+        Returns: (row_count, latest timestamp_field value)
+        """
+        timestamp = getattr(self.model, self.timestamp_field)
+        row = db.session.query(func.count(self.primary_key), func.max(timestamp)).one()
+        return row[0], row[1]
+    
+    @replica_read
+    def get_entity_validators(self, entity_id: int) -> Optional[tuple]:
+        """
+        Read only the timestamp_field and version_field of one entity
+        Returns (timestamp, version or None), or None when the entity does not exist
+        """
+        columns = [getattr(self.model, self.timestamp_field)]
+        if self.version_field is not None:
+            columns.append(getattr(self.model, self.version_field))
+        
+        row = db.session.query(*columns).filter(self.primary_key == entity_id).first()
+        if row is None:
+            return None
+        return row[0], row[1] if self.version_field is not None else None
+    
+    @replica_read
+    def get_changes(self, since: int, limit: int) -> Optional[Dict[str, Any]]:
+        """
+        Change feed entries written after the token since, oldest first, with
+        the current row of every upserted entity (one IN query for the page)
+        Returns: {'items': [(change, entity or None)], 'next_token', 'has_more'},
+        or None when the model has no change feed
+        """
+        feed = self.change_feed
+        if feed is None:
+            return None
+        
+        changes = feed.read(since, limit + 1)
+        has_more = len(changes) > limit
+        changes = changes[:limit]
+        
+        upserted = [getattr(change, feed.key) for change in changes if change.operation == UPSERT]
+        found = self._get_many(upserted) if upserted else {}
+        return {
+            'items': [(change, found.get(getattr(change, feed.key))) for change in changes],
+            'next_token': changes[-1].seq if changes else since,
+            'has_more': has_more
+        }
+    
+    @replica_read
+    def get_change_token(self) -> Optional[int]:
+        """Token of the newest change feed entry, or None without a change feed"""
+        feed = self.change_feed
+        return feed.latest() if feed is not None else None
+    
+    def suggest(self, query: str, limit: int) -> Optional[Dict[str, Any]]:
+        """
+        Entities with a suggest_fields word starting with query, from memory
+        only. A process whose index is not built yet waits up to
+        SUGGEST_BUILD_WAIT_SECONDS for the sync thread to build it
+        Returns: {'items', 'complete'}, or None when the index is off
+        """
+        index = self.suggest_index
+        if index is None:
+            return None
+        
+        index.start(current_app._get_current_object(), type(self))
+        if not index.ready.wait(current_app.config['SUGGEST_BUILD_WAIT_SECONDS']):
+            return {'items': [], 'complete': False}
+        return {'items': index.search(query, limit), 'complete': index.index.complete}
+    
+    def release_session(self) -> None:
+        """
+        End the session's transaction and hand its connection back to the pool
+        Long-lived requests call this between reads, so an idle stream holds
+        no connection and its next read sees newly committed rows
+        """
+        db.session.close()
+    
+    def estimate_count(self) -> Optional[int]:
+        """
+        Cheap row-count estimate read from table statistics instead of COUNT(*)
+        Returns None when the database does not expose an estimate
+        """
+        statement = self._estimate_count_statement(db.engine.dialect.name)
+        if statement is None:
+            return None
+        
+        row = db.session.execute(*statement).first()
+        return int(row[0]) if row and row[0] is not None else None
+    
+    def snapshot(self, instance: T) -> Dict[str, Any]:
+        """
+        Column values of an entity, safe to store in any cache backend
+        Services keeping their own caches use this with restore()
+        """
+        return {
+            attribute.key: getattr(instance, attribute.key)
+            for attribute in self.model.__mapper__.column_attrs
+        }
+    
+    def restore(self, row: Dict[str, Any]) -> T:
+        """Attach a cached row to the session as a persistent entity without a query"""
+        instance = self.model(**row)
+        make_transient_to_detached(instance)
+        return db.session.merge(instance, load=False)
+    
+    def _after_save(self, instance: T) -> None:
+        """Hook run inside the write transaction after an insert or update"""
+        if self.search_fields:
+            self.search_backend.index(instance)
+    
+    def _after_delete(self, entity_id: int) -> None:
+        """Hook run inside the write transaction after a delete"""
+        if self.search_fields:
+            self.search_backend.remove(entity_id)
+    
+    def _after_change(self, changes: List[tuple]) -> None:
+        """
+        Hook run inside the write transaction with (old, new) pairs of the
+        written entities; old is a _summary_row (None for an insert) and new
+        an entity (None for a delete). Moves the summary table's counts
+        """
+        summary = self.summary
+        if summary is None:
+            return
         
+        summary.apply([
+            (old, summary.row(new) if new is not None else None) for old, new in changes
+        ])
+    
+    def _record_changes(self, entries: List[tuple]) -> None:
+        """
+        Hook run last inside the write transaction with (entity id, UPSERT or
+        DELETE) pairs; numbering them takes the change feed's counter lock,
+        held only until the commit that follows
+        """
+        feed = self.change_feed
+        if feed is not None:
+            feed.record(entries, datetime.utcnow())
+    
+    def _summary_row(self, instance: T) -> Optional[Dict[str, Any]]:
+        """Summary source columns of an entity before it changes, or None without a summary"""
+        summary = self.summary
+        return summary.row(instance) if summary is not None else None
+    
+    def _lock_summary_row(self, entity_id: int) -> Optional[Dict[str, Any]]:
+        """
+        Read the summary source columns of one entity, locking the row until
+        commit so the counts move from the values the write replaces
+        """
+        columns = [getattr(self.model, column) for column in self.summary.columns]
+        row = db.session.execute(
+            select(*columns).where(self.primary_key == entity_id).with_for_update()
+        ).mappings().first()
+        return dict(row) if row is not None else None
+    
+    def _after_commit(self, entity_ids: List[int]) -> None:
+        """
+        Hook run once a write is committed
+        Rotates the version tokens of the written entities and of the list
+        pages, so readers racing with the write can never revive stale rows,
+        and wakes this process's typeahead sync
+        """
+        index = self.suggest_index
+        if index is not None:
+            # The write is committed already; a stale index must not fail it
+            try:
+                index.start(current_app._get_current_object(), type(self))
+                index.notify()
+            except Exception:
+                current_app.logger.exception("Could not wake the suggest index sync")
+        
+        cache = self.cache
+        if cache is None or not entity_ids:
+            return
+        
+        table = self.model.__tablename__
+        cache.set(f'{table}:list-version', uuid.uuid4().hex)
+        for entity_id in entity_ids:
+            version_key, data_key = self._entity_keys(entity_id)
+            cache.set(version_key, uuid.uuid4().hex)
+            cache.delete(data_key)
+    
+    def _load(self, entity_id: int, refresh: bool = False) -> Optional[T]:
+        """
+        Load an entity from the database, bypassing the cache
+        refresh re-reads the row even if a cached copy sits in the session
+        """
+        if refresh:
+            return db.session.get(self.model, entity_id, populate_existing=True)
+        return self.model.query.get(entity_id)
+    
+    def _validate_changes(self, changes: Dict[str, Any]) -> Dict[str, Any]:
+        """Check a partial update for unknown, read-only and illegally null fields"""
+        if not isinstance(changes, dict) or not changes:
+            raise ValueError("No fields to update")
+        
+        columns = self.model.__table__.columns
+        for key, value in changes.items():
+            if key not in columns or key == self.version_field:
+                raise ValueError(f"Unknown field '{key}'")
+            if columns[key].primary_key:
+                raise ValueError(f"{key} cannot be changed")
+            if value is None and not columns[key].nullable:
+                raise ValueError(f"{key} cannot be null")
+        
+        return dict(changes)
+    
+    def _where_version(self, statement, expected_version: Optional[int]):
+        """Make an UPDATE or DELETE match only while the row has expected_version"""
+        if expected_version is None:
+            return statement
+        if self.version_field is None:
+            raise ValueError(f"{self.model.__name__} has no version to match")
+        return statement.where(getattr(self.model, self.version_field) == expected_version)
+    
+    def _raise_if_conflict(self, entity_id: int, expected_version: Optional[int]) -> None:
+        """
+        After a conditional write matched no row, tell a stale version from a
+        missing entity; only this failure path pays for the extra read
+        """
+        if expected_version is None:
+            return
+        
+        current = self._current_version(entity_id)
+        if current is not None:
+            raise VersionConflict(current)
+    
+    def _current_version(self, entity_id: int) -> Optional[int]:
+        """Version of an entity read from the primary, or None when it does not exist"""
+        version = getattr(self.model, self.version_field)
+        return db.session.query(version).filter(self.primary_key == entity_id).scalar()
+    
+    def _estimate_count_statement(self, dialect: str) -> Optional[tuple]:
+        """
+        Statement reading the row-count estimate on the given dialect
+        Returns (statement, params), or None when there is no cheap estimate
+        """
+        table = self.model.__table__.name
+        
+        if dialect == 'mysql':
+            return text(
+                "SELECT TABLE_ROWS FROM information_schema.TABLES "
+                "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = :table"
+            ), {'table': table}
+        
+        if dialect == 'sqlite':
+            # MAX(rowid) is a single index seek; it overshoots only by deleted rows
+            return text(f'SELECT COALESCE(MAX(rowid), 0) FROM "{table}"'), {}
+        
+        return None
+    
+    def _entity_keys(self, entity_id: int) -> tuple:
+        """Cache keys for an entity's version token and cached row"""
+        table = self.model.__tablename__
+        return f'{table}:entity-version:{entity_id}', f'{table}:entity:{entity_id}'
+    
+    def _cached_list(self, kind: str, params: Dict[str, Any], load: Callable[[], Any],
+                     projected: bool = False):
+        """
+        Serve a list or search page from the cache, keyed by the current
+        list version so any committed write makes older pages unreachable
+        Projected results already hold plain dicts and are cached as they are
+        Misses load from the primary, so a lagging replica is never cached
+        under the new version
+        """
+        cache = self.cache
+        if cache is None:
+            return load()
+        
+        key = self._list_cache_key(cache, kind, params)
+        snapshot = cache.get(key) if key is not None else None
+        if snapshot is not None:
+            return snapshot if projected else self._restore_result(snapshot)
+        
+        with reads_from('primary'):
+            result = load()
+        if key is not None:
+            cache.set(key, result if projected else self._snapshot_result(result))
+        return result
+    
+    def _list_cache_key(self, cache: CacheBackend, kind: str, params: Dict[str, Any]) -> Optional[str]:
+        """
+        Cache key of a list or search page under the current list version
+        Returns None when the cache cannot hold a version token
+        """
+        table = self.model.__tablename__
+        version_key = f'{table}:list-version'
+        version = cache.get(version_key)
+        if version is None:
+            cache.add(version_key, uuid.uuid4().hex)
+            version = cache.get(version_key)
+        
+        if version is None:
+            return None
+        
+        digest = hashlib.sha1(
+            json.dumps(params, sort_keys=True, default=str).encode('utf-8')
+        ).hexdigest()
+        return f'{table}:list:{version}:{kind}:{digest}'
+    
+    def _snapshot_result(self, result) -> tuple:
+        """Cacheable form of an (items, total) tuple or a keyset page dict"""
+        if isinstance(result, tuple):
+            items, total = result
+            return 'tuple', [self.snapshot(item) for item in items], total
+        
+        extra = {key: value for key, value in result.items() if key != 'items'}
+        return 'page', [self.snapshot(item) for item in result['items']], extra
+    
+    def _restore_result(self, snapshot: tuple, restore: Optional[Callable] = None):
+        """Inverse of _snapshot_result; restore turns each row back into an entity"""
+        kind, rows, extra = snapshot
+        items = [(restore or self.restore)(row) for row in rows]
+        
+        if kind == 'tuple':
+            return items, extra
+        
+        return dict(extra, items=items)
+    
+    def _validate_new(self, data: Any) -> Optional[str]:
+        """Check an item for unknown fields and missing required columns"""
+        if not isinstance(data, dict):
+            return "Item must be an object"
+        
+        columns = self.model.__table__.columns
+        for key in data:
+            if key not in columns:
+                return f"Unknown field '{key}'"
+        
+        for column in columns:
+            required = (
+                not column.nullable and column.default is None
+                and column.server_default is None and not column.primary_key
+            )
+            if required and data.get(column.key) is None:
+                return f"{column.key} is required"
+        
+        return None
+    
+    def _get_many(self, entity_ids: List[int]) -> Dict[int, T]:
+        """Load entities by primary key with a single IN query"""
+        instances = self.model.query.filter(self.primary_key.in_(entity_ids)).all()
+        return {getattr(instance, self.primary_key.key): instance for instance in instances}
+    
+    def _chunks(self, indexes: List[int], chunk_size: Optional[int]):
+        """Split item indexes into chunks of the configured bulk size"""
+        size = chunk_size or current_app.config.get('BULK_CHUNK_SIZE', 500)
+        for start in range(0, len(indexes), size):
+            yield indexes[start:start + size]
+    
+    def _write_chunk(self, indexes: List[int], write, results: list) -> None:
+        """
+        Run write(indexes) in a savepoint and commit the chunk
+        If the chunk fails, retry its items one by one so only the bad rows fail
+        """
+        if not indexes:
+            return
+        
+        try:
+            with db.session.begin_nested():
+                entity_ids = write(indexes)
+            for index, entity_id in zip(indexes, entity_ids):
+                results[index] = {'index': index, 'success': True, 'id': entity_id}
+        except (SQLAlchemyError, TypeError, ValueError, VersionConflict):
+            for index in indexes:
+                try:
+                    with db.session.begin_nested():
+                        entity_id = write([index])[0]
+                    results[index] = {'index': index, 'success': True, 'id': entity_id}
+                except (SQLAlchemyError, TypeError, ValueError, VersionConflict) as e:
+                    results[index] = self._bulk_error(index, str(e.__cause__ or e))
+        
+        db.session.commit()
+        self._after_commit([results[index]['id'] for index in indexes if results[index]['success']])
+    
+    @staticmethod
+    def _bulk_error(index: int, message: str) -> Dict[str, Any]:
+        """Build a failed per-item bulk result"""
+        return {'index': index, 'success': False, 'error': message}
+    
+    def _iter_query(self, query, batch_size: Optional[int] = None,
+                    fields: Optional[List[str]] = None) -> Iterator[Any]:
+        """Iterate a query with yield_per so memory stays bounded"""
+        batch_size = batch_size or current_app.config.get('EXPORT_BATCH_SIZE', 1000)
+        rows = query.order_by(self.primary_key).yield_per(batch_size)
+        
+        if fields is None:
+            return iter(rows)
+        return (self._row_dict(row, fields) for row in rows)
+    
+    def _base_query(self, fields: Optional[List[str]] = None, sort: Optional[str] = None):
+        """
+        Entity query, or a column-only query when fields are given
+        Column queries skip ORM hydration and the session identity map; the
+        primary key and sort column are selected too so keyset cursors work
+        """
+        if fields is None:
+            return self.model.query
+        
+        return db.session.query(*self._columns(fields, sort))
+    
+    def _columns(self, fields: List[str], sort: Optional[str] = None) -> list:
+        """Validate fields and return them as columns, plus the primary key and sort column"""
+        known = {attribute.key for attribute in self.model.__mapper__.column_attrs}
+        for field in fields:
+            if field not in known:
+                raise ValueError(f"Unknown field '{field}'")
+        
+        names = list(fields)
+        for extra in (self.primary_key.key, sort):
+            if extra in known and extra not in names:
+                names.append(extra)
+        
+        return [getattr(self.model, name) for name in names]
+    
+    def _project(self, items: list, fields: Optional[List[str]]) -> list:
+        """Turn column-query rows into dicts; entities pass through unchanged"""
+        if fields is None:
+            return items
+        return [self._row_dict(row, fields) for row in items]
+    
+    @staticmethod
+    def _row_dict(row, fields: List[str]) -> Dict[str, Any]:
+        """Serialize a result row like to_dict does, limited to fields"""
+        mapping = row._mapping
+        return {
+            field: mapping[field].isoformat() if isinstance(mapping[field], datetime) else mapping[field]
+            for field in fields
+        }
+    
+    def _apply_filters(self, query, filters: Optional[Dict[str, Any]]):
+        """Apply simple equality filters for known columns"""
         if filters:
             for key, value in filters.items():
                 if hasattr(self.model, key):
                     query = query.filter(getattr(self.model, key) == value)
+        return query
+    
+    def _paginate(self, query, page: int, per_page: int, order_by=None) -> tuple:
+        """
+        Offset pagination with a stable primary-key order
+        paginate() already runs the COUNT, so no separate count() is issued
+        """
+        if order_by is not None:
+            query = query.order_by(order_by)
+        
+        pagination = query.order_by(self.primary_key).paginate(
+            page=page, per_page=per_page, error_out=False
+        )
+        return pagination.items, pagination.total
+    
+    def _keyset_page(self, query, after: Optional[str], sort: Optional[str],
+                     per_page: int) -> dict:
+        """
+        Seek to the row after the cursor using (sort column, primary key) order
+        Fetches one extra row to learn whether a next page exists
+        """
+        query, sort = self._keyset_query(query, after, sort)
+        rows = query.limit(per_page + 1).all()
+        return self._keyset_result(rows, sort, per_page)
+    
+    def _keyset_query(self, query, after: Optional[str], sort: Optional[str]) -> tuple:
+        """
+        Apply the cursor's seek condition and the keyset order to query
+        Returns: (query, sort)
+        """
+        sort = sort or self.primary_key.key
+        if sort != self.primary_key.key and sort not in self.sortable_fields:
+            raise ValueError(f"Cannot sort by '{sort}'")
+        
+        sort_column = getattr(self.model, sort)
+        pk_column = getattr(self.model, self.primary_key.key)
+        position = decode_cursor(after, sort)
+        
+        if position is not None:
+            value, last_id = position
+            if sort == self.primary_key.key:
+                query = query.filter(pk_column > last_id)
+            else:
+                query = query.filter(db.or_(
+                    sort_column > value,
+                    db.and_(sort_column == value, pk_column > last_id)
+                ))
+        
+        if sort == self.primary_key.key:
+            query = query.order_by(pk_column)
+        else:
+            query = query.order_by(sort_column, pk_column)
+        
+        return query, sort
+    
+    def _keyset_result(self, rows: list, sort: str, per_page: int) -> dict:
+        """Build a keyset page from up to per_page + 1 fetched rows"""
+        items = rows[:per_page]
+        
+        next_cursor = None
+        if len(rows) > per_page:
+            last = items[-1]
+            next_cursor = encode_cursor(
+                sort, getattr(last, sort), getattr(last, self.primary_key.key)
+            )
         
-        return query.count()
\ No newline at end of file
+        return {
+            'items': items,
+            'next_cursor': next_cursor,
+            'total': None,
+            'total_estimated': False
+        }
\ No newline at end of file
@@ -0,0 +1,171 @@
+import pickle
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, List, Optional
+
+
+class CacheBackend:
+    """
+    Key/value store used by the repository read-through cache
+    Values are plain Python structures; backends handle their own encoding
+    """
+    
+    name = 'base'
+    
+    def get(self, key: str) -> Optional[Any]:
+        """Return the cached value or None"""
+        raise NotImplementedError
+    
+    def get_many(self, keys: List[str]) -> List[Optional[Any]]:
+        """Return cached values for several keys in one call"""
+        return [self.get(key) for key in keys]
+    
+    def set(self, key: str, value: Any, ttl: Optional[int] = None) -> None:
+        """Store a value, expiring after ttl seconds when given"""
+        raise NotImplementedError
+    
+    def add(self, key: str, value: Any, ttl: Optional[int] = None) -> bool:
+        """Store a value only if the key is absent; returns True if stored"""
+        raise NotImplementedError
+    
+    def delete(self, *keys: str) -> None:
+        """Remove keys"""
+        raise NotImplementedError
+    
+    def clear(self) -> None:
+        """Remove every key"""
+        raise NotImplementedError
+
+
+class MemoryCacheBackend(CacheBackend):
+    """
+    In-process LRU cache with per-entry TTL and a bound on entry count
+    Each worker process has its own copy, so use a shared backend when
+    several workers must see each other's invalidations
+    """
+    
+    name = 'memory'
+    
+    def __init__(self, max_entries: int = 10000, default_ttl: Optional[int] = None):
+        self.max_entries = max_entries
+        self.default_ttl = default_ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, key: str) -> Optional[Any]:
+        """Return a live entry and mark it most recently used"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            
+            value, expires_at = entry
+            if expires_at is not None and expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            
+            self._entries.move_to_end(key)
+            return value
+    
+    def set(self, key: str, value: Any, ttl: Optional[int] = None) -> None:
+        """Store a value, evicting least recently used entries past the bound"""
+        ttl = ttl if ttl is not None else self.default_ttl
+        expires_at = time.monotonic() + ttl if ttl else None
+        
+        with self._lock:
+            self._entries[key] = (value, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+    
+    def add(self, key: str, value: Any, ttl: Optional[int] = None) -> bool:
+        """Store a value only if no live entry exists"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and (entry[1] is None or entry[1] > time.monotonic()):
+                return False
+        
+        self.set(key, value, ttl)
+        return True
+    
+    def delete(self, *keys: str) -> None:
+        """Remove keys if present"""
+        with self._lock:
+            for key in keys:
+                self._entries.pop(key, None)
+    
+    def clear(self) -> None:
+        """Drop every entry"""
+        with self._lock:
+            self._entries.clear()
+
+
+class RedisCacheBackend(CacheBackend):
+    """
+    Shared cache on a Redis-compatible server, visible to every worker
+    Requires the optional 'redis' package
+    """
+    
+    name = 'redis'
+    
+    def __init__(self, url: str, default_ttl: Optional[int] = None, key_prefix: str = ''):
+        try:
+            import redis
+        except ImportError:
+            raise RuntimeError("CACHE_BACKEND=redis requires the 'redis' package")
+        
+        self.client = redis.Redis.from_url(url)
+        self.default_ttl = default_ttl
+        self.key_prefix = key_prefix
+    
+    def get(self, key: str) -> Optional[Any]:
+        """Fetch and decode one key"""
+        return self._decode(self.client.get(self.key_prefix + key))
+    
+    def get_many(self, keys: List[str]) -> List[Optional[Any]]:
+        """Fetch several keys with a single MGET round trip"""
+        values = self.client.mget([self.key_prefix + key for key in keys])
+        return [self._decode(value) for value in values]
+    
+    def set(self, key: str, value: Any, ttl: Optional[int] = None) -> None:
+        """Encode and store one key"""
+        ttl = ttl if ttl is not None else self.default_ttl
+        self.client.set(self.key_prefix + key, pickle.dumps(value), ex=ttl or None)
+    
+    def add(self, key: str, value: Any, ttl: Optional[int] = None) -> bool:
+        """SET NX; returns True if the key was stored"""
+        ttl = ttl if ttl is not None else self.default_ttl
+        return bool(self.client.set(self.key_prefix + key, pickle.dumps(value), ex=ttl or None, nx=True))
+    
+    def delete(self, *keys: str) -> None:
+        """Remove keys"""
+        if keys:
+            self.client.delete(*[self.key_prefix + key for key in keys])
+    
+    def clear(self) -> None:
+        """Remove every key under this backend's prefix"""
+        for key in self.client.scan_iter(f'{self.key_prefix}*'):
+            self.client.delete(key)
+    
+    @staticmethod
+    def _decode(value) -> Optional[Any]:
+        return pickle.loads(value) if value is not None else None
+
+
+def create_cache_backend(config) -> Optional[CacheBackend]:
+    """
+    Build the configured cache backend
+    Returns None when caching is disabled (CACHE_BACKEND=none)
+    """
+    backend_name = config.get('CACHE_BACKEND', 'none')
+    ttl = config.get('CACHE_TTL')
+    
+    if backend_name == 'none':
+        return None
+    if backend_name == MemoryCacheBackend.name:
+        return MemoryCacheBackend(config.get('CACHE_MAX_ENTRIES', 10000), ttl)
+    if backend_name == RedisCacheBackend.name:
+        return RedisCacheBackend(config['CACHE_REDIS_URL'], ttl, config.get('CACHE_KEY_PREFIX', ''))
+    
+    raise ValueError(f"Unknown cache backend '{backend_name}'")
\ No newline at end of file
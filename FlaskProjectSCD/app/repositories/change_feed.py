@@ -0,0 +1,171 @@
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from sqlalchemy import func, insert, select, text, update
+from sqlalchemy.exc import IntegrityError
+from .. import db
+from ..models.change_sequence import ChangeSequence
+from ..models.supplier_change import SupplierChange
+
+UPSERT = 'upsert'
+DELETE = 'delete'
+
+# Moves each entity's entry to its new sequence number, creating missing entries
+RECORD_SQL = {
+    'mysql': (
+        'INSERT INTO {table} ({key}, seq, operation, changed_at) '
+        'VALUES (:entity_id, :seq, :operation, :changed_at) '
+        'ON DUPLICATE KEY UPDATE seq = VALUES(seq), operation = VALUES(operation), '
+        'changed_at = VALUES(changed_at)'
+    ),
+    # SQLite 3.24+ and PostgreSQL
+    'default': (
+        'INSERT INTO {table} ({key}, seq, operation, changed_at) '
+        'VALUES (:entity_id, :seq, :operation, :changed_at) '
+        'ON CONFLICT ({key}) DO UPDATE SET seq = excluded.seq, operation = excluded.operation, '
+        'changed_at = excluded.changed_at'
+    ),
+}
+
+
+class ChangeFeed:
+    """
+    Compacted change log of an entity table for delta sync
+    Holds one entry per entity, carrying the sequence number of its latest
+    write, so the log grows with the table rather than with the write rate.
+    A deleted entity keeps its entry as a tombstone. Numbers come from a
+    counter row that each write bumps just before it commits; the row lock
+    makes them follow commit order, so no entry can appear behind a token a
+    reader already holds
+    """
+    
+    # Mapped class of the entries: <entity key>, seq, operation, changed_at
+    model = None
+    
+    # Entity key column of model, and the ChangeSequence row counting for it
+    key = None
+    sequence_name = None
+    
+    def __init__(self, dialect: str, update_returning: bool):
+        sql = RECORD_SQL.get(dialect, RECORD_SQL['default'])
+        self.upsert = text(sql.format(table=self.model.__tablename__, key=self.key))
+        self.update_returning = update_returning
+        # Set once this process has made sure the counter row exists
+        self.sequence_ready = False
+    
+    def allocate_statements(self, count: int) -> List[tuple]:
+        """
+        Statements reserving count numbers, as (statement, params) pairs
+        The last one returns the highest reserved number; the counter must
+        exist (see prepare_sequence). Shared by the sync and async repositories
+        """
+        bump = update(ChangeSequence).where(ChangeSequence.name == self.sequence_name).values(
+            value=ChangeSequence.value + count
+        )
+        if self.update_returning:
+            return [(bump.returning(ChangeSequence.value), {})]
+        
+        # The UPDATE holds the row lock, so the read sees this writer's value
+        read = select(ChangeSequence.value).where(ChangeSequence.name == self.sequence_name)
+        return [(bump, {}), (read, {})]
+    
+    def create_sequence_statement(self, count: int) -> tuple:
+        """Create the counter with count numbers already reserved"""
+        return insert(ChangeSequence).values(name=self.sequence_name, value=count), {}
+    
+    def record_statement(self, last_seq: int, entries: Dict[int, str], changed_at) -> tuple:
+        """
+        One executemany upsert moving each entity's entry to its new number
+        entries maps entity id to UPSERT or DELETE and holds the
+        len(entries) numbers ending at last_seq, in order
+        """
+        first_seq = last_seq - len(entries) + 1
+        params = [
+            {'entity_id': entity_id, 'seq': first_seq + offset, 'operation': operation,
+             'changed_at': changed_at}
+            for offset, (entity_id, operation) in enumerate(entries.items())
+        ]
+        return self.upsert, params
+    
+    @staticmethod
+    def compact(entries: Iterable[Tuple[int, str]]) -> Dict[int, str]:
+        """Entity id to operation, keeping the last write of an entity written twice"""
+        compacted = {}
+        for entity_id, operation in entries:
+            compacted.pop(entity_id, None)
+            compacted[entity_id] = operation
+        return compacted
+    
+    def record(self, entries: Iterable[Tuple[int, str]], changed_at) -> None:
+        """Record (entity id, operation) pairs in the session's current write transaction"""
+        entries = self.compact(entries)
+        if not entries:
+            return
+        
+        if not self.sequence_ready:
+            self.prepare_sequence(db.session.connection())
+        result = None
+        for statement in self.allocate_statements(len(entries)):
+            result = db.session.execute(*statement)
+        db.session.execute(*self.record_statement(self.allocated(result.scalar()), entries, changed_at))
+    
+    def prepare_sequence(self, connection) -> None:
+        """
+        Make sure the counter exists before this process first bumps it
+        connection is the write transaction's. Elsewhere the counter is
+        created in a transaction of its own, so a concurrent first writer
+        waits for it and then finds the row instead of inserting it as well.
+        SQLite lets one writer in at a time, and the write transaction may
+        hold that lock already, so it is created there
+        """
+        if connection.dialect.name == 'sqlite':
+            self.ensure_sequence(connection)
+        else:
+            with connection.engine.begin() as own:
+                self.ensure_sequence(own)
+    
+    def allocated(self, last_seq: Optional[int]) -> int:
+        """Highest number reserved by allocate_statements; fails if the counter is gone"""
+        if last_seq is None:
+            self.sequence_ready = False
+            raise RuntimeError(f"Change feed counter '{self.sequence_name}' is missing; run init-db")
+        return last_seq
+    
+    def ensure_sequence(self, connection=None) -> None:
+        """
+        Create the counter row if missing, numbering after any existing entries
+        Runs on connection when given, which then owns the transaction;
+        otherwise on the Flask-SQLAlchemy session, committing it
+        """
+        bind = connection if connection is not None else db.session
+        counter = select(ChangeSequence.value).where(ChangeSequence.name == self.sequence_name)
+        self.sequence_ready = True
+        if bind.execute(counter).first() is not None:
+            return
+        
+        latest = bind.execute(select(func.max(self.model.seq))).scalar() or 0
+        try:
+            with bind.begin_nested():
+                bind.execute(*self.create_sequence_statement(latest))
+        except IntegrityError:
+            # Another process created it meanwhile
+            pass
+        if connection is None:
+            db.session.commit()
+    
+    def read(self, since: int, limit: int) -> List[Any]:
+        """Entries written after since, oldest first"""
+        return (
+            self.model.query.filter(self.model.seq > since)
+            .order_by(self.model.seq).limit(limit).all()
+        )
+    
+    def latest(self) -> int:
+        """Highest sequence number in the feed, 0 when it is empty"""
+        return db.session.query(func.max(self.model.seq)).scalar() or 0
+
+
+class SupplierChangeFeed(ChangeFeed):
+    """Change feed of the suppliers table"""
+    
+    model = SupplierChange
+    key = 'supplier_id'
+    sequence_name = 'suppliers'
\ No newline at end of file
@@ -0,0 +1,231 @@
+import re
+from typing import Any, List, Optional, Tuple
+from sqlalchemy import Float, Integer, inspect, text
+from sqlalchemy.dialects.mysql import match
+from .. import db
+
+
+class SearchBackend:
+    """
+    Pluggable text search strategy used by repositories
+    Subclasses decide how a search term becomes a filter and a ranking
+    """
+    
+    name = 'base'
+    
+    def __init__(self, model, columns: List[str]):
+        self.model = model
+        self.columns = columns
+    
+    def apply(self, query, search_term: str) -> Tuple[Any, Optional[Any]]:
+        """
+        Restrict query to rows matching search_term
+        Returns: (query, rank_order_by or None)
+        """
+        raise NotImplementedError
+    
+    def ensure_index(self, connection=None) -> None:
+        """
+        Create the backing text index if it does not exist yet
+        Runs on connection when given, which then owns the transaction;
+        otherwise on the Flask-SQLAlchemy session, committing it
+        """
+    
+    def index(self, instance) -> None:
+        """Add or refresh one entity in the text index"""
+        statement = self.index_statement(instance)
+        if statement is not None:
+            db.session.execute(*statement)
+    
+    def remove(self, entity_id: int) -> None:
+        """Drop one entity from the text index"""
+        statement = self.remove_statement(entity_id)
+        if statement is not None:
+            db.session.execute(*statement)
+    
+    def index_statement(self, instance) -> Optional[tuple]:
+        """
+        Statement that refreshes one entity in the text index
+        Returns (statement, params), or None when the index maintains itself;
+        shared by the sync and async repositories
+        """
+        return None
+    
+    def remove_statement(self, entity_id: int) -> Optional[tuple]:
+        """Statement that drops one entity from the text index, or None"""
+        return None
+    
+    @staticmethod
+    def tokenize(search_term: str) -> List[str]:
+        """Split a raw search term into index-safe words"""
+        return re.findall(r'\w+', search_term or '', re.UNICODE)
+
+
+class LikeSearchBackend(SearchBackend):
+    """
+    Substring search with ILIKE '%term%'
+    Needs no index, so it always works, but scans the whole table
+    """
+    
+    name = 'like'
+    
+    def apply(self, query, search_term: str) -> Tuple[Any, Optional[Any]]:
+        """Match any configured column containing the term; % and _ match literally"""
+        return query.filter(
+            db.or_(*[
+                getattr(self.model, column).icontains(search_term, autoescape=True)
+                for column in self.columns
+            ])
+        ), None
+
+
+class MySQLFullTextSearchBackend(SearchBackend):
+    """
+    MySQL InnoDB FULLTEXT search in boolean mode with prefix matching
+    InnoDB maintains the index itself, so the write hooks are no-ops
+    """
+    
+    name = 'mysql_fulltext'
+    
+    # InnoDB leaves words shorter than innodb_ft_min_token_size and its
+    # default stopwords out of the index; override both to match the server
+    min_word_length = 3
+    stopwords = frozenset((
+        'a', 'about', 'an', 'are', 'as', 'at', 'be', 'by', 'com', 'de', 'en', 'for', 'from', 'how',
+        'i', 'in', 'is', 'it', 'la', 'of', 'on', 'or', 'that', 'the', 'this', 'to', 'was', 'what',
+        'when', 'where', 'who', 'will', 'with', 'und', 'www',
+    ))
+    
+    def __init__(self, model, columns: List[str]):
+        super().__init__(model, columns)
+        self.index_name = f'ft_{model.__tablename__}_search'
+    
+    def ensure_index(self, connection=None) -> None:
+        """Add the FULLTEXT index to tables created before it was declared"""
+        bind = connection if connection is not None else db.session.connection()
+        table = self.model.__tablename__
+        existing = {index['name'] for index in inspect(bind).get_indexes(table)}
+        if self.index_name in existing:
+            return
+        
+        bind.execute(text(
+            f'CREATE FULLTEXT INDEX {self.index_name} ON {table} ({", ".join(self.columns)})'
+        ))
+        if connection is None:
+            db.session.commit()
+    
+    def boolean_query(self, search_term: str) -> Optional[str]:
+        """
+        Boolean mode query requiring every indexed word as a prefix
+        Short words and stopwords are never in the index, so a row holding
+        only them as such would not match a required +word*; they are left
+        out. Returns None when no word is left
+        """
+        words = [
+            word for word in self.tokenize(search_term)
+            if len(word) >= self.min_word_length and word.lower() not in self.stopwords
+        ]
+        return ' '.join(f'+{word}*' for word in words) if words else None
+    
+    def apply(self, query, search_term: str) -> Tuple[Any, Optional[Any]]:
+        """Require every indexed word as a prefix and rank by relevance"""
+        against = self.boolean_query(search_term)
+        if against is None:
+            return LikeSearchBackend(self.model, self.columns).apply(query, search_term)
+        
+        relevance = match(
+            *[getattr(self.model, column) for column in self.columns],
+            against=against
+        ).in_boolean_mode()
+        
+        return query.filter(relevance), relevance.desc()
+
+
+class SQLiteFTS5SearchBackend(SearchBackend):
+    """
+    SQLite FTS5 search for local and test runs
+    Keeps a standalone FTS5 table keyed by the entity's primary key and
+    updates it from the repository write hooks
+    """
+    
+    name = 'sqlite_fts5'
+    
+    def __init__(self, model, columns: List[str]):
+        super().__init__(model, columns)
+        self.table = f'{model.__tablename__}_fts'
+        self.primary_key = model.__mapper__.primary_key[0].key
+    
+    def ensure_index(self, connection=None) -> None:
+        """Create the FTS5 table and backfill it from the base table"""
+        bind = connection if connection is not None else db.session.connection()
+        if inspect(bind).has_table(self.table):
+            return
+        
+        column_list = ', '.join(self.columns)
+        bind.execute(text(
+            f'CREATE VIRTUAL TABLE IF NOT EXISTS {self.table} USING fts5({column_list})'
+        ))
+        bind.execute(text(
+            f'INSERT INTO {self.table} (rowid, {column_list}) '
+            f'SELECT {self.primary_key}, {column_list} FROM {self.model.__tablename__}'
+        ))
+        if connection is None:
+            db.session.commit()
+    
+    def apply(self, query, search_term: str) -> Tuple[Any, Optional[Any]]:
+        """Require every word as a prefix and rank by bm25"""
+        words = self.tokenize(search_term)
+        if not words:
+            return LikeSearchBackend(self.model, self.columns).apply(query, search_term)
+        
+        hits = text(
+            f'SELECT rowid AS entity_id, rank FROM {self.table} WHERE {self.table} MATCH :terms'
+        ).bindparams(terms=' '.join(f'"{word}"*' for word in words))
+        hits = hits.columns(entity_id=Integer, rank=Float).subquery()
+        
+        pk_column = getattr(self.model, self.primary_key)
+        # FTS5 rank is bm25(), where lower means more relevant
+        return query.join(hits, pk_column == hits.c.entity_id), hits.c.rank.asc()
+    
+    def index_statement(self, instance) -> Optional[tuple]:
+        """Insert or replace the entity's row in the FTS5 table"""
+        column_list = ', '.join(self.columns)
+        placeholders = ', '.join(f':{column}' for column in self.columns)
+        params = {column: getattr(instance, column) for column in self.columns}
+        params['entity_id'] = getattr(instance, self.primary_key)
+        
+        return text(
+            f'INSERT OR REPLACE INTO {self.table} (rowid, {column_list}) '
+            f'VALUES (:entity_id, {placeholders})'
+        ), params
+    
+    def remove_statement(self, entity_id: int) -> Optional[tuple]:
+        """Delete the entity's row from the FTS5 table"""
+        return text(f'DELETE FROM {self.table} WHERE rowid = :entity_id'), {'entity_id': entity_id}
+
+
+search_backends = {
+    LikeSearchBackend.name: LikeSearchBackend,
+    MySQLFullTextSearchBackend.name: MySQLFullTextSearchBackend,
+    SQLiteFTS5SearchBackend.name: SQLiteFTS5SearchBackend,
+}
+
+
+def create_search_backend(backend_name: str, model, columns: List[str]) -> SearchBackend:
+    """
+    Build the configured search backend
+    'auto' picks FULLTEXT on MySQL, FTS5 on SQLite and ILIKE elsewhere
+    """
+    if backend_name == 'auto':
+        dialect = db.engine.dialect.name
+        if dialect == 'mysql':
+            backend_name = MySQLFullTextSearchBackend.name
+        elif dialect == 'sqlite':
+            backend_name = SQLiteFTS5SearchBackend.name
+        else:
+            backend_name = LikeSearchBackend.name
+    
+    if backend_name not in search_backends:
+        raise ValueError(f"Unknown search backend '{backend_name}'")
+    
+    return search_backends[backend_name](model, columns)
\ No newline at end of file
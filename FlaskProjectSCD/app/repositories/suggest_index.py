@@ -0,0 +1,227 @@
+import bisect
+import sys
+import threading
+import time
+import unicodedata
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from ..db_routing import reads_from
+from .change_feed import UPSERT
+
+# Approximate bytes one key costs beyond its string: the (key, id) tuple,
+# the id and the list slot pointing at the tuple
+KEY_OVERHEAD = 56 + 28 + 8
+
+# After a local write, how long the sync thread waits for more before it
+# catches up, so a burst of writes costs one feed read instead of one each
+COALESCE_SECONDS = 0.05
+
+
+def normalize(value: Optional[str]) -> str:
+    """Case-folded, accent-free words separated by single spaces"""
+    if not value:
+        return ''
+    decomposed = unicodedata.normalize('NFKD', value)
+    stripped = ''.join(char for char in decomposed if not unicodedata.combining(char))
+    return ' '.join(''.join(char if char.isalnum() else ' ' for char in stripped.casefold()).split())
+
+
+def prefix_keys(values: Iterable[Optional[str]]) -> List[str]:
+    """
+    Keys a text is found under: the normalized text from each word on, so
+    'acme sup' matches 'The Acme Supply Co' as well as 'sup' does
+    """
+    keys = set()
+    for value in values:
+        words = normalize(value).split(' ')
+        for start in range(len(words)):
+            if words[start]:
+                keys.add(' '.join(words[start:]))
+    return sorted(keys)
+
+
+class PrefixIndex:
+    """
+    Sorted array of (key, entity id) pairs, searched with bisect
+    Each entity keeps a tuple of the values returned for it, far smaller
+    than a dict per entity. Entries that would take it past max_bytes are
+    left out and complete turns False; thread-safe
+    """
+    
+    def __init__(self, fields: Tuple[str, ...], max_bytes: int):
+        self.fields = fields
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.complete = True
+        self._keys: List[Tuple[str, int]] = []
+        self._entries: Dict[int, Tuple[List[str], tuple, int]] = {}
+        self._lock = threading.Lock()
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+    
+    @staticmethod
+    def cost(keys: List[str], values: tuple) -> int:
+        """Approximate bytes an entry adds to the index"""
+        return (
+            sum(sys.getsizeof(key) + KEY_OVERHEAD for key in keys)
+            + sys.getsizeof(values) + sum(sys.getsizeof(value) for value in values)
+        )
+    
+    def load(self, entries: Iterable[Tuple[int, List[str], tuple]]) -> None:
+        """Replace the whole index with (entity id, keys, values) entries, sorting once"""
+        keys, loaded, size, complete = [], {}, 0, True
+        for entity_id, entity_keys, values in entries:
+            cost = self.cost(entity_keys, values)
+            if size + cost > self.max_bytes:
+                complete = False
+                continue
+            keys.extend((key, entity_id) for key in entity_keys)
+            loaded[entity_id] = (entity_keys, values, cost)
+            size += cost
+        keys.sort()
+        
+        with self._lock:
+            self._keys, self._entries, self.size, self.complete = keys, loaded, size, complete
+    
+    def upsert(self, entity_id: int, keys: List[str], values: tuple) -> bool:
+        """Add or replace one entity; False when it does not fit the memory budget"""
+        cost = self.cost(keys, values)
+        with self._lock:
+            self._remove(entity_id)
+            if self.size + cost > self.max_bytes:
+                self.complete = False
+                return False
+            
+            for key in keys:
+                bisect.insort(self._keys, (key, entity_id))
+            self._entries[entity_id] = (keys, values, cost)
+            self.size += cost
+            return True
+    
+    def remove(self, entity_id: int) -> None:
+        with self._lock:
+            self._remove(entity_id)
+    
+    def search(self, prefix: str, limit: int) -> List[Dict[str, Any]]:
+        """Up to limit entities with a key starting with prefix, by key, as dicts of fields"""
+        found = []
+        with self._lock:
+            position = bisect.bisect_left(self._keys, (prefix,))
+            while position < len(self._keys) and len(found) < limit:
+                key, entity_id = self._keys[position]
+                if not key.startswith(prefix):
+                    break
+                if entity_id not in found:
+                    found.append(entity_id)
+                position += 1
+            return [dict(zip(self.fields, self._entries[entity_id][1])) for entity_id in found]
+    
+    def _remove(self, entity_id: int) -> None:
+        entry = self._entries.pop(entity_id, None)
+        if entry is None:
+            return
+        
+        keys, _, cost = entry
+        for key in keys:
+            position = bisect.bisect_left(self._keys, (key, entity_id))
+            del self._keys[position]
+        self.size -= cost
+
+
+class SuggestIndex:
+    """
+    Per-process typeahead index over a repository's suggest_fields
+    Built once from the table, then caught up from the change feed by a
+    background thread every refresh_seconds, or as soon as a write in this
+    process calls notify(); lookups only read memory
+    """
+    
+    def __init__(self, key: str, fields: Tuple[str, ...], max_bytes: int, refresh_seconds: float):
+        self.key = key
+        self.fields = fields
+        self.refresh_seconds = refresh_seconds
+        self.index = PrefixIndex((key, *fields), max_bytes)
+        self.token = None
+        self.ready = threading.Event()
+        self._wake = threading.Event()
+        self._stopping = threading.Event()
+        self._thread = None
+        self._start_lock = threading.Lock()
+    
+    def entry(self, entity_id: int, row: Dict[str, Any]) -> Tuple[int, List[str], tuple]:
+        values = tuple(row[field] for field in self.fields)
+        return entity_id, prefix_keys(values), (entity_id, *values)
+    
+    def build(self, repository) -> None:
+        """Load every row; run in an app context"""
+        # The token is taken first, so writes committed during the scan are replayed
+        with reads_from('primary'):
+            token = repository.get_change_token()
+            rows = repository.iter_all(fields=[self.key, *self.fields])
+            self.index.load(self.entry(row[self.key], row) for row in rows)
+        self.token = token
+        self.ready.set()
+    
+    def catch_up(self, repository, page_size: int = 500) -> int:
+        """Apply the change feed since the last sync; run in an app context"""
+        applied, has_more = 0, True
+        while has_more:
+            page = repository.get_changes(self.token, page_size)
+            for change, entity in page['items']:
+                entity_id = getattr(change, repository.change_feed.key)
+                if change.operation == UPSERT and entity is not None:
+                    row = {field: getattr(entity, field) for field in self.fields}
+                    self.index.upsert(*self.entry(entity_id, row))
+                else:
+                    self.index.remove(entity_id)
+            applied += len(page['items'])
+            self.token, has_more = page['next_token'], page['has_more']
+        return applied
+    
+    def notify(self) -> None:
+        """A write committed in this process; sync without waiting for the next interval"""
+        self._wake.set()
+    
+    def search(self, query: str, limit: int) -> List[Dict[str, Any]]:
+        prefix = normalize(query)
+        return self.index.search(prefix, limit) if prefix else []
+    
+    def start(self, app, repository_class) -> None:
+        """Start the sync thread unless it runs already; threads do not survive fork"""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        
+        with self._start_lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._thread = threading.Thread(
+                target=self._run, args=(app, repository_class), name='suggest-sync', daemon=True
+            )
+            self._thread.start()
+    
+    def stop(self) -> None:
+        """Stop the sync thread after its current pass, e.g. before the app's engines are disposed"""
+        thread = self._thread
+        if thread is None:
+            return
+        
+        self._stopping.set()
+        self._wake.set()
+        thread.join()
+        self._stopping.clear()
+    
+    def _run(self, app, repository_class) -> None:
+        while not self._stopping.is_set():
+            with app.app_context():
+                repository = repository_class()
+                try:
+                    if self.ready.is_set():
+                        self.catch_up(repository)
+                    else:
+                        self.build(repository)
+                except Exception:
+                    app.logger.exception("Suggest index sync failed")
+            
+            if self._wake.wait(self.refresh_seconds):
+                time.sleep(COALESCE_SECONDS)
+            self._wake.clear()
\ No newline at end of file
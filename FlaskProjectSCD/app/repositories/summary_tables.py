@@ -0,0 +1,169 @@
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from sqlalchemy import delete, insert, select, text
+from .. import db
+from ..models.supplier_stat import SupplierStat
+
+# (old row, new row) of one written entity; old is None for an insert and
+# new is None for a delete. Rows hold only the summary's source columns
+Change = Tuple[Optional[Dict[str, Any]], Optional[Dict[str, Any]]]
+
+# Adds each parameter set's delta to its cell, creating missing cells
+UPSERT_SQL = {
+    'mysql': (
+        'INSERT INTO {table} (dimension, bucket, row_count) VALUES (:dimension, :bucket, :delta) '
+        'ON DUPLICATE KEY UPDATE row_count = row_count + VALUES(row_count)'
+    ),
+    # SQLite 3.24+ and PostgreSQL
+    'default': (
+        'INSERT INTO {table} (dimension, bucket, row_count) VALUES (:dimension, :bucket, :delta) '
+        'ON CONFLICT (dimension, bucket) DO UPDATE SET row_count = {table}.row_count + excluded.row_count'
+    ),
+}
+
+
+class SummaryTable:
+    """
+    Counts of an entity table pre-aggregated into (dimension, bucket) cells
+    Every entity row counts once in each cell that cells() returns for it;
+    a write adds one to the cells of the new row and takes one from those of
+    the old row, so reads never scan the entity table
+    """
+    
+    # Mapped class of the cell table: dimension, bucket, row_count
+    model = None
+    
+    # Entity columns that decide a row's cells
+    columns = ()
+    
+    def __init__(self, dialect: str):
+        sql = UPSERT_SQL.get(dialect, UPSERT_SQL['default'])
+        self.upsert = text(sql.format(table=self.model.__tablename__))
+    
+    def cells(self, row: Dict[str, Any]) -> List[Tuple[str, str]]:
+        """(dimension, bucket) cells one entity row counts in"""
+        raise NotImplementedError
+    
+    def row(self, instance) -> Dict[str, Any]:
+        """Source columns of an entity, as passed to cells()"""
+        return {column: getattr(instance, column) for column in self.columns}
+    
+    def deltas(self, changes: Iterable[Change]) -> Counter:
+        """Net change per cell; cells a write leaves unchanged cancel out"""
+        deltas = Counter()
+        for old, new in changes:
+            if old is not None:
+                deltas.subtract(self.cells(old))
+            if new is not None:
+                deltas.update(self.cells(new))
+        return deltas
+    
+    def delta_statement(self, changes: Iterable[Change]) -> Optional[tuple]:
+        """
+        One executemany upsert applying the net deltas, as (statement, params)
+        Returns None when the writes move no count; shared by the sync and
+        async repositories
+        """
+        params = [
+            {'dimension': dimension, 'bucket': bucket, 'delta': delta}
+            for (dimension, bucket), delta in sorted(self.deltas(changes).items()) if delta
+        ]
+        # Sorted, so concurrent writers lock the cells in the same order
+        return (self.upsert, params) if params else None
+    
+    def apply(self, changes: Iterable[Change]) -> None:
+        """Apply the deltas in the session's current write transaction"""
+        statement = self.delta_statement(changes)
+        if statement is not None:
+            db.session.execute(*statement)
+    
+    def read(self, dimension: str, start: Optional[str] = None, end: Optional[str] = None,
+             limit: Optional[int] = None, largest_first: bool = False) -> List[Any]:
+        """
+        Non-empty cells of one dimension, by bucket or largest count first
+        start and end bound the buckets inclusively, e.g. '2024-01' for months
+        """
+        query = self.model.query.filter(self.model.dimension == dimension, self.model.row_count > 0)
+        if start is not None:
+            query = query.filter(self.model.bucket >= start)
+        if end is not None:
+            query = query.filter(self.model.bucket <= end)
+        
+        if largest_first:
+            query = query.order_by(self.model.row_count.desc(), self.model.bucket)
+        else:
+            query = query.order_by(self.model.bucket)
+        
+        if limit is not None:
+            query = query.limit(limit)
+        return query.all()
+    
+    def rebuild(self, entity_model, chunk_size: int = 10000) -> Dict[str, int]:
+        """
+        Recompute every cell from the entity table; run in an app context
+        Rows are read in primary-key chunks, each in its own short transaction,
+        and only the cell counts are held in memory. The cells are replaced
+        in one final transaction; writes committed during the scan may be
+        missed, so run it while writes are paused
+        Returns: {'rows', 'cells'}
+        """
+        primary_key = entity_model.__mapper__.primary_key[0]
+        columns = [getattr(entity_model, column) for column in self.columns]
+        counts = Counter()
+        scanned, last_id = 0, None
+        
+        while True:
+            query = select(primary_key, *columns).order_by(primary_key).limit(chunk_size)
+            if last_id is not None:
+                query = query.where(primary_key > last_id)
+            rows = db.session.execute(query).all()
+            db.session.commit()
+            if not rows:
+                break
+            
+            for row in rows:
+                counts.update(self.cells(dict(zip(self.columns, row[1:]))))
+            scanned += len(rows)
+            last_id = rows[-1][0]
+        
+        db.session.execute(delete(self.model))
+        if counts:
+            db.session.execute(insert(self.model), [
+                {'dimension': dimension, 'bucket': bucket, 'row_count': count}
+                for (dimension, bucket), count in counts.items()
+            ])
+        db.session.commit()
+        return {'rows': scanned, 'cells': len(counts)}
+
+
+class SupplierSummary(SummaryTable):
+    """
+    Supplier counts in total, by creation day, ISO week and month, by email
+    domain and by which contact details are missing
+    """
+    
+    model = SupplierStat
+    columns = ('created_at', 'email', 'contact_person', 'phone')
+    
+    # Contact details whose absence the completeness dimension counts
+    required_fields = ('contact_person', 'phone', 'email')
+    
+    def cells(self, row: Dict[str, Any]) -> List[Tuple[str, str]]:
+        created_at = row['created_at']
+        year, week, _ = created_at.isocalendar()
+        cells = [
+            ('total', 'all'),
+            ('day', created_at.strftime('%Y-%m-%d')),
+            ('week', f'{year:04d}-W{week:02d}'),
+            ('month', created_at.strftime('%Y-%m')),
+        ]
+        
+        email = (row['email'] or '').strip()
+        if '@' in email:
+            cells.append(('domain', email.rsplit('@', 1)[1].lower()[:100]))
+        
+        missing = [field for field in self.required_fields if not (row[field] or '').strip()]
+        cells += [('completeness', f'missing_{field}') for field in missing]
+        if not missing:
+            cells.append(('completeness', 'complete'))
+        return cells
\ No newline at end of file
@@ -1,7 +1,9 @@
-from typing import Optional
+from typing import Optional, Dict, Any, Iterator, List
 from ..models.supplier import Supplier
+from ..db_routing import replica_read
 from .base_repository import BaseRepository
-from .. import db
+from .change_feed import SupplierChangeFeed
+from .summary_tables import SupplierSummary
 
 
 class SupplierRepository(BaseRepository[Supplier]):
@@ -9,24 +11,84 @@ class SupplierRepository(BaseRepository[Supplier]):
     Supplier repository with specific supplier operations
     """
     
+    sortable_fields = ('supplier_name', 'created_at')
+    search_fields = ('supplier_name', 'contact_person', 'email')
+    suggest_fields = ('supplier_name', 'contact_person')
+    timestamp_field = 'updated_at'
+    version_field = 'version'
+    summary_table = SupplierSummary
+    change_feed_class = SupplierChangeFeed
+    
     def __init__(self):
         super().__init__(Supplier)
     
+    @replica_read
     def get_by_name(self, supplier_name: str) -> Optional[Supplier]:
         """Get supplier by name"""
         return self.model.query.filter_by(supplier_name=supplier_name).first()
     
-    def search_suppliers(self, search_term: str, page: int = 1, per_page: int = 20) -> tuple:
-        """Search suppliers by name, contact person, or email"""
-        query = self.model.query.filter(
-            db.or_(
-                Supplier.supplier_name.ilike(f'%{search_term}%'),
-                Supplier.contact_person.ilike(f'%{search_term}%'),
-                Supplier.email.ilike(f'%{search_term}%')
-            )
-        )
+    @replica_read
+    def search_suppliers(self, search_term: str, page: int = 1, per_page: int = 20,
+                         fields: Optional[List[str]] = None) -> tuple:
+        """
+        Search suppliers by name, contact person, or email
+        Results are ordered by relevance when the backend can rank them
+        With fields, items are plain dicts of those columns
+        """
+        def load():
+            query, rank = self.search_backend.apply(self._base_query(fields), search_term)
+            items, total = self._paginate(query, page, per_page, order_by=rank)
+            return self._project(items, fields), total
         
-        total = query.count()
-        items = query.paginate(page=page, per_page=per_page, error_out=False).items
+        return self._cached_list('search', {
+            'term': search_term, 'page': page, 'per_page': per_page, 'fields': fields
+        }, load, projected=fields is not None)
+    
+    @replica_read
+    def search_suppliers_after(self, search_term: str, after: Optional[str] = None,
+                               sort: Optional[str] = None, per_page: int = 20,
+                               total: str = 'none',
+                               fields: Optional[List[str]] = None) -> Dict[str, Any]:
+        """
+        Search suppliers using keyset (cursor) pagination
+        An estimated total is not available for searches, so only 'exact' counts
+        """
+        def load():
+            query, _ = self.search_backend.apply(self._base_query(fields, sort), search_term)
+            page = self._keyset_page(query, after, sort, per_page)
+            page['items'] = self._project(page['items'], fields)
+            
+            if total == 'exact':
+                page['total'] = query.order_by(None).count()
+            
+            return page
         
-        return items, total
\ No newline at end of file
+        return self._cached_list('search_after', {
+            'term': search_term, 'after': after, 'sort': sort,
+            'per_page': per_page, 'total': total, 'fields': fields
+        }, load, projected=fields is not None)
+    
+    @replica_read
+    def get_stats(self, dimension: str, start: Optional[str] = None, end: Optional[str] = None,
+                  limit: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Supplier counts of one summary dimension plus the overall total, read
+        from the summary cells alone, so the cost does not grow with the table
+        Email domains come largest first; every other dimension by bucket
+        """
+        total = self.summary.read('total')
+        buckets = self.summary.read(dimension, start, end, limit, largest_first=dimension == 'domain')
+        return {
+            'total': total[0].row_count if total else 0,
+            'buckets': [stat.to_dict() for stat in buckets]
+        }
+    
+    def rebuild_stats(self, chunk_size: int = 10000) -> Dict[str, int]:
+        """Recompute the summary cells from the suppliers table"""
+        return self.summary.rebuild(self.model, chunk_size)
+    
+    def iter_search(self, search_term: str, batch_size: Optional[int] = None,
+                    fields: Optional[List[str]] = None) -> Iterator[Any]:
+        """Stream every supplier matching the search term in primary-key order"""
+        query, _ = self.search_backend.apply(self._base_query(fields), search_term)
+        return self._iter_query(query, batch_size, fields)
\ No newline at end of file
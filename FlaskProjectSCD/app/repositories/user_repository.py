@@ -0,0 +1,16 @@
+from typing import Optional
+from ..models.user import User
+from .base_repository import BaseRepository
+
+
+class UserRepository(BaseRepository[User]):
+    """
+    User repository with authentication lookups
+    """
+    
+    def __init__(self):
+        super().__init__(User)
+    
+    def get_by_firebase_uid(self, firebase_uid: str) -> Optional[User]:
+        """Get user by Firebase UID"""
+        return self.model.query.filter_by(firebase_uid=firebase_uid).first()
\ No newline at end of file
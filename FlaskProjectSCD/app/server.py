@@ -0,0 +1,114 @@
+import os
+import resource
+import shutil
+import sys
+import tempfile
+from . import db
+
+
+def serve(app, host: str = '0.0.0.0', port: int = 5000) -> None:
+    """
+    Run app under a pre-fork gunicorn pool
+    app is already built, so workers share its memory copy-on-write
+    SIGHUP replaces every worker gracefully; see the readme for code upgrades
+    """
+    try:
+        from gunicorn.app.base import BaseApplication
+    except ImportError:
+        raise RuntimeError("'run.py serve' requires the 'gunicorn' package")
+    
+    config = app.config
+    threads = config['SERVER_THREADS']
+    workers = config['SERVER_WORKERS'] or cpu_count()
+    
+    if config['RATE_LIMIT_ENABLED'] and config['RATE_LIMIT_BACKEND'] == 'memory' and workers > 1:
+        app.logger.warning(
+            "RATE_LIMIT_BACKEND=memory keeps buckets per worker, so each client gets up to %d times "
+            "RATE_LIMITS; set RATE_LIMIT_BACKEND=redis to enforce them across workers", workers
+        )
+    
+    # Built once in the master, so workers fork with it and only catch up
+    if config['SUGGEST_ENABLED']:
+        from .commands import build_suggest_indexes
+        with app.app_context():
+            build_suggest_indexes()
+    max_rss = config['SERVER_MAX_RSS_MB'] * 1024 * 1024
+    
+    # Workers share metrics through files; counters restart with the server
+    registry = app.extensions.get('metrics')
+    temporary_metrics_dir = None
+    if registry is not None:
+        from . import metrics
+        if not config['METRICS_DIR']:
+            temporary_metrics_dir = config['METRICS_DIR'] = tempfile.mkdtemp(prefix='scd-metrics-')
+        metrics.clear(config['METRICS_DIR'])
+    
+    def post_fork(server, worker):
+        # Connections inherited from the master must not be shared across
+        # processes; close=False leaves the master's sockets alone
+        with app.app_context():
+            for engine in db.engines.values():
+                engine.dispose(close=False)
+        
+        # The async engine's loop thread does not survive fork; rebuild lazily
+        app.extensions.pop('async_database', None)
+    
+    def post_request(worker, req, environ, resp):
+        # gunicorn recycles on request count itself; memory is checked here.
+        # The worker leaves its loop and finishes in-flight requests first
+        if worker.alive and max_rss and current_rss() > max_rss:
+            worker.log.info("Recycling worker %s after passing %s MB RSS", worker.pid, config['SERVER_MAX_RSS_MB'])
+            worker.alive = False
+    
+    def worker_exit(server, worker):
+        # Final samples of a recycled worker; the next scrape archives them
+        if registry is not None:
+            metrics.flush(registry, config['METRICS_DIR'])
+    
+    def on_exit(server):
+        if temporary_metrics_dir is not None:
+            shutil.rmtree(temporary_metrics_dir, ignore_errors=True)
+    
+    class Application(BaseApplication):
+        def load_config(self):
+            options = {
+                'bind': f'{host}:{port}',
+                'workers': workers,
+                'threads': threads,
+                'worker_class': 'gthread' if threads > 1 else 'sync',
+                'timeout': config['SERVER_TIMEOUT'],
+                # Jitter keeps workers booted together from recycling together
+                'max_requests': config['SERVER_MAX_REQUESTS'],
+                'max_requests_jitter': config['SERVER_MAX_REQUESTS_JITTER'],
+                'graceful_timeout': config['SERVER_GRACEFUL_TIMEOUT'],
+                'preload_app': True,
+                'post_fork': post_fork,
+                'post_request': post_request,
+                'worker_exit': worker_exit,
+                'on_exit': on_exit,
+            }
+            for key, value in options.items():
+                self.cfg.set(key, value)
+        
+        def load(self):
+            return app
+    
+    Application().run()
+
+
+def cpu_count() -> int:
+    """CPUs this process may run on, which can be fewer than the machine has"""
+    if hasattr(os, 'sched_getaffinity'):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+def current_rss() -> int:
+    """Resident set size of this process in bytes"""
+    try:
+        with open('/proc/self/statm') as statm:
+            return int(statm.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError):
+        # No /proc: fall back to the peak RSS, in KB on Linux and bytes on macOS
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == 'darwin' else peak * 1024
\ No newline at end of file
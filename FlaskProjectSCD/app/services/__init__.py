@@ -1,5 +1,9 @@
 from .supplier_service import SupplierService
+from .auth_service import AuthService
+from .async_supplier_service import AsyncSupplierService
 
 __all__ = [
-    'SupplierService'
+    'SupplierService',
+    'AuthService',
+    'AsyncSupplierService'
 ]
\ No newline at end of file
@@ -0,0 +1,79 @@
+from typing import Optional, Dict, Any, List
+from ..repositories.async_supplier_repository import AsyncSupplierRepository
+from ..models.supplier import Supplier
+
+
+class AsyncSupplierService:
+    """
+    Async supplier service for the ASGI routes
+    Mirrors SupplierService for the I/O-bound read and write paths
+    """
+    
+    def __init__(self):
+        self.supplier_repository = AsyncSupplierRepository()
+    
+    async def create_supplier(self, supplier_data: Dict[str, Any]) -> Supplier:
+        """Create a new supplier"""
+        return await self.supplier_repository.create(**supplier_data)
+    
+    async def get_supplier(self, supplier_id: int) -> Optional[Supplier]:
+        """Get supplier by ID"""
+        return await self.supplier_repository.get_by_id(supplier_id)
+    
+    async def get_supplier_fields(self, supplier_id: int, fields: List[str]) -> Optional[Dict[str, Any]]:
+        """Get selected fields of a supplier as a plain dict"""
+        return await self.supplier_repository.get_row_by_id(supplier_id, fields)
+    
+    async def get_suppliers_fingerprint(self) -> tuple:
+        """Row count and latest update time across all suppliers"""
+        return await self.supplier_repository.get_fingerprint()
+    
+    async def get_supplier_validators(self, supplier_id: int) -> Optional[tuple]:
+        """Last update time and version of one supplier, or None if it does not exist"""
+        return await self.supplier_repository.get_entity_validators(supplier_id)
+    
+    async def get_all_suppliers(self, page: int = 1, per_page: int = 20,
+                                fields: Optional[List[str]] = None) -> tuple:
+        """Get all suppliers with pagination"""
+        return await self.supplier_repository.get_all(page=page, per_page=per_page, fields=fields)
+    
+    async def get_suppliers_after(self, after: Optional[str] = None, sort: Optional[str] = None,
+                                  per_page: int = 20, total: str = 'none',
+                                  fields: Optional[List[str]] = None) -> Dict[str, Any]:
+        """Get suppliers with keyset (cursor) pagination"""
+        return await self.supplier_repository.get_page_after(
+            after=after, sort=sort, per_page=per_page, total=total, fields=fields
+        )
+    
+    async def update_supplier(self, supplier_id: int, update_data: Dict[str, Any],
+                              expected_version: Optional[int] = None) -> Optional[Supplier]:
+        """Update supplier, optionally only while it is still at expected_version"""
+        supplier = await self.supplier_repository.update(supplier_id, expected_version, **update_data)
+        if not supplier:
+            raise ValueError("Supplier not found")
+        return supplier
+    
+    async def patch_supplier(self, supplier_id: int, changes: Dict[str, Any],
+                             expected_version: Optional[int] = None) -> Optional[Supplier]:
+        """Change some fields of a supplier with a single conditional UPDATE"""
+        return await self.supplier_repository.patch(supplier_id, changes, expected_version)
+    
+    async def delete_supplier(self, supplier_id: int, expected_version: Optional[int] = None) -> bool:
+        """Delete supplier, optionally only while it is still at expected_version"""
+        if not await self.supplier_repository.delete(supplier_id, expected_version):
+            raise ValueError("Supplier not found")
+        return True
+    
+    async def search_suppliers(self, search_term: str, page: int = 1, per_page: int = 20,
+                               fields: Optional[List[str]] = None) -> tuple:
+        """Search suppliers"""
+        return await self.supplier_repository.search_suppliers(search_term, page, per_page, fields)
+    
+    async def search_suppliers_after(self, search_term: str, after: Optional[str] = None,
+                                     sort: Optional[str] = None, per_page: int = 20,
+                                     total: str = 'none',
+                                     fields: Optional[List[str]] = None) -> Dict[str, Any]:
+        """Search suppliers with keyset (cursor) pagination"""
+        return await self.supplier_repository.search_suppliers_after(
+            search_term, after=after, sort=sort, per_page=per_page, total=total, fields=fields
+        )
\ No newline at end of file
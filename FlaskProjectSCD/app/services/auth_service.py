@@ -0,0 +1,187 @@
+import base64
+import hashlib
+import json
+import time
+from typing import Optional, Dict, Any
+from flask import current_app
+from ..repositories.cache_backends import MemoryCacheBackend
+from ..repositories.user_repository import UserRepository
+from ..models.user import User
+
+
+class FirebaseTokenVerifier:
+    """
+    Verifies Firebase ID tokens with firebase-admin
+    The SDK is imported and initialized on first use, not at app startup
+    """
+    
+    def __init__(self, config_path: str):
+        self.config_path = config_path
+        self._app = None
+    
+    def verify(self, token: str) -> Optional[Dict[str, Any]]:
+        """Return the decoded claims, or None if the token is invalid"""
+        from firebase_admin import auth
+        
+        try:
+            return auth.verify_id_token(token, app=self._get_app())
+        except (ValueError, auth.InvalidIdTokenError, auth.ExpiredIdTokenError,
+                auth.RevokedIdTokenError, auth.CertificateFetchError):
+            return None
+    
+    def _get_app(self):
+        if self._app is None:
+            import firebase_admin
+            from firebase_admin import credentials
+            
+            self._app = firebase_admin.initialize_app(
+                credentials.Certificate(self.config_path), name='auth-service'
+            )
+        return self._app
+
+
+class FakeTokenVerifier:
+    """
+    Offline verifier for tests and benchmarks
+    Tokens are 'fake.<base64url JSON claims>'; latency_ms simulates the cost
+    of signature checks so the effect of the token cache can be measured
+    """
+    
+    prefix = 'fake.'
+    
+    def __init__(self, latency_ms: float = 0):
+        self.latency_ms = latency_ms
+    
+    @classmethod
+    def issue(cls, uid: str, ttl: int = 3600, **claims) -> str:
+        """Mint a token for uid that expires in ttl seconds"""
+        payload = dict(claims, uid=uid, exp=int(time.time()) + ttl)
+        encoded = base64.urlsafe_b64encode(json.dumps(payload).encode('utf-8')).decode('ascii')
+        return cls.prefix + encoded
+    
+    def verify(self, token: str) -> Optional[Dict[str, Any]]:
+        """Return the claims of an unexpired fake token, or None"""
+        if self.latency_ms:
+            time.sleep(self.latency_ms / 1000)
+        
+        if not token.startswith(self.prefix):
+            return None
+        
+        try:
+            claims = json.loads(base64.urlsafe_b64decode(token[len(self.prefix):].encode('ascii')))
+        except ValueError:
+            return None
+        
+        if not isinstance(claims, dict) or claims.get('exp', 0) <= time.time():
+            return None
+        return claims
+
+
+class AuthService:
+    """
+    Authentication service, one instance per application (Singleton Pattern)
+    Caches verified tokens for a few minutes and user lookups for a short TTL
+    """
+    
+    def __init__(self, config):
+        self.user_repository = UserRepository()
+        self.verifier = self._create_verifier(config)
+        self.token_cache_max_ttl = config.get('AUTH_TOKEN_CACHE_MAX_TTL', 300)
+        self.user_cache_ttl = config.get('AUTH_USER_CACHE_TTL', 30)
+        # token hash -> (claims, cached at); uid -> time its tokens were revoked
+        self.token_cache = MemoryCacheBackend(config.get('AUTH_TOKEN_CACHE_SIZE', 10000))
+        self.revoked_at = MemoryCacheBackend(config.get('AUTH_TOKEN_CACHE_SIZE', 10000))
+        self.user_cache = MemoryCacheBackend(config.get('AUTH_USER_CACHE_SIZE', 10000))
+    
+    @classmethod
+    def get_instance(cls) -> 'AuthService':
+        """Return the current application's auth service, creating it once"""
+        extensions = current_app.extensions
+        if 'auth_service' not in extensions:
+            extensions['auth_service'] = cls(current_app.config)
+        return extensions['auth_service']
+    
+    def verify_token(self, token: str) -> Optional[Dict[str, Any]]:
+        """
+        Verify a token, reusing the result of an earlier verification
+        Entries are keyed by a hash of the token and never outlive its exp
+        claim or AUTH_TOKEN_CACHE_MAX_TTL; callers get their own copy of the claims
+        """
+        key = self._token_key(token)
+        claims = self._cached(key)
+        if claims is not None:
+            return claims
+        
+        claims = self.verifier.verify(token)
+        if claims is None:
+            return None
+        
+        now = time.time()
+        ttl = min(claims.get('exp', 0) - now, self.token_cache_max_ttl)
+        if ttl >= 1:
+            self.token_cache.set(key, (dict(claims), now), int(ttl))
+        return claims
+    
+    def cached_claims(self, token: str) -> Optional[Dict[str, Any]]:
+        """Claims of a token verified earlier and still cached; never calls the verifier"""
+        return self._cached(self._token_key(token))
+    
+    def invalidate_token(self, token: str) -> None:
+        """Forget a verified token, e.g. on sign-out; its next use is verified again"""
+        self.token_cache.delete(self._token_key(token))
+    
+    def revoke_user_tokens(self, firebase_uid: str) -> None:
+        """Forget every token of a user verified until now, e.g. after deactivation"""
+        # Kept as long as a token cached before it could live
+        self.revoked_at.set(firebase_uid, time.time(), self.token_cache_max_ttl + 1)
+    
+    def _cached(self, key: str) -> Optional[Dict[str, Any]]:
+        entry = self.token_cache.get(key)
+        if entry is None:
+            return None
+        
+        claims, cached_at = entry
+        revoked_at = self.revoked_at.get(claims.get('uid', ''))
+        if claims.get('exp', 0) <= time.time() or (revoked_at is not None and cached_at <= revoked_at):
+            self.token_cache.delete(key)
+            return None
+        return dict(claims)
+    
+    @staticmethod
+    def _token_key(token: str) -> str:
+        return hashlib.sha256(token.encode('utf-8')).hexdigest()
+    
+    def get_user_by_firebase_uid(self, firebase_uid: str) -> Optional[User]:
+        """Get user by Firebase UID, cached for AUTH_USER_CACHE_TTL seconds"""
+        row = self.user_cache.get(firebase_uid)
+        if row is not None:
+            return self.user_repository.restore(row)
+        
+        user = self.user_repository.get_by_firebase_uid(firebase_uid)
+        if user is not None and self.user_cache_ttl:
+            self.user_cache.set(firebase_uid, self.user_repository.snapshot(user), self.user_cache_ttl)
+        return user
+    
+    def deactivate_user(self, firebase_uid: str) -> Optional[User]:
+        """Deactivate a user and drop their cached record and tokens immediately"""
+        user = self.user_repository.get_by_firebase_uid(firebase_uid)
+        if user is None:
+            return None
+        
+        user = self.user_repository.update(user.user_id, is_active=False)
+        self.invalidate_user(firebase_uid)
+        self.revoke_user_tokens(firebase_uid)
+        return user
+    
+    def invalidate_user(self, firebase_uid: str) -> None:
+        """Forget a cached user, e.g. after a role or status change"""
+        self.user_cache.delete(firebase_uid)
+    
+    @staticmethod
+    def _create_verifier(config):
+        verifier = config.get('AUTH_VERIFIER', 'firebase')
+        if verifier == 'fake':
+            return FakeTokenVerifier(config.get('AUTH_FAKE_LATENCY_MS', 0))
+        if verifier == 'firebase':
+            return FirebaseTokenVerifier(config['FIREBASE_CONFIG_PATH'])
+        raise ValueError(f"Unknown auth verifier '{verifier}'")
\ No newline at end of file
@@ -1,7 +1,12 @@
-from typing import Optional, Dict, Any
+import time
+from typing import Optional, Dict, Any, List, Iterator, Iterable, Tuple, Union
+from flask import current_app
 from ..repositories.supplier_repository import SupplierRepository
 from ..models.supplier import Supplier
 
+# Groupings GET /api/suppliers/stats serves; see SupplierSummary for the buckets
+STAT_DIMENSIONS = ('day', 'week', 'month', 'domain', 'completeness')
+
 
 class SupplierService:
     """
@@ -19,26 +24,260 @@ class SupplierService:
         """Get supplier by ID"""
         return self.supplier_repository.get_by_id(supplier_id)
     
-    def get_all_suppliers(self, page: int = 1, per_page: int = 20) -> tuple:
+    def get_supplier_fields(self, supplier_id: int, fields: List[str]) -> Optional[Dict[str, Any]]:
+        """Get selected fields of a supplier as a plain dict"""
+        return self.supplier_repository.get_row_by_id(supplier_id, fields)
+    
+    def get_suppliers_by_ids(self, supplier_ids: List[int],
+                             fields: Optional[List[str]] = None) -> Tuple[List[Any], List[int]]:
+        """
+        Resolve many supplier ids at once, in the order given
+        Returns: (suppliers, or field dicts with fields; ids that do not exist)
+        """
+        max_ids = current_app.config['MULTI_GET_MAX_IDS']
+        if len(supplier_ids) > max_ids:
+            raise ValueError(f"ids accepts at most {max_ids} ids")
+        
+        found = self.supplier_repository.get_many(supplier_ids, fields) if supplier_ids else {}
+        ordered = list(dict.fromkeys(supplier_ids))
+        return (
+            [found[supplier_id] for supplier_id in ordered if supplier_id in found],
+            [supplier_id for supplier_id in ordered if supplier_id not in found]
+        )
+    
+    def suggest_suppliers(self, query: str, limit: int = 10) -> Dict[str, Any]:
+        """
+        Suppliers whose name or contact person has a word starting with query,
+        answered from the in-memory typeahead index without a database query
+        """
+        max_results = current_app.config['SUGGEST_MAX_RESULTS']
+        if not 1 <= limit <= max_results:
+            raise ValueError(f"limit must be between 1 and {max_results}")
+        
+        return self.supplier_repository.suggest(query, limit)
+    
+    def get_suppliers_fingerprint(self) -> tuple:
+        """Row count and latest update time across all suppliers"""
+        return self.supplier_repository.get_fingerprint()
+    
+    def get_supplier_validators(self, supplier_id: int) -> Optional[tuple]:
+        """Last update time and version of one supplier, or None if it does not exist"""
+        return self.supplier_repository.get_entity_validators(supplier_id)
+    
+    def get_all_suppliers(self, page: int = 1, per_page: int = 20,
+                          fields: Optional[List[str]] = None) -> tuple:
         """Get all suppliers with pagination"""
-        return self.supplier_repository.get_all(page=page, per_page=per_page)
+        return self.supplier_repository.get_all(page=page, per_page=per_page, fields=fields)
     
-    def update_supplier(self, supplier_id: int, update_data: Dict[str, Any]) -> Optional[Supplier]:
-        """Update supplier"""
-        supplier = self.supplier_repository.get_by_id(supplier_id)
+    def get_suppliers_after(self, after: Optional[str] = None, sort: Optional[str] = None,
+                            per_page: int = 20, total: str = 'none',
+                            fields: Optional[List[str]] = None) -> Dict[str, Any]:
+        """Get suppliers with keyset (cursor) pagination"""
+        return self.supplier_repository.get_page_after(
+            after=after, sort=sort, per_page=per_page, total=total, fields=fields
+        )
+    
+    def update_supplier(self, supplier_id: int, update_data: Dict[str, Any],
+                        expected_version: Optional[int] = None) -> Optional[Supplier]:
+        """Update supplier, optionally only while it is still at expected_version"""
+        # The repository loads the row itself, so a lookup here would read it twice
+        supplier = self.supplier_repository.update(supplier_id, expected_version, **update_data)
         if not supplier:
             raise ValueError("Supplier not found")
         
-        return self.supplier_repository.update(supplier_id, **update_data)
+        return supplier
     
-    def delete_supplier(self, supplier_id: int) -> bool:
-        """Delete supplier"""
-        supplier = self.supplier_repository.get_by_id(supplier_id)
-        if not supplier:
+    def patch_supplier(self, supplier_id: int, changes: Dict[str, Any],
+                       expected_version: Optional[int] = None) -> Optional[Supplier]:
+        """Change some fields of a supplier with a single conditional UPDATE"""
+        return self.supplier_repository.patch(supplier_id, changes, expected_version)
+    
+    def delete_supplier(self, supplier_id: int, expected_version: Optional[int] = None) -> bool:
+        """Delete supplier, optionally only while it is still at expected_version"""
+        if not self.supplier_repository.delete(supplier_id, expected_version):
             raise ValueError("Supplier not found")
         
-        return self.supplier_repository.delete(supplier_id)
+        return True
     
-    def search_suppliers(self, search_term: str, page: int = 1, per_page: int = 20) -> tuple:
+    def search_suppliers(self, search_term: str, page: int = 1, per_page: int = 20,
+                         fields: Optional[List[str]] = None) -> tuple:
         """Search suppliers"""
-        return self.supplier_repository.search_suppliers(search_term, page, per_page)
\ No newline at end of file
+        return self.supplier_repository.search_suppliers(search_term, page, per_page, fields)
+    
+    def search_suppliers_after(self, search_term: str, after: Optional[str] = None,
+                               sort: Optional[str] = None, per_page: int = 20,
+                               total: str = 'none',
+                               fields: Optional[List[str]] = None) -> Dict[str, Any]:
+        """Search suppliers with keyset (cursor) pagination"""
+        return self.supplier_repository.search_suppliers_after(
+            search_term, after=after, sort=sort, per_page=per_page, total=total, fields=fields
+        )
+    
+    def bulk_create_suppliers(self, items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Create suppliers in batches, reporting a result per item"""
+        return self.supplier_repository.bulk_create(items)
+    
+    def bulk_update_suppliers(self, items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Update suppliers in batches, reporting a result per item"""
+        return self.supplier_repository.bulk_update(items)
+    
+    def bulk_delete_suppliers(self, supplier_ids: List[int]) -> List[Dict[str, Any]]:
+        """Delete suppliers in batches, reporting a result per id"""
+        return self.supplier_repository.bulk_delete(supplier_ids)
+    
+    def get_supplier_stats(self, by: str = 'month', start: Optional[str] = None,
+                           end: Optional[str] = None, limit: int = 100) -> Dict[str, Any]:
+        """
+        Supplier counts grouped by creation day, week or month, email domain or
+        completeness, served from the pre-aggregated summary table
+        """
+        if by not in STAT_DIMENSIONS:
+            raise ValueError(f"by must be one of: {', '.join(STAT_DIMENSIONS)}")
+        if not 1 <= limit <= 1000:
+            raise ValueError("limit must be between 1 and 1000")
+        
+        stats = self.supplier_repository.get_stats(by, start, end, limit)
+        return dict(stats, by=by)
+    
+    def get_supplier_changes(self, since: Optional[int] = None, limit: int = 100) -> Dict[str, Any]:
+        """
+        Suppliers written after the token since, oldest first: upserts carry
+        the current row, deletes are tombstones carrying only the id
+        Without since, returns no items and the token to start syncing from
+        """
+        if not 1 <= limit <= 1000:
+            raise ValueError("limit must be between 1 and 1000")
+        if since is None:
+            return {'items': [], 'next_token': self.supplier_repository.get_change_token(), 'has_more': False}
+        if since < 0:
+            raise ValueError("since must be a token from a previous response")
+        
+        page = self.supplier_repository.get_changes(since, limit)
+        page['items'] = [
+            dict(
+                change.to_dict(),
+                # An upserted row deleted since is reported as the delete it now is
+                operation=change.operation if supplier is not None else 'delete',
+                supplier=supplier.to_dict() if supplier is not None else None
+            )
+            for change, supplier in page['items']
+        ]
+        return page
+    
+    def poll_supplier_changes(self, since: int, limit: int, poll_seconds: float,
+                              heartbeat_seconds: float, max_seconds: float) -> Iterator[Optional[Dict[str, Any]]]:
+        """
+        Pages of changes after since as they are committed, for a long-lived
+        stream; yields None after heartbeat_seconds without changes and ends
+        after max_seconds. The session is released between polls, so no
+        connection is held while waiting
+        """
+        started = quiet_since = time.monotonic()
+        while time.monotonic() - started < max_seconds:
+            page = self.get_supplier_changes(since, limit)
+            self.supplier_repository.release_session()
+            
+            if page['items']:
+                since = page['next_token']
+                quiet_since = time.monotonic()
+                yield page
+                if page['has_more']:
+                    continue
+            elif time.monotonic() - quiet_since >= heartbeat_seconds:
+                quiet_since = time.monotonic()
+                yield None
+            
+            time.sleep(poll_seconds)
+    
+    def export_suppliers(self, search_term: Optional[str] = None,
+                         fields: Optional[List[str]] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Stream suppliers as dictionaries, optionally filtered by a search term
+        With fields, rows come straight from a column-only query
+        """
+        if search_term:
+            suppliers = self.supplier_repository.iter_search(search_term, fields=fields)
+        else:
+            suppliers = self.supplier_repository.iter_all(fields=fields)
+        
+        if fields is not None:
+            return suppliers
+        return (supplier.to_dict() for supplier in suppliers)
+    
+    def import_suppliers(self, rows: Iterable[Tuple[int, Union[Dict[str, Any], str]]],
+                         key: str) -> Dict[str, Any]:
+        """
+        Upsert suppliers from a stream of (line_number, row or parse error)
+        Rows are buffered one chunk at a time, so memory does not grow with the file
+        Bytes that are not UTF-8 end the import there; the rows before them
+        are kept and the report says where it stopped
+        Returns a report with counts, throughput and row-level errors
+        """
+        if key not in current_app.config['IMPORT_UPSERT_KEYS']:
+            raise ValueError(f"key must be one of: {', '.join(current_app.config['IMPORT_UPSERT_KEYS'])}")
+        
+        chunk_size = current_app.config['BULK_CHUNK_SIZE']
+        max_errors = current_app.config['IMPORT_MAX_ERRORS']
+        report = {
+            'processed': 0, 'created': 0, 'updated': 0, 'rejected': 0,
+            'errors': [], 'errors_truncated': False
+        }
+        started = time.perf_counter()
+        
+        def reject(line_number, message):
+            report['rejected'] += 1
+            if len(report['errors']) < max_errors:
+                report['errors'].append({'row': line_number, 'error': message})
+            else:
+                report['errors_truncated'] = True
+        
+        def flush(batch):
+            results = self.supplier_repository.bulk_upsert(
+                [row for _, row in batch], key, chunk_size
+            )
+            for (line_number, _), result in zip(batch, results):
+                if result['success']:
+                    report[result['action']] += 1
+                else:
+                    reject(line_number, result['error'])
+            
+            current_app.logger.info(
+                "Supplier import: %d rows processed (%d rejected)",
+                report['processed'], report['rejected']
+            )
+        
+        batch, last_line = [], 0
+        try:
+            for line_number, row in rows:
+                report['processed'] += 1
+                last_line = line_number
+                
+                if isinstance(row, str):
+                    reject(line_number, row)
+                    continue
+                
+                # Server-managed columns are never taken from the file
+                row.pop('supplier_id', None)
+                row.pop('created_at', None)
+                row.pop('updated_at', None)
+                row.pop('version', None)
+                batch.append((line_number, row))
+                
+                if len(batch) >= chunk_size:
+                    flush(batch)
+                    batch = []
+        except UnicodeDecodeError:
+            # Earlier chunks are committed already, so report them rather than fail
+            report['errors'].append({
+                'row': None, 'error': f"File is not valid UTF-8 after line {last_line}; the rest was not read"
+            })
+        
+        if batch:
+            flush(batch)
+        
+        elapsed = time.perf_counter() - started
+        report['accepted'] = report['created'] + report['updated']
+        report['elapsed_seconds'] = round(elapsed, 3)
+        report['rows_per_second'] = round(report['processed'] / elapsed, 1) if elapsed else None
+        
+        return report
\ No newline at end of file
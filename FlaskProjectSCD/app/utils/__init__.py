@@ -1,5 +1,20 @@
 from .response_handler import ResponseHandler
+from .cursor import encode_cursor, decode_cursor, InvalidCursorError
+from .streaming import ndjson_stream, csv_stream, iter_ndjson, iter_csv
+from .conditional import make_etag, make_version_etag, is_not_modified, if_match_version, VersionConflict
 
 __all__ = [
-    'ResponseHandler'
+    'ResponseHandler',
+    'encode_cursor',
+    'decode_cursor',
+    'InvalidCursorError',
+    'ndjson_stream',
+    'csv_stream',
+    'iter_ndjson',
+    'iter_csv',
+    'make_etag',
+    'make_version_etag',
+    'is_not_modified',
+    'if_match_version',
+    'VersionConflict'
 ]
\ No newline at end of file
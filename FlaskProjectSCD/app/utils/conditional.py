@@ -0,0 +1,66 @@
+import hashlib
+import re
+from datetime import datetime, timezone
+from typing import Optional
+from flask import request
+from werkzeug.http import is_resource_modified
+
+# ETags built by make_version_etag: '<row version>-<sha1 hex>'
+VERSION_ETAG = re.compile(r'^(\d+)-[0-9a-f]{40}$')
+
+
+class VersionConflict(Exception):
+    """A conditional write found the entity at a different version"""
+    
+    def __init__(self, current_version: int):
+        super().__init__(f"Version conflict: current version is {current_version}")
+        self.current_version = current_version
+
+
+def make_etag(*parts) -> str:
+    """Build a strong ETag value from the parts that identify a representation"""
+    return hashlib.sha1('|'.join(str(part) for part in parts).encode('utf-8')).hexdigest()
+
+
+def make_version_etag(version: int, *parts) -> str:
+    """
+    Strong ETag prefixed with the entity's row version
+    An If-Match carrying it is then checked by the UPDATE or DELETE itself
+    """
+    return f'{version}-{make_etag(*parts)}'
+
+
+def if_match_version() -> Optional[int]:
+    """
+    Row version the If-Match header of the current request pins a write to
+    Returns None without If-Match or for If-Match: *, and 0 (which no row
+    has) when no listed ETag came from make_version_etag
+    """
+    if_match = request.if_match
+    if not if_match or if_match.star_tag:
+        return None
+    
+    # Weak tags count too: compressed responses carry the ETag as W/"...",
+    # and the row version in it is the same either way
+    tags = if_match.as_set(include_weak=True)
+    versions = [int(match.group(1)) for match in map(VERSION_ETAG.match, tags) if match]
+    # The newest version the client has seen is the only one that can still be current
+    return max(versions, default=0)
+
+
+def to_http_datetime(value: Optional[datetime]) -> Optional[datetime]:
+    """Treat naive UTC timestamps from the database as timezone-aware"""
+    if value is None or value.tzinfo is not None:
+        return value
+    return value.replace(tzinfo=timezone.utc)
+
+
+def is_not_modified(etag: str, last_modified: Optional[datetime] = None) -> bool:
+    """
+    Evaluate If-None-Match / If-Modified-Since for the current request
+    If-None-Match wins when both are sent; pass last_modified=None to ignore
+    If-Modified-Since for representations where a timestamp alone is not enough
+    """
+    return not is_resource_modified(
+        request.environ, etag=etag, last_modified=to_http_datetime(last_modified)
+    )
\ No newline at end of file
@@ -0,0 +1,53 @@
+import base64
+import json
+from datetime import datetime
+from typing import Any, Optional, Tuple
+
+
+# Cursors come back from clients, so ids and numbers must fit a BIGINT
+MAX_INTEGER = 2 ** 63 - 1
+
+
+class InvalidCursorError(ValueError):
+    """Raised when a pagination cursor cannot be decoded"""
+
+
+def encode_cursor(sort: str, value: Any, entity_id: int) -> str:
+    """
+    Encode the last row of a page into an opaque cursor
+    The sort key is embedded so a cursor cannot be replayed with another sort
+    """
+    if isinstance(value, datetime):
+        value = {'dt': value.isoformat()}
+    
+    payload = json.dumps({'s': sort, 'v': value, 'id': entity_id}, separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor: Optional[str], sort: str) -> Optional[Tuple[Any, int]]:
+    """
+    Decode a cursor produced by encode_cursor
+    Returns: (sort_value, entity_id) or None for an empty cursor
+    """
+    if not cursor:
+        return None
+    
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+        value = payload['v']
+        entity_id = int(payload['id'])
+        
+        if isinstance(value, dict):
+            value = datetime.fromisoformat(value['dt'])
+        elif isinstance(value, bool) or not isinstance(value, (str, int, float)):
+            raise TypeError(f"Unsupported cursor value {value!r}")
+        if not 0 <= entity_id <= MAX_INTEGER or (isinstance(value, int) and abs(value) > MAX_INTEGER):
+            raise ValueError("Cursor number out of range")
+    except (ValueError, KeyError, TypeError):
+        raise InvalidCursorError("Invalid pagination cursor")
+    
+    if payload.get('s') != sort:
+        raise InvalidCursorError(f"Cursor was issued for sort '{payload.get('s')}', not '{sort}'")
+    
+    return value, entity_id
\ No newline at end of file
@@ -1,5 +1,9 @@
-from flask import jsonify
+from datetime import datetime
+from flask import current_app, jsonify, make_response
 from typing import Any, Optional, Dict
+from .conditional import to_http_datetime
+from ..metrics import record_handled_error
+from ..profiling import timed
 
 
 class ResponseHandler:
@@ -23,12 +27,17 @@ class ResponseHandler:
         # Add any additional fields
         response.update(kwargs)
         
-        return jsonify(response), status_code
+        with timed('serialize'):
+            return jsonify(response), status_code
     
     @staticmethod
     def error(message: str, status_code: int = 400, 
               errors: Optional[Dict] = None) -> tuple:
         """Return error response"""
+        if status_code >= 500:
+            # Controllers turn unexpected exceptions into 500s here; count them
+            record_handled_error(current_app.extensions.get('metrics'), status_code)
+        
         response = {
             'success': False,
             'message': message
@@ -37,7 +46,8 @@ class ResponseHandler:
         if errors:
             response['errors'] = errors
         
-        return jsonify(response), status_code
+        with timed('serialize'):
+            return jsonify(response), status_code
     
     @staticmethod
     def created(data: Any, message: str = "Resource created successfully") -> tuple:
@@ -65,9 +75,67 @@ class ResponseHandler:
         return ResponseHandler.error(message, 400, errors)
     
     @staticmethod
-    def paginated(items: list, total: int, page: int, per_page: int, 
-                  message: str = "Success") -> tuple:
-        """Return paginated response"""
+    def conflict(message: str = "Conflict", errors: Optional[Dict] = None) -> tuple:
+        """Return conflict response (409)"""
+        return ResponseHandler.error(message, 409, errors)
+    
+    @staticmethod
+    def precondition_failed(message: str = "Precondition failed",
+                            errors: Optional[Dict] = None) -> tuple:
+        """Return precondition failed response (412)"""
+        return ResponseHandler.error(message, 412, errors)
+    
+    @staticmethod
+    def too_many_requests(message: str = "Too many requests", retry_after: int = 1) -> tuple:
+        """Return too many requests response (429) telling the client when to retry"""
+        response, status_code = ResponseHandler.error(message, 429)
+        response.headers['Retry-After'] = str(retry_after)
+        return response, status_code
+    
+    @staticmethod
+    def unavailable(message: str = "Service unavailable", retry_after: int = 1) -> tuple:
+        """Return service unavailable response (503) telling the client when to retry"""
+        response, status_code = ResponseHandler.error(message, 503)
+        response.headers['Retry-After'] = str(retry_after)
+        return response, status_code
+    
+    @staticmethod
+    def not_modified(etag: str, last_modified: Optional[datetime] = None) -> tuple:
+        """Return an empty 304 response carrying the current validators"""
+        return ResponseHandler.with_validators((make_response('', 304), 304), etag, last_modified)
+    
+    @staticmethod
+    def with_validators(result: tuple, etag: str,
+                        last_modified: Optional[datetime] = None) -> tuple:
+        """Attach ETag / Last-Modified to a response so clients can revalidate"""
+        response, status_code = result
+        response.set_etag(etag)
+        if last_modified is not None:
+            response.last_modified = to_http_datetime(last_modified)
+        response.headers['Cache-Control'] = 'private, no-cache'
+        return response, status_code
+    
+    @staticmethod
+    def paginated(items: list, total: Optional[int], page: Optional[int], per_page: int, 
+                  message: str = "Success", next_cursor: Optional[str] = None,
+                  total_estimated: bool = False) -> tuple:
+        """
+        Return paginated response
+        Cursor pages pass page=None and a next_cursor; total may be None when skipped
+        """
+        if page is None:
+            return ResponseHandler.success(
+                data=items,
+                message=message,
+                pagination={
+                    'per_page': per_page,
+                    'total': total,
+                    'total_estimated': total_estimated,
+                    'next_cursor': next_cursor,
+                    'has_next': next_cursor is not None
+                }
+            )
+        
         total_pages = (total + per_page - 1) // per_page  # Ceiling division
         
         return ResponseHandler.success(
@@ -0,0 +1,103 @@
+import csv
+import io
+import json
+from typing import Any, Dict, Iterable, Iterator, List, Optional, TextIO, Tuple, Union
+
+
+def ndjson_stream(rows: Iterable[Dict[str, Any]], batch_size: int = 1000) -> Iterator[str]:
+    """
+    Serialize dict rows as newline-delimited JSON
+    Lines are grouped into batches to avoid one tiny socket write per row
+    """
+    buffer = []
+    for row in rows:
+        buffer.append(json.dumps(row, default=str))
+        if len(buffer) >= batch_size:
+            yield '\n'.join(buffer) + '\n'
+            buffer = []
+    
+    if buffer:
+        yield '\n'.join(buffer) + '\n'
+
+
+def csv_stream(rows: Iterable[Dict[str, Any]], fieldnames: List[str],
+               batch_size: int = 1000) -> Iterator[str]:
+    """
+    Serialize dict rows as CSV with a header line
+    Only one batch of rows is held in the buffer at a time
+    """
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=fieldnames, extrasaction='ignore')
+    writer.writeheader()
+    
+    pending = 0
+    for row in rows:
+        writer.writerow(row)
+        pending += 1
+        if pending >= batch_size:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+            pending = 0
+    
+    # Always flush, so an empty export still sends its header
+    yield buffer.getvalue()
+
+
+def sse_event(data: Any, event: Optional[str] = None, event_id: Optional[Any] = None) -> str:
+    """
+    Serialize one server-sent event carrying JSON data
+    event_id is what the browser sends back as Last-Event-ID on reconnect
+    """
+    lines = []
+    if event_id is not None:
+        lines.append(f'id: {event_id}')
+    if event is not None:
+        lines.append(f'event: {event}')
+    lines.append('data: ' + json.dumps(data, default=str))
+    return '\n'.join(lines) + '\n\n'
+
+
+def iter_ndjson(text_stream: TextIO) -> Iterator[Tuple[int, Union[Dict[str, Any], str]]]:
+    """
+    Parse newline-delimited JSON one line at a time
+    Yields (line_number, row) or (line_number, error message) for bad lines
+    """
+    for line_number, line in enumerate(text_stream, 1):
+        line = line.strip()
+        if not line:
+            continue
+        
+        try:
+            row = json.loads(line)
+        except ValueError as e:
+            yield line_number, f"Invalid JSON: {e}"
+            continue
+        
+        if isinstance(row, dict):
+            yield line_number, row
+        else:
+            yield line_number, "Row must be a JSON object"
+
+
+def iter_csv(text_stream: TextIO) -> Iterator[Tuple[int, Union[Dict[str, Any], str]]]:
+    """
+    Parse CSV with a header line one record at a time
+    Empty cells become None; yields (line_number, row or error message)
+    """
+    reader = csv.DictReader(text_stream)
+    
+    while True:
+        try:
+            row = next(reader)
+        except StopIteration:
+            return
+        except csv.Error as e:
+            yield reader.line_num, f"Invalid CSV: {e}"
+            continue
+        
+        if None in row:
+            yield reader.line_num, "Row has more fields than the header"
+            continue
+        
+        yield reader.line_num, {key: (value if value != '' else None) for key, value in row.items()}
\ No newline at end of file
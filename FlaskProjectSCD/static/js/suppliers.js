@@ -2,15 +2,21 @@
 
 let currentPage = 1;
 const perPage = 20;
+let currentSuppliers = [];
+let changeToken = null;
 
 // Load suppliers
 async function loadSuppliers(page = 1) {
     try {
         showLoading('suppliersTableBody');
         
+        // Take the token first, so changes made while the page loads are replayed
+        const changes = await apiRequest('/suppliers/changes');
         const data = await apiRequest(`/suppliers?page=${page}&per_page=${perPage}`);
         
         if (data.success) {
+            currentPage = page;
+            changeToken = changes.data.next_token;
             displaySuppliers(data.data);
         } else {
             throw new Error(data.message);
@@ -27,6 +33,7 @@ async function loadSuppliers(page = 1) {
 // Display suppliers in table
 function displaySuppliers(suppliers) {
     const tbody = document.getElementById('suppliersTableBody');
+    currentSuppliers = suppliers;
     
     if (suppliers.length === 0) {
         tbody.innerHTML = '<tr><td colspan="6" class="text-center text-muted">No suppliers found</td></tr>';
@@ -52,6 +59,85 @@ function displaySuppliers(suppliers) {
     `).join('');
 }
 
+// Apply one change feed item to the rows on screen
+// Returns false when the page has to be reloaded instead
+function applyChange(change) {
+    const index = currentSuppliers.findIndex(supplier => supplier.supplier_id === change.supplier_id);
+    
+    if (change.operation === 'delete') {
+        if (index !== -1) {
+            currentSuppliers.splice(index, 1);
+        }
+        return true;
+    }
+    
+    if (index === -1) {
+        // A new supplier may belong on this page; only the server knows where
+        return false;
+    }
+    
+    currentSuppliers[index] = Object.assign({}, currentSuppliers[index], change.supplier);
+    return true;
+}
+
+// Fetch the changes since the last sync and patch the table with them
+async function syncSuppliers() {
+    if (changeToken === null) {
+        return loadSuppliers(currentPage);
+    }
+    
+    try {
+        let reload = false;
+        let hasMore = true;
+        
+        while (hasMore) {
+            const response = await apiRequest(`/suppliers/changes?since=${changeToken}`);
+            response.data.items.forEach(change => {
+                reload = !applyChange(change) || reload;
+            });
+            changeToken = response.data.next_token;
+            hasMore = response.data.has_more;
+        }
+        
+        if (reload) {
+            loadSuppliers(currentPage);
+        } else {
+            displaySuppliers(currentSuppliers);
+        }
+    } catch (error) {
+        loadSuppliers(currentPage);
+    }
+}
+
+// Follow other users' changes live when the server streams them
+function watchSuppliers() {
+    if (!window.EventSource) return;
+    
+    const source = new EventSource(`${API_BASE_URL}/suppliers/changes/stream`);
+    
+    source.addEventListener('change', (event) => {
+        const change = JSON.parse(event.data);
+        
+        // Already applied by a sync after one of our own writes
+        if (changeToken !== null && change.seq <= changeToken) return;
+        
+        changeToken = change.seq;
+        if (applyChange(change)) {
+            displaySuppliers(currentSuppliers);
+        } else {
+            loadSuppliers(currentPage);
+        }
+    });
+    
+    // The browser reconnects on its own; a closed source means streaming is
+    // disabled, and writes made here still sync through syncSuppliers
+    source.onerror = () => {
+        if (source.readyState === EventSource.CLOSED) {
+            source.close();
+        }
+    };
+}
+
 // Add supplier form submission
 document.getElementById('addSupplierForm')?.addEventListener('submit', async (e) => {
     e.preventDefault();
@@ -68,7 +154,7 @@ document.getElementById('addSupplierForm')?.addEventListener('submit', async (e)
             showAlert('Supplier added successfully!', 'success');
             bootstrap.Modal.getInstance(document.getElementById('addSupplierModal')).hide();
             resetForm('addSupplierForm');
-            loadSuppliers(currentPage);
+            syncSuppliers();
         } else {
             showAlert(response.message, 'danger');
         }
@@ -119,7 +205,7 @@ document.getElementById('editSupplierForm')?.addEventListener('submit', async (e
         if (response.success) {
             showAlert('Supplier updated successfully!', 'success');
             bootstrap.Modal.getInstance(document.getElementById('editSupplierModal')).hide();
-            loadSuppliers(currentPage);
+            syncSuppliers();
         } else {
             showAlert(response.message, 'danger');
         }
@@ -141,7 +227,7 @@ async function deleteSupplier(supplierId) {
         
         if (response.success) {
             showAlert('Supplier deleted successfully!', 'success');
-            loadSuppliers(currentPage);
+            syncSuppliers();
         } else {
             showAlert(response.message, 'danger');
         }
@@ -153,4 +239,5 @@ async function deleteSupplier(supplierId) {
 // Load initial data
 document.addEventListener('DOMContentLoaded', () => {
     loadSuppliers(1);
+    watchSuppliers();
 });
\ No newline at end of file
@@ -0,0 +1,12 @@
+#!/usr/bin/env python3
+"""
+ASGI entry point for Supplier Management System
+Run with: uvicorn asgi:asgi_app --workers 4
+"""
+from FlaskProjectSCD.app import create_app
+from FlaskProjectSCD.app.asgi import AsgiApp
+
+# Create Flask application and expose it to ASGI servers; async views run on
+# the server's event loop, the sync ones in its thread pool
+app = create_app()
+asgi_app = AsgiApp(app)
\ No newline at end of file
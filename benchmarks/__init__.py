@@ -0,0 +1 @@
+"""Load and micro-benchmarks for the supplier API (python -m benchmarks)"""
\ No newline at end of file
@@ -0,0 +1,200 @@
+"""
+Supplier API benchmark suite
+Usage:
+    python -m benchmarks run [--rows 10000] [--requests 500] [--transport client,http]
+    python -m benchmarks compare old.json new.json
+Run 'python -m benchmarks run --help' for every option
+"""
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+from datetime import datetime, timezone
+from importlib.metadata import version
+from typing import Any, Dict, Optional
+import click
+
+
+@click.group()
+def cli():
+    """Seed a database and benchmark the supplier API"""
+
+
+@cli.command()
+@click.option('--database-url', default=None,
+              help="Database to seed and benchmark; its supplier tables are dropped. "
+                   "Defaults to a temporary SQLite file")
+@click.option('--config', 'config_name', default='production', show_default=True,
+              help="Config the app is built with")
+@click.option('--rows', default=10000, show_default=True, help="Suppliers to seed (10k to 1M)")
+@click.option('--reuse', is_flag=True, help="Keep the existing rows if the table already has --rows of them")
+@click.option('--requests', 'request_count', default=500, show_default=True,
+              help="Requests per scenario and transport")
+@click.option('--scenarios', default='list,search,get,create,update,delete', show_default=True)
+@click.option('--transport', default='client,http', show_default=True,
+              help="client (Flask test client) and/or http (real HTTP server)")
+@click.option('--concurrency', default=4, show_default=True, help="HTTP client threads")
+@click.option('--url', default=None,
+              help="Benchmark an already running server (e.g. run.py serve) on the same "
+                   "database instead of starting one in-process")
+@click.option('--warmup', default=50, show_default=True, help="Untimed requests before read scenarios")
+@click.option('--micro/--no-micro', default=True, show_default=True, help="Run the micro-benchmarks")
+@click.option('--seed', default=42, show_default=True, help="Seed for rows and request sequences")
+@click.option('--output', default='benchmark-results.json', show_default=True)
+def run(database_url, config_name, rows, reuse, request_count, scenarios, transport,
+        concurrency, url, warmup, micro, seed, output):
+    """Seed the database, run the load scenarios and micro-benchmarks, write JSON results"""
+    if database_url is None:
+        database_url = 'sqlite:///' + os.path.join(tempfile.mkdtemp(prefix='scd-bench-'), 'benchmark.db')
+    
+    # The config classes read the environment when they are imported
+    os.environ['DATABASE_URL'] = database_url
+    os.environ['TEST_DATABASE_URL'] = database_url
+    # Measure the service itself, not the request quota of a single client
+    os.environ.setdefault('RATE_LIMIT_ENABLED', 'False')
+    from FlaskProjectSCD.app import create_app
+    from .load import READ_ONLY, State, build_requests, run_client, run_http, start_server, scenarios as known
+    from .micro import run_micro
+    from .seed import count_suppliers, seed_suppliers
+    
+    names = [name for name in known if name in scenarios.split(',')]
+    transports = [name for name in ('client', 'http') if name in transport.split(',')]
+    if url is not None:
+        transports = ['http']
+    
+    app = create_app(config_name)
+    with app.app_context():
+        if reuse and count_suppliers() == rows:
+            seeding = {'rows': rows, 'reused': True}
+        else:
+            click.echo(f"Seeding {rows} suppliers...")
+            seeding = seed_suppliers(rows, seed)
+            click.echo(f"  inserted in {seeding['insert_seconds']}s, indexed in {seeding['index_seconds']}s")
+        dialect = app.extensions['sqlalchemy'].engine.dialect.name
+    
+    state = State(rows)
+    results = []
+    for transport_name in transports:
+        stop = None
+        if transport_name == 'http':
+            base_url = url
+            if base_url is None:
+                base_url, stop = start_server(app)
+        
+        try:
+            for name in names:
+                requests = build_requests(name, request_count, seed, state)
+                if transport_name == 'client':
+                    send = lambda batch: run_client(app, batch, state)
+                else:
+                    send = lambda batch: run_http(base_url, batch, state, concurrency)
+                
+                if warmup and name in READ_ONLY:
+                    send(requests[:warmup])
+                result = dict(send(requests), transport=transport_name, scenario=name)
+                results.append(result)
+                click.echo(_format_result(result))
+        finally:
+            if stop is not None:
+                stop()
+    
+    micro_results = run_micro(app, seed=seed) if micro else []
+    for result in micro_results:
+        click.echo(f"{'micro':<7}{result['name']:<44}{result['us_per_call']['min']:>10.2f} us/call")
+    
+    report = {
+        'meta': _meta(app, dialect, {
+            'config': config_name, 'rows': rows, 'requests': request_count,
+            'concurrency': concurrency, 'warmup': warmup, 'seed': seed,
+            'external_url': url,
+        }),
+        'seeding': seeding,
+        'results': results,
+        'micro': micro_results,
+    }
+    with open(output, 'w') as file:
+        json.dump(report, file, indent=2)
+    click.echo(f"Results written to {output}")
+
+
+@cli.command()
+@click.argument('old', type=click.Path(exists=True))
+@click.argument('new', type=click.Path(exists=True))
+def compare(old, new):
+    """Show the change in latency and throughput between two result files"""
+    with open(old) as file:
+        before = json.load(file)
+    with open(new) as file:
+        after = json.load(file)
+    
+    click.echo(f"{before['meta'].get('commit')} -> {after['meta'].get('commit')}")
+    click.echo(f"{'':<7}{'scenario':<10}{'p50 ms':>28}{'p95 ms':>28}{'p99 ms':>28}{'req/s':>28}")
+    
+    previous = {(result['transport'], result['scenario']): result for result in before['results']}
+    for result in after['results']:
+        old_result = previous.get((result['transport'], result['scenario']))
+        if old_result is None:
+            continue
+        cells = [
+            _delta(old_result['latency_ms'][key], result['latency_ms'][key])
+            for key in ('p50', 'p95', 'p99')
+        ]
+        cells.append(_delta(old_result['throughput_rps'], result['throughput_rps']))
+        click.echo(f"{result['transport']:<7}{result['scenario']:<10}" + ''.join(f'{cell:>28}' for cell in cells))
+    
+    previous_micro = {result['name']: result for result in before.get('micro', [])}
+    for result in after.get('micro', []):
+        old_result = previous_micro.get(result['name'])
+        if old_result is not None:
+            change = _delta(old_result['us_per_call']['min'], result['us_per_call']['min'])
+            click.echo(f"{'micro':<7}{result['name']:<48}{change:>28} us")
+
+
+def _format_result(result: Dict[str, Any]) -> str:
+    latency = result['latency_ms']
+    return (
+        f"{result['transport']:<7}{result['scenario']:<8}"
+        f"{result['throughput_rps'] or 0:>9.1f} req/s  "
+        f"p50 {latency['p50'] or 0:>8.2f}  p95 {latency['p95'] or 0:>8.2f}  "
+        f"p99 {latency['p99'] or 0:>8.2f} ms  errors {result['errors']}"
+    )
+
+
+def _delta(old: Optional[float], new: Optional[float]) -> str:
+    if old is None or new is None:
+        return 'n/a'
+    change = f' ({(new - old) / old * 100:+.1f}%)' if old else ''
+    return f'{old:.2f} -> {new:.2f}{change}'
+
+
+def _meta(app, dialect: str, parameters: Dict[str, Any]) -> Dict[str, Any]:
+    """Where and how the numbers were taken, so runs can be compared fairly"""
+    config = app.config
+    return dict(
+        parameters,
+        commit=_git('rev-parse', '--short', 'HEAD'),
+        dirty=bool(_git('status', '--porcelain', '--untracked-files=no')),
+        timestamp=datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        python=sys.version.split()[0],
+        platform=platform.platform(),
+        flask=version('flask'),
+        sqlalchemy=version('sqlalchemy'),
+        dialect=dialect,
+        cache_backend=config['CACHE_BACKEND'],
+        search_backend=config['SEARCH_BACKEND'],
+        pool_size=config['DB_POOL_SIZE'],
+    )
+
+
+def _git(*args: str) -> Optional[str]:
+    try:
+        result = subprocess.run(['git', *args], capture_output=True, text=True, timeout=10)
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return result.stdout.strip() if result.returncode == 0 else None
+
+
+if __name__ == '__main__':
+    cli()
\ No newline at end of file
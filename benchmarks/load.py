@@ -0,0 +1,206 @@
+import http.client
+import json
+import math
+import random
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+from .seed import ADJECTIVES, NOUNS, supplier_row
+
+# (method, path, JSON body or None)
+Request = Tuple[str, str, Optional[dict]]
+
+
+class State:
+    """Facts the scenarios share: table size and ids created by the create scenario"""
+    
+    def __init__(self, rows: int):
+        self.rows = rows
+        self.created: List[int] = []
+        self.next_number = rows + 1
+        self._lock = threading.Lock()
+    
+    def new_number(self) -> int:
+        with self._lock:
+            number = self.next_number
+            self.next_number += 1
+            return number
+
+
+def build_list(rng: random.Random, state: State) -> Request:
+    # Offset pages get slower the deeper they go, so sample the first 500
+    pages = max(1, min(state.rows // 20, 500))
+    return 'GET', f'/api/suppliers?page={rng.randint(1, pages)}&per_page=20', None
+
+
+def build_search(rng: random.Random, state: State) -> Request:
+    term = rng.choice(ADJECTIVES + NOUNS).lower()
+    return 'GET', f'/api/suppliers?search={term}&per_page=20', None
+
+
+def build_get(rng: random.Random, state: State) -> Request:
+    return 'GET', f'/api/suppliers/{rng.randint(1, state.rows)}', None
+
+
+def build_create(rng: random.Random, state: State) -> Request:
+    row = supplier_row(rng, state.new_number())
+    body = {key: value for key, value in row.items() if key not in ('created_at', 'updated_at')}
+    return 'POST', '/api/suppliers', body
+
+
+def build_update(rng: random.Random, state: State) -> Request:
+    return 'PUT', f'/api/suppliers/{rng.randint(1, state.rows)}', {
+        'phone': f'+92{rng.randint(3000000000, 3499999999)}'
+    }
+
+
+def build_delete(rng: random.Random, state: State) -> Request:
+    # Deletes what the create scenario added, so the table ends where it began
+    return 'DELETE', f'/api/suppliers/{state.created.pop()}', None
+
+
+# Run in this order: delete consumes the rows create made
+scenarios: Dict[str, Callable[[random.Random, State], Request]] = {
+    'list': build_list,
+    'search': build_search,
+    'get': build_get,
+    'create': build_create,
+    'update': build_update,
+    'delete': build_delete,
+}
+READ_ONLY = ('list', 'search', 'get')
+
+
+def build_requests(name: str, count: int, seed: int, state: State) -> List[Request]:
+    """The same seed always yields the same requests for the same table"""
+    rng = random.Random(f'{seed}:{name}')
+    if name == 'delete':
+        count = min(count, len(state.created))
+    return [scenarios[name](rng, state) for _ in range(count)]
+
+
+def summarize(latencies: List[float], errors: int, elapsed: float) -> Dict[str, Any]:
+    """Throughput and latency percentiles (ms, nearest rank) of one run"""
+    ordered = sorted(latencies)
+    
+    def percentile(fraction: float) -> Optional[float]:
+        if not ordered:
+            return None
+        return round(ordered[max(0, math.ceil(fraction * len(ordered)) - 1)] * 1000, 3)
+    
+    return {
+        'requests': len(ordered),
+        'errors': errors,
+        'seconds': round(elapsed, 3),
+        'throughput_rps': round(len(ordered) / elapsed, 1) if elapsed else None,
+        'latency_ms': {
+            'mean': round(sum(ordered) / len(ordered) * 1000, 3) if ordered else None,
+            'p50': percentile(0.50),
+            'p95': percentile(0.95),
+            'p99': percentile(0.99),
+            'max': round(ordered[-1] * 1000, 3) if ordered else None,
+        },
+    }
+
+
+def run_client(app, requests: List[Request], state: State) -> Dict[str, Any]:
+    """Send requests one at a time through the Flask test client"""
+    client = app.test_client()
+    latencies, errors = [], 0
+    
+    started = time.perf_counter()
+    for method, path, body in requests:
+        sent = time.perf_counter()
+        response = client.open(path, method=method, json=body)
+        latencies.append(time.perf_counter() - sent)
+        errors += _record(state, method, response.status_code, response.get_json(silent=True))
+    elapsed = time.perf_counter() - started
+    
+    return summarize(latencies, errors, elapsed)
+
+
+def run_http(base_url: str, requests: List[Request], state: State,
+             concurrency: int = 1) -> Dict[str, Any]:
+    """
+    Send requests over real HTTP from concurrency threads
+    Each thread keeps one keep-alive connection, like a pooled client
+    """
+    target = urlsplit(base_url)
+    lock = threading.Lock()
+    latencies, errors = [], [0]
+    
+    def worker(share: List[Request]):
+        connection = http.client.HTTPConnection(target.hostname, target.port, timeout=60)
+        local, local_errors = [], 0
+        for method, path, body in share:
+            payload = json.dumps(body) if body is not None else None
+            headers = {'Content-Type': 'application/json'} if body is not None else {}
+            sent = time.perf_counter()
+            try:
+                connection.request(method, path, body=payload, headers=headers)
+                response = connection.getresponse()
+                data = response.read()
+            except (OSError, http.client.HTTPException):
+                connection.close()
+                connection = http.client.HTTPConnection(target.hostname, target.port, timeout=60)
+                local_errors += 1
+                continue
+            local.append(time.perf_counter() - sent)
+            local_errors += _record(state, method, response.status, _json(data))
+        connection.close()
+        
+        with lock:
+            latencies.extend(local)
+            errors[0] += local_errors
+    
+    shares = [requests[index::concurrency] for index in range(concurrency)]
+    threads = [threading.Thread(target=worker, args=(share,)) for share in shares if share]
+    
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+    
+    return summarize(latencies, errors[0], elapsed)
+
+
+def start_server(app) -> Tuple[str, Callable[[], None]]:
+    """
+    Serve app from a threaded Werkzeug server on a free local port
+    Returns: (base_url, stop)
+    """
+    from werkzeug.serving import WSGIRequestHandler, make_server
+    
+    class QuietRequestHandler(WSGIRequestHandler):
+        # An access log line per request would be measured along with the app
+        def log_request(self, *args, **kwargs):
+            pass
+    
+    server = make_server('127.0.0.1', 0, app, threaded=True, request_handler=QuietRequestHandler)
+    thread = threading.Thread(target=server.serve_forever, name='benchmark-server', daemon=True)
+    thread.start()
+    
+    def stop():
+        server.shutdown()
+        thread.join()
+    
+    return f'http://127.0.0.1:{server.server_port}', stop
+
+
+def _record(state: State, method: str, status: int, data: Optional[dict]) -> int:
+    """Keep ids of created suppliers for the delete scenario; 1 if the request failed"""
+    if status >= 400:
+        return 1
+    if method == 'POST' and data:
+        state.created.append(data['data']['supplier_id'])
+    return 0
+
+
+def _json(data: bytes) -> Optional[dict]:
+    try:
+        return json.loads(data) if data else None
+    except ValueError:
+        return None
\ No newline at end of file
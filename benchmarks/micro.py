@@ -0,0 +1,57 @@
+import random
+import statistics
+import timeit
+from typing import Any, Callable, Dict, List
+from FlaskProjectSCD.app.models.supplier import Supplier
+from FlaskProjectSCD.app.utils.response_handler import ResponseHandler
+from .seed import supplier_row
+
+
+def time_call(name: str, fn: Callable[[], Any], number: int, repeat: int = 5) -> Dict[str, Any]:
+    """
+    Time fn over repeat rounds of number calls
+    min is the least noisy figure; median shows the typical round
+    """
+    rounds = timeit.Timer(fn).repeat(repeat=repeat, number=number)
+    per_call = [seconds / number * 1e6 for seconds in rounds]
+    return {
+        'name': name,
+        'calls': number * repeat,
+        'us_per_call': {
+            'min': round(min(per_call), 3),
+            'median': round(statistics.median(per_call), 3),
+        },
+    }
+
+
+def run_micro(app, number: int = 2000, seed: int = 42) -> List[Dict[str, Any]]:
+    """Micro-benchmarks of the per-row and per-page serialization paths"""
+    rng = random.Random(seed)
+    suppliers = []
+    for index in range(100):
+        supplier = Supplier(**supplier_row(rng, index + 1))
+        supplier.supplier_id = index + 1
+        suppliers.append(supplier)
+    
+    page_20 = [supplier.to_dict() for supplier in suppliers[:20]]
+    page_100 = [supplier.to_dict() for supplier in suppliers]
+    
+    results = [
+        time_call('Supplier.to_dict', lambda: suppliers[0].to_dict(), number),
+        time_call('Supplier.to_dict x20 (one page)',
+                  lambda: [supplier.to_dict() for supplier in suppliers[:20]], number // 10),
+    ]
+    
+    # jsonify needs an application context
+    with app.app_context():
+        results += [
+            time_call('ResponseHandler.paginated (20 items)',
+                      lambda: ResponseHandler.paginated(page_20, 10000, 3, 20), number // 10),
+            time_call('ResponseHandler.paginated (100 items)',
+                      lambda: ResponseHandler.paginated(page_100, 10000, 3, 100), number // 50),
+            time_call('ResponseHandler.paginated (cursor, 20 items)',
+                      lambda: ResponseHandler.paginated(page_20, None, None, 20, next_cursor='abc'),
+                      number // 10),
+        ]
+    
+    return results
\ No newline at end of file
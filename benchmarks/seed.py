@@ -0,0 +1,95 @@
+import random
+import time
+from datetime import datetime, timedelta
+from typing import Dict, Iterator, List
+from sqlalchemy import func, insert, select, text
+from FlaskProjectSCD.app import db
+from FlaskProjectSCD.app.models.supplier import Supplier
+from FlaskProjectSCD.app.repositories.search_backends import SQLiteFTS5SearchBackend
+from FlaskProjectSCD.app.repositories.supplier_repository import SupplierRepository
+
+# Name vocabulary; each word appears in about 1/len(list) of the rows, so
+# search terms match a realistic slice of the table
+ADJECTIVES = [
+    'Global', 'Prime', 'United', 'Northern', 'Pacific', 'Atlas', 'Summit', 'Metro',
+    'Apex', 'Royal', 'Delta', 'Vertex', 'Golden', 'Silver', 'Eastern', 'Coastal',
+]
+NOUNS = [
+    'Supplies', 'Traders', 'Logistics', 'Components', 'Industries', 'Imports',
+    'Materials', 'Distributors', 'Electronics', 'Foods', 'Textiles', 'Hardware',
+]
+FIRST_NAMES = ['Ali', 'Sara', 'John', 'Maria', 'Chen', 'Fatima', 'Omar', 'Lena', 'Ravi', 'Emma']
+LAST_NAMES = ['Khan', 'Smith', 'Garcia', 'Wang', 'Ahmed', 'Silva', 'Müller', 'Patel', 'Brown']
+CITIES = ['Lahore', 'Karachi', 'London', 'Berlin', 'Dubai', 'Toronto', 'Austin', 'Osaka']
+
+# Fixed so seeded rows, and the requests built from them, repeat across runs
+BASE_TIME = datetime(2024, 1, 1)
+
+
+def supplier_row(rng: random.Random, number: int) -> Dict[str, object]:
+    """One deterministic supplier row; number keeps names and emails unique"""
+    created_at = BASE_TIME + timedelta(seconds=number)
+    return {
+        'supplier_name': f'{rng.choice(ADJECTIVES)} {rng.choice(NOUNS)} {number}',
+        'contact_person': f'{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}',
+        'email': f'contact{number}@supplier{number % 997}.example.com',
+        'phone': f'+92{rng.randint(3000000000, 3499999999)}',
+        'address': f'{rng.randint(1, 999)} Market Road, {rng.choice(CITIES)}',
+        'created_at': created_at,
+        'updated_at': created_at,
+    }
+
+
+def generate_rows(count: int, seed: int) -> Iterator[Dict[str, object]]:
+    rng = random.Random(seed)
+    for number in range(1, count + 1):
+        yield supplier_row(rng, number)
+
+
+def seed_suppliers(count: int, seed: int = 42, chunk_size: int = 10000) -> Dict[str, float]:
+    """
+    Recreate the suppliers table with count deterministic rows; run in an app context
+    Rows go in with multi-row INSERTs and the text index, summary table and
+    typeahead index are built once at the end, which is far faster than row
+    by row; seeded rows are not in the change feed
+    Returns: {'rows', 'insert_seconds', 'index_seconds'}
+    """
+    backend = SupplierRepository().search_backend
+    if isinstance(backend, SQLiteFTS5SearchBackend):
+        db.session.execute(text(f'DROP TABLE IF EXISTS {backend.table}'))
+        db.session.commit()
+    db.drop_all()
+    db.create_all()
+    
+    started = time.perf_counter()
+    chunk: List[Dict[str, object]] = []
+    for row in generate_rows(count, seed):
+        chunk.append(row)
+        if len(chunk) >= chunk_size:
+            db.session.execute(insert(Supplier), chunk)
+            db.session.commit()
+            chunk = []
+    if chunk:
+        db.session.execute(insert(Supplier), chunk)
+        db.session.commit()
+    inserted = time.perf_counter()
+    
+    backend.ensure_index()
+    repository = SupplierRepository()
+    repository.rebuild_stats()
+    if repository.change_feed is not None:
+        repository.change_feed.ensure_sequence()
+    if repository.suggest_index is not None:
+        repository.suggest_index.build(repository)
+    indexed = time.perf_counter()
+    
+    return {
+        'rows': count,
+        'insert_seconds': round(inserted - started, 3),
+        'index_seconds': round(indexed - inserted, 3),
+    }
+
+
+def count_suppliers() -> int:
+    """Current row count; run in an app context"""
+    return db.session.execute(select(func.count(Supplier.supplier_id))).scalar_one()
\ No newline at end of file
@@ -1,8 +1,19 @@
 #!/usr/bin/env python3
 """
 Application entry point for Supplier Management System
+Usage:
+    python run.py          Flask development server
+    python run.py serve    pre-fork production server (gunicorn)
+    python run.py init-db  create tables and search indexes
+    python run.py rebuild-stats [--chunk-size N]
+                           recompute the supplier summary table
+    python run.py sync-replicas
+                           copy a SQLite primary to SQLite read replicas
+    python run.py startup-report [--json]
+                           import and startup time of a cold start
 """
 import os
+import sys
 from FlaskProjectSCD.app import create_app
 
 # Create Flask application
@@ -10,10 +21,24 @@ app = create_app()
 
 if __name__ == '__main__':
     port = int(os.getenv('PORT', 5000))
+    
+    command = sys.argv[1] if len(sys.argv) > 1 else None
+    
+    if command == 'serve':
+        from FlaskProjectSCD.app.server import serve
+        
+        serve(app, port=port)
+        sys.exit(0)
+    
+    if command in ('init-db', 'rebuild-stats', 'sync-replicas', 'startup-report'):
+        from flask.cli import ScriptInfo
+        
+        app.cli.main(args=sys.argv[1:], prog_name='run.py', obj=ScriptInfo(create_app=lambda: app))
+    
     debug = os.getenv('DEBUG', 'True').lower() == 'true'
     
     app.run(
         host='0.0.0.0',
         port=port,
         debug=debug
-    )
+    )
\ No newline at end of file
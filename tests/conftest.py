@@ -0,0 +1,51 @@
+import pytest
+from FlaskProjectSCD.app import create_app, db
+from FlaskProjectSCD.app.config import TestingConfig
+
+
+@pytest.fixture
+def make_app(tmp_path, monkeypatch):
+    """Build apps on TestingConfig with overrides, each with a database file of its own"""
+    apps = []
+    
+    def make(**overrides):
+        overrides.setdefault('SQLALCHEMY_DATABASE_URI', f"sqlite:///{tmp_path / f'test-{len(apps)}.db'}")
+        for name, value in overrides.items():
+            monkeypatch.setattr(TestingConfig, name, value, raising=False)
+        app = create_app('testing')
+        apps.append(app)
+        return app
+    
+    yield make
+    
+    for app in apps:
+        for index in app.extensions.get('suggest_indexes', {}).values():
+            index.stop()
+        with app.app_context():
+            db.session.remove()
+            for engine in db.engines.values():
+                engine.dispose()
+        database = app.extensions.pop('async_database', None)
+        if database is not None:
+            database.dispose()
+
+
+@pytest.fixture
+def app(make_app):
+    return make_app()
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+@pytest.fixture
+def suppliers(client):
+    """Ids of six suppliers created through the API"""
+    ids = []
+    for i in range(6):
+        response = client.post('/api/suppliers', json={'supplier_name': f'Supplier {i}', 'email': f's{i}@example.com'})
+        assert response.status_code == 201
+        ids.append(response.get_json()['data']['supplier_id'])
+    return ids
\ No newline at end of file
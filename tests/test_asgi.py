@@ -0,0 +1,73 @@
+import asyncio
+import json
+from FlaskProjectSCD.app.asgi import AsgiApp
+from FlaskProjectSCD.app.repositories.async_database import AsyncDatabase
+
+
+def call(asgi, method, path, body=None, headers=()):
+    """One request through the ASGI app; returns (status, headers, JSON body)"""
+    raw = json.dumps(body).encode('utf-8') if body is not None else b''
+    path, _, query = path.partition('?')
+    scope = {
+        'type': 'http', 'method': method, 'path': path, 'query_string': query.encode('latin1'),
+        'root_path': '', 'http_version': '1.1', 'scheme': 'http',
+        'server': ('testserver', 80), 'client': ('127.0.0.1', 50000),
+        'headers': [(b'content-type', b'application/json'), (b'content-length', str(len(raw)).encode())]
+                   + [(name.lower().encode('latin1'), value.encode('latin1')) for name, value in headers],
+    }
+    messages = [{'type': 'http.request', 'body': raw, 'more_body': False}]
+    response = {'body': b''}
+    
+    async def receive():
+        return messages.pop(0) if messages else {'type': 'http.disconnect'}
+    
+    async def send(message):
+        if message['type'] == 'http.response.start':
+            response['status'] = message['status']
+            response['headers'] = {name.decode('latin1'): value.decode('latin1') for name, value in message['headers']}
+        else:
+            response['body'] += message.get('body', b'')
+    
+    async def run():
+        await asgi(scope, receive, send)
+    
+    asyncio.run(run())
+    return response['status'], response['headers'], json.loads(response['body'] or b'null')
+
+
+def test_async_views_run_their_sessions_on_the_serving_loop(app, suppliers, monkeypatch):
+    loops = []
+    session = AsyncDatabase._session
+    
+    async def recording_session(work, sessionmaker):
+        loops.append(asyncio.get_running_loop())
+        return await session(work, sessionmaker)
+    monkeypatch.setattr(AsyncDatabase, '_session', staticmethod(recording_session))
+    
+    asgi = AsgiApp(app)
+    status, _, body = call(asgi, 'GET', '/api/async/suppliers?per_page=2')
+    assert status == 200
+    assert body['pagination']['total'] == len(suppliers)
+    
+    database = app.extensions['async_database']
+    assert loops and database.loop not in loops
+    assert len(database.serving_engines()) == 1
+
+
+def test_sync_routes_and_conditional_writes_through_asgi(app, suppliers):
+    asgi = AsgiApp(app)
+    status, headers, _ = call(asgi, 'GET', f'/api/suppliers/{suppliers[0]}')
+    assert status == 200
+    etag = headers['etag']
+    
+    status, _, body = call(asgi, 'PATCH', f'/api/async/suppliers/{suppliers[0]}', {'phone': '555'},
+                           headers=[('If-Match', etag)])
+    assert status == 200
+    assert body['data']['phone'] == '555'
+    
+    status, _, _ = call(asgi, 'PATCH', f'/api/async/suppliers/{suppliers[0]}', {'phone': '556'},
+                        headers=[('If-Match', etag)])
+    assert status == 412
+    
+    status, _, _ = call(asgi, 'GET', '/api/async/no-such-route')
+    assert status == 404
\ No newline at end of file
@@ -0,0 +1,93 @@
+from FlaskProjectSCD.app.repositories import cache_backends
+from FlaskProjectSCD.app.services import auth_service
+from FlaskProjectSCD.app.services.auth_service import AuthService, FakeTokenVerifier
+
+
+def counting_verifier(service):
+    """Count the tokens service really verifies"""
+    calls = []
+    verify = service.verifier.verify
+    service.verifier.verify = lambda token: calls.append(token) or verify(token)
+    return calls
+
+
+def test_token_cache_returns_copies(app):
+    with app.app_context():
+        service = AuthService.get_instance()
+        calls = counting_verifier(service)
+        token = FakeTokenVerifier.issue('uid-1', role='staff')
+        
+        service.verify_token(token)['role'] = 'admin'
+        claims = service.verify_token(token)
+        claims['role'] = 'admin'
+        assert service.verify_token(token)['role'] == 'staff'
+        assert service.cached_claims(token)['role'] == 'staff'
+        assert len(calls) == 1
+
+
+class Clock:
+    """Stands in for the time module: wall-clock and monotonic time move together"""
+    
+    def __init__(self):
+        self.now = 0.0
+    
+    def time(self):
+        return 1700000000 + self.now
+    
+    def monotonic(self):
+        return self.now
+
+
+def test_token_cache_ttl_is_capped(app, monkeypatch):
+    assert app.config['AUTH_TOKEN_CACHE_MAX_TTL'] == 300
+    clock = Clock()
+    monkeypatch.setattr(cache_backends, 'time', clock)
+    monkeypatch.setattr(auth_service, 'time', clock)
+    with app.app_context():
+        service = AuthService.get_instance()
+        calls = counting_verifier(service)
+        token = FakeTokenVerifier.issue('uid-1', ttl=3600)
+        
+        service.verify_token(token)
+        clock.now += 299
+        service.verify_token(token)
+        assert len(calls) == 1
+        
+        # the token is good for an hour, but the cache keeps it five minutes
+        clock.now += 2
+        assert service.verify_token(token)['uid'] == 'uid-1'
+        assert len(calls) == 2
+
+
+def test_invalidate_token(app):
+    with app.app_context():
+        service = AuthService.get_instance()
+        calls = counting_verifier(service)
+        token = FakeTokenVerifier.issue('uid-1')
+        
+        service.verify_token(token)
+        service.invalidate_token(token)
+        assert service.cached_claims(token) is None
+        assert service.verify_token(token)['uid'] == 'uid-1'
+        assert len(calls) == 2
+
+
+def test_deactivate_user_revokes_cached_tokens(app):
+    with app.app_context():
+        service = AuthService.get_instance()
+        calls = counting_verifier(service)
+        service.user_repository.create(firebase_uid='uid-1', email='u1@example.com')
+        first, second = FakeTokenVerifier.issue('uid-1'), FakeTokenVerifier.issue('uid-1', ttl=1800)
+        other = FakeTokenVerifier.issue('uid-2')
+        for token in (first, second, other):
+            service.verify_token(token)
+        
+        assert service.deactivate_user('uid-1').is_active is False
+        assert service.cached_claims(first) is None
+        assert service.cached_claims(second) is None
+        assert service.cached_claims(other)['uid'] == 'uid-2'
+        
+        # Verified again from scratch, and cached from then on
+        service.verify_token(first)
+        assert service.cached_claims(first)['uid'] == 'uid-1'
+        assert len(calls) == 4
\ No newline at end of file
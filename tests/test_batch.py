@@ -0,0 +1,113 @@
+import pytest
+from FlaskProjectSCD.app import db
+from FlaskProjectSCD.app.models.supplier import Supplier
+from FlaskProjectSCD.app.utils.response_handler import ResponseHandler
+
+
+def batch(client, *requests):
+    response = client.post('/api/batch', json={'requests': list(requests)})
+    assert response.status_code == 200
+    return response.get_json()['data']
+
+
+def write_then_fail():
+    # Leaves an uncommitted row in the session the batch shares
+    db.session.add(Supplier(supplier_name='Half written'))
+    db.session.flush()
+    return ResponseHandler.error("Deliberate failure", 503)
+
+
+def write_then_raise():
+    db.session.add(Supplier(supplier_name='Half written'))
+    db.session.flush()
+    raise RuntimeError("Deliberate crash")
+
+
+@pytest.fixture
+def failing_routes(app):
+    # Routes must be added before the app handles its first request
+    app.add_url_rule('/test/write-then-fail', view_func=write_then_fail, methods=['POST'])
+    app.add_url_rule('/test/write-then-raise', view_func=write_then_raise, methods=['POST'])
+
+
+def names(client):
+    return sorted(supplier['supplier_name'] for supplier in client.get('/api/suppliers?per_page=50').get_json()['data'])
+
+
+def test_runs_in_order_and_returns_headers(client, suppliers):
+    results = batch(
+        client,
+        {'method': 'GET', 'path': f'/api/suppliers/{suppliers[0]}'},
+        {'method': 'POST', 'path': '/api/suppliers', 'body': {'supplier_name': 'Batched'}},
+        {'method': 'PATCH', 'path': f'/api/suppliers/{suppliers[0]}', 'body': {'phone': '+1'}},
+        {'method': 'DELETE', 'path': f'/api/suppliers/{suppliers[1]}'},
+        {'method': 'GET', 'path': f'/api/suppliers/{suppliers[1]}'},
+    )
+    assert [result['status'] for result in results] == [200, 201, 200, 200, 404]
+    assert results[0]['headers']['ETag'] != results[2]['headers']['ETag']
+    assert results[1]['body']['data']['supplier_name'] == 'Batched'
+    assert 'Batched' in names(client)
+
+
+def test_if_match_from_an_earlier_batch(client, suppliers):
+    etag = batch(client, {'method': 'GET', 'path': f'/api/suppliers/{suppliers[0]}'})[0]['headers']['ETag']
+    results = batch(
+        client,
+        {'method': 'PATCH', 'path': f'/api/suppliers/{suppliers[0]}', 'body': {'phone': '+1'}, 'headers': {'If-Match': etag}},
+        {'method': 'PATCH', 'path': f'/api/suppliers/{suppliers[0]}', 'body': {'phone': '+2'}, 'headers': {'If-Match': etag}},
+    )
+    assert [result['status'] for result in results] == [200, 412]
+
+
+@pytest.mark.parametrize('path', ['/test/write-then-fail', '/test/write-then-raise'])
+def test_server_error_rolls_back_only_that_subrequest(failing_routes, client, suppliers, path):
+    results = batch(
+        client,
+        {'method': 'POST', 'path': '/api/suppliers', 'body': {'supplier_name': 'Before'}},
+        {'method': 'POST', 'path': path},
+        {'method': 'POST', 'path': '/api/suppliers', 'body': {'supplier_name': 'After'}},
+        {'method': 'GET', 'path': '/api/suppliers?search=written'},
+    )
+    assert [result['status'] for result in results] == [201, results[1]['status'], 201, 200]
+    assert results[1]['status'] >= 500
+    assert results[3]['body']['data'] == []
+    
+    found = names(client)
+    assert 'Before' in found and 'After' in found
+    assert 'Half written' not in found
+
+
+def test_client_errors_do_not_stop_the_batch(client, suppliers):
+    results = batch(
+        client,
+        {'method': 'GET', 'path': '/api/suppliers/999999'},
+        {'method': 'POST', 'path': '/api/suppliers', 'body': {'email': 'nameless@example.com'}},
+        {'method': 'PATCH', 'path': f'/api/suppliers/{suppliers[0]}', 'body': {'phone': '+1', 'version': 9}},
+        {'method': 'GET', 'path': '/api/suppliers/export'},
+        {'method': 'POST', 'path': '/api/batch', 'body': {'requests': [{'path': '/api/suppliers'}]}},
+        {'method': 'PUT', 'path': f'/api/suppliers/{suppliers[1]}', 'body': {'supplier_name': 'Still runs'}},
+    )
+    assert [result['status'] for result in results] == [404, 400, 409, 400, 400, 200]
+    assert results[3]['body']['message'] == 'Streaming endpoints cannot be batched'
+    assert results[4]['body']['message'] == 'Batches cannot be nested'
+
+
+def test_subrequests_are_budgeted_on_their_own(client, suppliers):
+    # twenty reads in one batch, each within its own query budget
+    results = batch(client, *[{'method': 'GET', 'path': f'/api/suppliers/{suppliers[i % 6]}'} for i in range(20)])
+    assert {result['status'] for result in results} == {200}
+
+
+@pytest.mark.parametrize('body, message', [
+    ({}, 'requests must be a non-empty list'),
+    ({'requests': []}, 'requests must be a non-empty list'),
+    ({'requests': [{'path': '/api/suppliers'}] * 21}, 'A batch may contain at most 20 requests'),
+    ({'requests': ['GET /api/suppliers']}, 'each request must be an object with method and path'),
+    ({'requests': [{'method': 'TRACE', 'path': '/api/suppliers'}]}, 'method must be one of: GET, POST, PUT, PATCH, DELETE'),
+    ({'requests': [{'path': 'http://example.com/'}]}, 'path must be an absolute path, e.g. /api/suppliers/1'),
+    ({'requests': [{'path': '/api/suppliers', 'headers': ['X-A']}]}, 'headers must be an object'),
+])
+def test_malformed_batch_is_400(client, body, message):
+    response = client.post('/api/batch', json=body)
+    assert response.status_code == 400
+    assert response.get_json()['message'] == message
\ No newline at end of file
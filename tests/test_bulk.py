@@ -0,0 +1,116 @@
+import pytest
+from sqlalchemy import text
+from FlaskProjectSCD.app import db
+from FlaskProjectSCD.app.query_trace import capture_queries
+from .test_summary_consistency import assert_consistent
+
+
+@pytest.fixture
+def app(make_app):
+    return make_app(BULK_CHUNK_SIZE=3, CHANGE_FEED_ENABLED=True)
+
+
+def savepoints(log) -> int:
+    return sum(n for statement, n in log.statements.items() if statement.startswith('SAVEPOINT'))
+
+
+def outcome(response):
+    """(index, success) per item"""
+    assert response.status_code == 200
+    return [(result['index'], result['success']) for result in response.get_json()['data']]
+
+
+def stored(app):
+    """Names in the suppliers table, its FTS5 index and the change feed"""
+    with app.app_context():
+        names = db.session.execute(text('SELECT supplier_name FROM suppliers ORDER BY supplier_id')).scalars().all()
+        indexed = db.session.execute(text('SELECT supplier_name FROM suppliers_fts ORDER BY rowid')).scalars().all()
+        changed = db.session.execute(text('SELECT count(*) FROM supplier_changes')).scalar()
+        db.session.commit()
+    return names, indexed, changed
+
+
+def test_clean_chunks_write_without_fallback(app, client):
+    with capture_queries() as log:
+        response = client.post('/api/suppliers/bulk', json={'items': [{'supplier_name': f'S{i}'} for i in range(6)]})
+    assert outcome(response) == [(i, True) for i in range(6)]
+    # one savepoint per chunk of three
+    assert savepoints(log) == 2
+
+
+def test_failing_row_falls_back_to_one_savepoint_per_item(app, client):
+    items = [
+        {'supplier_name': 'A0'}, {'supplier_name': 'A1'}, {'supplier_name': 'A2'},
+        {'supplier_name': 'B0'}, {'supplier_name': 'B1', 'created_at': 'yesterday'}, {'supplier_name': 'B2'},
+        {'supplier_name': 'C0'}, {'supplier_name': {'not': 'a string'}}, {'phone': '+1'},
+    ]
+    with capture_queries() as log:
+        response = client.post('/api/suppliers/bulk', json={'items': items})
+    
+    assert outcome(response) == [(i, i not in (4, 7, 8)) for i in range(len(items))]
+    results = response.get_json()['data']
+    assert 'datetime' in results[4]['error']
+    assert 'dict' in results[7]['error']
+    assert results[8]['error'] == 'supplier_name is required'
+    assert response.get_json()['failed'] == 3
+    # A: 1; B: 1 + 3 retries; C, left with two items after the required check: 1 + 2
+    assert savepoints(log) == 8
+    
+    # rolled-back attempts leave nothing behind in the table, index or feed
+    names, indexed, changed = stored(app)
+    assert names == indexed == ['A0', 'A1', 'A2', 'B0', 'B2', 'C0']
+    assert changed == 6
+
+
+def test_bulk_update_reports_conflicts_and_missing_rows(app, client):
+    created = outcome(client.post('/api/suppliers/bulk', json={'items': [{'supplier_name': f'S{i}'} for i in range(4)]}))
+    assert all(success for _, success in created)
+    
+    response = client.patch('/api/suppliers/bulk', json={'items': [
+        {'supplier_id': 1, 'supplier_name': 'Renamed 1', 'version': 1},
+        {'supplier_id': 2, 'supplier_name': 'Renamed 2', 'version': 5},
+        {'supplier_id': 3, 'created_at': 'yesterday'},
+        {'supplier_id': 99, 'supplier_name': 'Ghost'},
+        {'supplier_name': 'No id'},
+        {'supplier_id': 4, 'supplier_name': 'Renamed 4'},
+    ]})
+    
+    assert outcome(response) == [(0, True), (1, False), (2, False), (3, False), (4, False), (5, True)]
+    errors = [result.get('error') for result in response.get_json()['data']]
+    assert errors[1] == 'Version conflict: current version is 1'
+    assert errors[3] == 'Supplier not found'
+    assert errors[4] == 'supplier_id is required'
+    
+    names, indexed, _ = stored(app)
+    assert names == indexed == ['Renamed 1', 'S1', 'S2', 'Renamed 4']
+    versions = [client.get(f'/api/suppliers/{i}').get_json()['data']['version'] for i in range(1, 5)]
+    assert versions == [2, 1, 1, 2]
+
+
+def test_bulk_update_repeating_an_id_moves_the_summary_once(app, client):
+    client.post('/api/suppliers', json={'supplier_name': 'A', 'phone': '+1', 'email': 'a@one.com', 'contact_person': 'Ann'})
+    
+    response = client.patch('/api/suppliers/bulk', json={'items': [
+        {'supplier_id': 1, 'phone': ''}, {'supplier_id': 1, 'email': 'a@two.com'}
+    ]})
+    assert outcome(response) == [(0, True), (1, True)]
+    
+    supplier = client.get('/api/suppliers/1').get_json()['data']
+    assert (supplier['phone'], supplier['email'], supplier['version']) == ('', 'a@two.com', 2)
+    assert_consistent(app)
+
+
+def test_bulk_delete_skips_missing_ids(app, client):
+    client.post('/api/suppliers/bulk', json={'items': [{'supplier_name': f'S{i}'} for i in range(4)]})
+    
+    response = client.delete('/api/suppliers/bulk', json={'ids': [2, 42, 3, 2]})
+    assert outcome(response) == [(0, True), (1, False), (2, True), (3, False)]
+    
+    names, indexed, changed = stored(app)
+    assert names == indexed == ['S0', 'S3']
+    assert changed == 4
+
+
+@pytest.mark.parametrize('body', [{}, {'items': []}, {'items': {'supplier_name': 'A'}}, {'items': [{}] * 10001}])
+def test_bulk_payload_is_validated(client, body):
+    assert client.post('/api/suppliers/bulk', json=body).status_code == 400
\ No newline at end of file
@@ -0,0 +1,124 @@
+import pytest
+from FlaskProjectSCD.app.query_trace import capture_queries
+from FlaskProjectSCD.app.repositories import cache_backends
+from FlaskProjectSCD.app.repositories.cache_backends import MemoryCacheBackend
+from FlaskProjectSCD.app.repositories.supplier_repository import SupplierRepository
+
+
+@pytest.fixture
+def app(make_app):
+    return make_app(CACHE_BACKEND='memory', RESPONSE_CACHE_BACKEND='memory')
+
+
+READS = [
+    '/api/suppliers/1',
+    '/api/async/suppliers/1',
+    '/api/suppliers?per_page=50',
+    '/api/async/suppliers?per_page=50',
+    '/api/suppliers?search=supplier&per_page=50',
+    '/api/suppliers?after=&per_page=50',
+]
+
+WRITES = {
+    'put': lambda client: client.put('/api/suppliers/1', json={'supplier_name': 'Changed supplier', 'email': 'c@example.com'}),
+    'patch': lambda client: client.patch('/api/suppliers/1', json={'supplier_name': 'Changed supplier'}),
+    'async put': lambda client: client.put('/api/async/suppliers/1', json={'supplier_name': 'Changed supplier'}),
+    'async patch': lambda client: client.patch('/api/async/suppliers/1', json={'supplier_name': 'Changed supplier'}),
+    'bulk patch': lambda client: client.patch('/api/suppliers/bulk', json={'items': [{'supplier_id': 1, 'supplier_name': 'Changed supplier'}]}),
+    'import': lambda client: client.post('/api/suppliers/import?key=email', data=b'{"supplier_name": "Changed supplier", "email": "s0@example.com"}\n'),
+}
+
+
+def names(response):
+    data = response.get_json()['data']
+    return [supplier['supplier_name'] for supplier in (data if isinstance(data, list) else [data])]
+
+
+def test_repeat_reads_come_from_the_cache(client, suppliers):
+    for path in READS:
+        client.get(path)
+    # only the version or count/MAX(updated_at) check behind the ETag is left
+    for path in READS:
+        with capture_queries() as log:
+            assert client.get(path).status_code == 200
+        assert log.count == 1, path
+
+
+@pytest.mark.parametrize('write', WRITES.values(), ids=WRITES.keys())
+def test_writes_invalidate_every_cached_read(client, suppliers, write):
+    for path in READS:
+        assert 'Supplier 0' in names(client.get(path))
+    
+    response = write(client)
+    assert response.status_code == 200
+    assert response.get_json()['success']
+    
+    for path in READS:
+        found = names(client.get(path))
+        assert 'Changed supplier' in found and 'Supplier 0' not in found, path
+
+
+@pytest.mark.parametrize('prefix', ['/api/suppliers', '/api/async/suppliers'])
+def test_deletes_invalidate_every_cached_read(client, suppliers, prefix):
+    for path in READS:
+        client.get(path)
+    
+    assert client.delete(f'{prefix}/1').status_code == 200
+    
+    assert client.get('/api/suppliers/1').status_code == 404
+    assert client.get('/api/async/suppliers/1').status_code == 404
+    for path in READS[2:]:
+        assert 'Supplier 0' not in names(client.get(path)), path
+
+
+def test_row_cached_by_a_racing_reader_is_not_served(app, client, suppliers):
+    repository = SupplierRepository()
+    with app.app_context():
+        version_key, data_key = repository._entity_keys(1)
+        repository.get_by_id(1)
+        cache = repository.cache
+        stale_version, stale_row = cache.get(data_key)
+        list_key = repository._list_cache_key(cache, 'all', {'page': 1})
+    
+    client.patch('/api/suppliers/1', json={'supplier_name': 'Changed supplier'})
+    
+    with app.app_context():
+        # a reader that loaded before the write stores its row afterwards
+        cache.set(data_key, (stale_version, stale_row))
+        assert cache.get(version_key) != stale_version
+        assert repository.get_by_id(1).supplier_name == 'Changed supplier'
+        # list pages cached under the old version are unreachable
+        assert repository._list_cache_key(cache, 'all', {'page': 1}) != list_key
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+    
+    def monotonic(self):
+        return self.now
+
+
+def test_memory_backend_expires_and_evicts(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(cache_backends, 'time', clock)
+    cache = MemoryCacheBackend(max_entries=2, default_ttl=10)
+    
+    cache.set('a', 1)
+    cache.set('b', 2, ttl=100)
+    assert cache.add('a', 'ignored') is False
+    assert cache.get_many(['a', 'b', 'c']) == [1, 2, None]
+    
+    clock.now += 10
+    assert cache.get('a') is None
+    assert cache.add('a', 3) is True
+    
+    # least recently used goes first
+    cache.get('a')
+    cache.set('c', 4)
+    assert cache.get_many(['a', 'b', 'c']) == [3, None, 4]
+    
+    cache.delete('a', 'missing')
+    assert cache.get('a') is None
+    cache.clear()
+    assert cache.get('c') is None
\ No newline at end of file
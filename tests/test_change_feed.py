@@ -0,0 +1,141 @@
+import pytest
+from datetime import datetime
+from sqlalchemy import delete, event, insert, select
+from FlaskProjectSCD.app import db
+from FlaskProjectSCD.app.models.change_sequence import ChangeSequence
+from FlaskProjectSCD.app.repositories.change_feed import ChangeFeed
+from FlaskProjectSCD.app.repositories.supplier_repository import SupplierRepository
+
+
+@pytest.fixture
+def app(make_app):
+    return make_app(CHANGE_FEED_ENABLED=True)
+
+
+def changes(client, since, limit=100):
+    response = client.get(f'/api/suppliers/changes?since={since}&limit={limit}')
+    assert response.status_code == 200
+    return response.get_json()['data']
+
+
+def test_disabled_by_default(make_app):
+    client = make_app().test_client()
+    assert client.get('/api/suppliers/changes').status_code == 404
+
+
+def test_compact_keeps_last_operation_in_write_order():
+    entries = [(1, 'upsert'), (2, 'upsert'), (1, 'delete'), (3, 'upsert')]
+    assert list(ChangeFeed.compact(entries).items()) == [(2, 'upsert'), (1, 'delete'), (3, 'upsert')]
+
+
+def test_tombstone_replaces_earlier_entry(client, suppliers):
+    token = client.get('/api/suppliers/changes').get_json()['data']['next_token']
+    assert token == len(suppliers)
+    
+    client.put(f'/api/suppliers/{suppliers[0]}', json={'supplier_name': 'Renamed', 'email': 'r@example.com'})
+    assert client.delete(f'/api/suppliers/{suppliers[0]}').status_code == 200
+    
+    # one entry per supplier, at its latest write
+    data = changes(client, 0)
+    assert [item['supplier_id'] for item in data['items']] == suppliers[1:] + suppliers[:1]
+    tombstone = data['items'][-1]
+    assert tombstone['operation'] == 'delete' and tombstone['supplier'] is None
+    assert tombstone['seq'] == data['next_token'] == len(suppliers) + 2
+    
+    assert changes(client, token)['items'] == [tombstone]
+
+
+def test_record_compacts_duplicate_ids(app, suppliers):
+    with app.app_context():
+        feed = SupplierRepository().change_feed
+        feed.record([(suppliers[0], 'upsert'), (suppliers[1], 'upsert'), (suppliers[0], 'delete')], datetime.utcnow())
+        db.session.commit()
+        
+        entries = feed.read(len(suppliers), 10)
+        assert [(entry.supplier_id, entry.operation) for entry in entries] == [
+            (suppliers[1], 'upsert'), (suppliers[0], 'delete')
+        ]
+        assert feed.latest() == len(suppliers) + 2
+
+
+def test_since_pages_through_the_feed(client, suppliers):
+    seen, token = [], 0
+    while True:
+        data = changes(client, token, limit=4)
+        seen += [item['supplier_id'] for item in data['items']]
+        token = data['next_token']
+        if not data['has_more']:
+            break
+    assert seen == suppliers
+    assert changes(client, token)['items'] == []
+
+
+def test_counter_created_on_first_write(app, client, suppliers):
+    # creating the counter is a one-off the write budgets leave out
+    app.config['SQL_QUERY_BUDGET_STRICT'] = False
+    with app.app_context():
+        db.session.execute(delete(ChangeSequence))
+        db.session.commit()
+        SupplierRepository().change_feed.sequence_ready = False
+    
+    # numbering carries on after the entries already in the feed
+    response = client.post('/api/suppliers', json={'supplier_name': 'Late', 'email': 'late@example.com'})
+    assert response.status_code == 201
+    assert changes(client, len(suppliers))['items'][0]['seq'] == len(suppliers) + 1
+
+
+def test_concurrent_first_writer_creates_counter(app):
+    with app.app_context():
+        db.session.execute(delete(ChangeSequence))
+        db.session.commit()
+        feed = SupplierRepository().change_feed
+        engine = db.engine
+        raced = []
+        
+        # another worker creates the counter between the check and the insert
+        @event.listens_for(engine, 'before_cursor_execute')
+        def create_first(conn, cursor, statement, parameters, context, executemany):
+            if statement.startswith('INSERT INTO change_sequences') and not raced:
+                raced.append(True)
+                with engine.begin() as other:
+                    other.execute(insert(ChangeSequence).values(name=feed.sequence_name, value=7))
+        
+        try:
+            with engine.begin() as connection:
+                feed.ensure_sequence(connection)
+        finally:
+            event.remove(engine, 'before_cursor_execute', create_first)
+        
+        assert raced
+        assert db.session.execute(select(ChangeSequence.value)).scalar() == 7
+
+
+def test_missing_counter_fails_write_then_recovers(app, client, suppliers):
+    # creating the counter is a one-off the write budgets leave out
+    app.config['SQL_QUERY_BUDGET_STRICT'] = False
+    with app.app_context():
+        db.session.execute(delete(ChangeSequence))
+        db.session.commit()
+    
+    response = client.put(f'/api/suppliers/{suppliers[0]}', json={'supplier_name': 'Renamed', 'email': 'r@example.com'})
+    assert response.status_code == 500
+    
+    response = client.put(f'/api/suppliers/{suppliers[0]}', json={'supplier_name': 'Renamed', 'email': 'r@example.com'})
+    assert response.status_code == 200
+    assert changes(client, len(suppliers))['items'][0]['supplier_id'] == suppliers[0]
+
+def test_async_writes_create_counter_and_record(app, client, suppliers):
+    app.config['SQL_QUERY_BUDGET_STRICT'] = False
+    with app.app_context():
+        db.session.execute(delete(ChangeSequence))
+        db.session.commit()
+        SupplierRepository().change_feed.sequence_ready = False
+    
+    response = client.put(f'/api/async/suppliers/{suppliers[2]}', json={'supplier_name': 'Renamed', 'email': 'r@example.com'})
+    assert response.status_code == 200
+    assert client.delete(f'/api/async/suppliers/{suppliers[3]}').status_code == 200
+    
+    items = changes(client, len(suppliers))['items']
+    assert [(item['seq'], item['supplier_id'], item['operation']) for item in items] == [
+        (len(suppliers) + 1, suppliers[2], 'upsert'), (len(suppliers) + 2, suppliers[3], 'delete')
+    ]
\ No newline at end of file
@@ -0,0 +1,73 @@
+import threading
+import pytest
+
+
+def fetch(client, prefix, supplier_id):
+    response = client.get(f'{prefix}/{supplier_id}')
+    assert response.status_code == 200
+    return response.headers['ETag'], response.get_json()['data']
+
+
+@pytest.mark.parametrize('prefix', ['/api/suppliers', '/api/async/suppliers'])
+def test_stale_if_match_is_412(client, suppliers, prefix):
+    etag, _ = fetch(client, prefix, suppliers[0])
+    response = client.patch(f'{prefix}/{suppliers[0]}', json={'phone': '+1'}, headers={'If-Match': etag})
+    assert response.status_code == 200
+    assert response.headers['ETag'] != etag
+    
+    response = client.patch(f'{prefix}/{suppliers[0]}', json={'phone': '+2'}, headers={'If-Match': etag})
+    assert response.status_code == 412
+    assert response.get_json()['errors'] == {'current_version': 2}
+    
+    response = client.delete(f'{prefix}/{suppliers[0]}', headers={'If-Match': etag})
+    assert response.status_code == 412
+    assert fetch(client, prefix, suppliers[0])[1]['phone'] == '+1'
+
+
+@pytest.mark.parametrize('prefix', ['/api/suppliers', '/api/async/suppliers'])
+def test_stale_version_is_409(client, suppliers, prefix):
+    response = client.patch(f'{prefix}/{suppliers[0]}', json={'phone': '+1', 'version': 1})
+    assert response.status_code == 200
+    
+    response = client.patch(f'{prefix}/{suppliers[0]}', json={'phone': '+2', 'version': 1})
+    assert response.status_code == 409
+    assert response.get_json()['errors'] == {'current_version': 2}
+    
+    assert client.delete(f'{prefix}/{suppliers[0]}?version=1').status_code == 409
+    assert client.delete(f'{prefix}/{suppliers[0]}?version=2').status_code == 200
+    assert client.get(f'{prefix}/{suppliers[0]}').status_code == 404
+
+
+def test_lost_update_is_rejected(client, suppliers):
+    # two clients edit the same version; the second must not overwrite the first
+    etag, _ = fetch(client, '/api/suppliers', suppliers[0])
+    first = client.patch(f'/api/suppliers/{suppliers[0]}', json={'phone': '+1'}, headers={'If-Match': etag})
+    second = client.put(
+        f'/api/suppliers/{suppliers[0]}', json={'supplier_name': 'Other', 'email': 'o@example.com'},
+        headers={'If-Match': etag}
+    )
+    assert (first.status_code, second.status_code) == (200, 412)
+    
+    _, data = fetch(client, '/api/suppliers', suppliers[0])
+    assert (data['phone'], data['supplier_name'], data['version']) == ('+1', 'Supplier 0', 2)
+
+
+def test_concurrent_writers_one_wins(app, suppliers):
+    etag, _ = fetch(app.test_client(), '/api/suppliers', suppliers[0])
+    start = threading.Barrier(4)
+    statuses = []
+    
+    def write(phone):
+        client = app.test_client()
+        start.wait()
+        response = client.patch(f'/api/suppliers/{suppliers[0]}', json={'phone': phone}, headers={'If-Match': etag})
+        statuses.append(response.status_code)
+    
+    threads = [threading.Thread(target=write, args=(f'+{i}',)) for i in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    
+    assert sorted(statuses) == [200, 412, 412, 412]
+    assert fetch(app.test_client(), '/api/suppliers', suppliers[0])[1]['version'] == 2
\ No newline at end of file
@@ -0,0 +1,110 @@
+import base64
+import json
+from datetime import datetime
+import pytest
+from FlaskProjectSCD.app.utils.cursor import InvalidCursorError, decode_cursor, encode_cursor
+
+PREFIXES = ['/api/suppliers', '/api/async/suppliers']
+
+
+def raw_cursor(payload) -> str:
+    return base64.urlsafe_b64encode(json.dumps(payload).encode()).decode().rstrip('=')
+
+
+def walk(client, prefix, sort, per_page=2, on_page=None):
+    """Ids of every page followed through next_cursor"""
+    ids, cursor = [], ''
+    while True:
+        response = client.get(prefix, query_string={'after': cursor, 'sort': sort, 'per_page': per_page})
+        assert response.status_code == 200
+        body = response.get_json()
+        ids += [supplier['supplier_id'] for supplier in body['data']]
+        cursor = body['pagination']['next_cursor']
+        assert body['pagination']['has_next'] == (cursor is not None)
+        if cursor is None:
+            return ids
+        if on_page is not None:
+            on_page()
+
+
+@pytest.fixture
+def named(client):
+    """Suppliers with repeated names, so the id breaks ties"""
+    ids = []
+    for name in ['Beta', 'Alpha', 'Beta', 'Gamma', 'Alpha', 'Beta', 'Alpha']:
+        response = client.post('/api/suppliers', json={'supplier_name': name})
+        ids.append((name, response.get_json()['data']['supplier_id']))
+    return ids
+
+
+def test_encode_decode_round_trip():
+    created = datetime(2024, 5, 6, 7, 8, 9, 123456)
+    assert decode_cursor(encode_cursor('created_at', created, 42), 'created_at') == (created, 42)
+    assert decode_cursor(encode_cursor('supplier_name', 'Ünïcode "quoted"', 7), 'supplier_name') == ('Ünïcode "quoted"', 7)
+    assert decode_cursor('', 'supplier_id') is None
+    assert '=' not in encode_cursor('supplier_id', 1, 1)
+
+
+@pytest.mark.parametrize('prefix', PREFIXES)
+@pytest.mark.parametrize('sort', ['supplier_id', 'supplier_name', 'created_at'])
+def test_pages_cover_every_row_once(client, named, prefix, sort):
+    if sort == 'supplier_name':
+        expected = [supplier_id for _, supplier_id in sorted(named)]
+    else:
+        expected = sorted(supplier_id for _, supplier_id in named)
+    for per_page in (1, 2, 3, 7, 50):
+        assert walk(client, prefix, sort, per_page) == expected
+
+
+@pytest.mark.parametrize('prefix', PREFIXES)
+def test_writes_between_pages_do_not_skip_or_repeat(client, named, prefix):
+    ids = [supplier_id for _, supplier_id in named]
+    added = []
+    
+    def write():
+        # delete a row already returned and add one after the cursor
+        if not added:
+            assert client.delete(f'/api/suppliers/{ids[0]}').status_code == 200
+            response = client.post('/api/suppliers', json={'supplier_name': 'Zulu'})
+            added.append(response.get_json()['data']['supplier_id'])
+    
+    assert walk(client, prefix, 'supplier_id', 3, on_page=write) == ids + added
+
+
+@pytest.mark.parametrize('prefix', PREFIXES)
+@pytest.mark.parametrize('cursor, sort', [
+    ('not a cursor!', 'supplier_id'),
+    ('é', 'supplier_id'),
+    (base64.urlsafe_b64encode(b'{"s":').decode(), 'supplier_id'),
+    (raw_cursor([1, 2]), 'supplier_id'),
+    (raw_cursor({'s': 'supplier_id', 'v': 1}), 'supplier_id'),
+    (raw_cursor({'s': 'supplier_id', 'v': 1, 'id': 'x'}), 'supplier_id'),
+    (raw_cursor({'s': 'supplier_id', 'v': 1, 'id': [1]}), 'supplier_id'),
+    (raw_cursor({'s': 'supplier_id', 'v': 1, 'id': 10 ** 30}), 'supplier_id'),
+    (raw_cursor({'s': 'supplier_id', 'v': 1, 'id': -1}), 'supplier_id'),
+    (raw_cursor({'s': 'supplier_name', 'v': ['Alpha'], 'id': 1}), 'supplier_name'),
+    (raw_cursor({'s': 'supplier_name', 'v': None, 'id': 1}), 'supplier_name'),
+    (raw_cursor({'s': 'supplier_name', 'v': True, 'id': 1}), 'supplier_name'),
+    (raw_cursor({'s': 'supplier_name', 'v': {'x': 1}, 'id': 1}), 'supplier_name'),
+    (raw_cursor({'s': 'supplier_name', 'v': 10 ** 30, 'id': 1}), 'supplier_name'),
+    (raw_cursor({'s': 'created_at', 'v': {'dt': 'yesterday'}, 'id': 1}), 'created_at'),
+    (raw_cursor({'s': 'created_at', 'v': {'dt': 5}, 'id': 1}), 'created_at'),
+])
+def test_tampered_cursor_is_400(client, named, prefix, cursor, sort):
+    response = client.get(prefix, query_string={'after': cursor, 'sort': sort})
+    assert response.status_code == 400
+    assert response.get_json()['message'] == 'Invalid pagination cursor'
+
+
+@pytest.mark.parametrize('prefix', PREFIXES)
+def test_cursor_is_bound_to_its_sort(client, named, prefix):
+    cursor = client.get(prefix, query_string={'after': '', 'sort': 'supplier_name', 'per_page': 2}).get_json()['pagination']['next_cursor']
+    response = client.get(prefix, query_string={'after': cursor, 'sort': 'created_at'})
+    assert response.status_code == 400
+    assert "issued for sort 'supplier_name'" in response.get_json()['message']
+    
+    response = client.get(prefix, query_string={'after': '', 'sort': 'phone'})
+    assert response.status_code == 400
+    
+    with pytest.raises(InvalidCursorError):
+        decode_cursor(cursor, 'supplier_id')
\ No newline at end of file
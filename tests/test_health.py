@@ -0,0 +1,33 @@
+import logging
+import shutil
+from FlaskProjectSCD.app.db_routing import replica_engines
+
+
+def test_ready_reports_the_database_and_pool(client):
+    response = client.get('/health/ready')
+    assert response.status_code == 200
+    report = response.get_json()['data']
+    assert report['database']['status'] == 'up'
+    assert 'pool' in report
+
+
+def test_unreachable_replica_is_503_without_driver_details(make_app, tmp_path, caplog):
+    replica = tmp_path / 'replica-dir'
+    replica.mkdir()
+    app = make_app(DATABASE_REPLICA_URLS=f"sqlite:///{replica / 'replica.db'}")
+    # the replica goes away after startup
+    shutil.rmtree(replica)
+    for engine in replica_engines(app).values():
+        engine.dispose()
+    client = app.test_client()
+    
+    with caplog.at_level(logging.ERROR):
+        response = client.get('/health/ready')
+    
+    assert response.status_code == 503
+    body = response.get_json()
+    assert body['message'] == 'Read replica unavailable'
+    assert [replica['error'] for replica in body['errors']['replicas'].values()] == ['unreachable']
+    assert 'replica-dir' not in response.get_data(as_text=True)
+    # the cause is logged instead
+    assert 'unable to open database file' in caplog.text
\ No newline at end of file
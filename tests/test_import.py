@@ -0,0 +1,106 @@
+import io
+import pytest
+from .test_summary_consistency import assert_consistent
+
+
+@pytest.fixture
+def app(make_app):
+    return make_app(BULK_CHUNK_SIZE=2)
+
+
+def upload(client, body, **params):
+    response = client.post('/api/suppliers/import', query_string=params, data=body)
+    report = response.get_json().get('data')
+    return response.status_code, report
+
+
+def rows(client):
+    suppliers = client.get('/api/suppliers?per_page=100').get_json()['data']
+    return [(s['supplier_name'], s['email'], s['phone'], s['version']) for s in suppliers]
+
+
+def test_ndjson_rejects_bad_lines_and_keeps_the_rest(app, client):
+    body = b'\n'.join([
+        b'{"supplier_name": "A", "email": "a@example.com"}',
+        b'not json',
+        b'[1, 2]',
+        b'',
+        b'{"email": "nameless@example.com"}',
+        b'{"supplier_name": "B", "email": "b@example.com", "foo": 1}',
+        b'{"supplier_name": "A2", "email": "a@example.com", "supplier_id": 99, "version": 7}',
+        b'{"supplier_name": "C", "phone": "+3"}',
+    ])
+    status, report = upload(client, body)
+    
+    assert status == 200
+    assert (report['processed'], report['created'], report['updated'], report['rejected']) == (7, 2, 1, 4)
+    assert [(error['row'], error['error'].split(':')[0]) for error in report['errors']] == [
+        (2, 'Invalid JSON'), (3, 'Row must be a JSON object'), (5, 'supplier_name is required'),
+        (6, "Unknown field 'foo'")
+    ]
+    # the file never sets ids or versions; a repeated key updates the same supplier
+    assert rows(client) == [('A2', 'a@example.com', None, 2), ('C', None, '+3', 1)]
+    assert_consistent(app)
+
+
+def test_csv_rejects_bad_records(app, client):
+    body = '﻿supplier_name,email,phone\n' \
+           'A,a@example.com,+1\n' \
+           'B,b@example.com,+2,extra\n' \
+           ',c@example.com,\n' \
+           'D,,\n' \
+           '"E, Ltd",e@example.com,+5\n'
+    status, report = upload(client, body.encode(), format='csv')
+    
+    assert status == 200
+    assert report['errors'] == [
+        {'row': 3, 'error': 'Row has more fields than the header'},
+        {'row': 4, 'error': 'supplier_name is required'},
+    ]
+    # the BOM is not part of the first header, and empty cells are NULL
+    assert rows(client) == [('A', 'a@example.com', '+1', 1), ('D', None, None, 1), ('E, Ltd', 'e@example.com', '+5', 1)]
+
+
+def test_repeated_key_within_a_chunk_updates_the_new_row(app, client):
+    body = b'supplier_name,email,phone\nM,m@example.com,+1\nM2,m@example.com,\nN,n@example.com,+2\nN2,n@example.com,+3\n'
+    status, report = upload(client, {'file': (io.BytesIO(body), 'suppliers.csv')}, format='csv')
+    
+    assert status == 200
+    assert (report['created'], report['updated'], report['rejected']) == (2, 2, 0)
+    assert rows(client) == [('M2', 'm@example.com', None, 1), ('N2', 'n@example.com', '+3', 1)]
+    assert_consistent(app)
+    
+    # and again against the stored rows, twice in one chunk
+    body = b'supplier_name,email,phone\nM3,m@example.com,+4\nM4,m@example.com,\n'
+    status, report = upload(client, body, format='csv')
+    assert (report['created'], report['updated']) == (0, 2)
+    assert rows(client)[0] == ('M4', 'm@example.com', None, 2)
+    assert_consistent(app)
+
+
+def test_invalid_utf8_keeps_earlier_batches(make_app):
+    client = make_app(BULK_CHUNK_SIZE=100).test_client()
+    # more than one read buffer, so some batches are written before the bad byte
+    good = b''.join(b'{"supplier_name": "S%d"}\n' % i for i in range(3000))
+    status, report = upload(client, good + b'{"supplier_name": "\xff"}\n{"supplier_name": "After"}\n')
+    
+    assert status == 200
+    assert report['created'] == report['processed'] > 0
+    assert report['errors'][-1]['row'] is None
+    assert f"after line {report['processed']}" in report['errors'][-1]['error']
+    assert 'After' not in [name for name, *_ in rows(client)]
+
+
+def test_errors_are_capped(make_app):
+    client = make_app(IMPORT_MAX_ERRORS=3).test_client()
+    status, report = upload(client, b'x\n' * 10 + b'{"supplier_name": "Kept"}\n')
+    
+    assert status == 200
+    assert (report['rejected'], len(report['errors']), report['errors_truncated']) == (10, 3, True)
+    assert report['created'] == 1
+
+
+@pytest.mark.parametrize('params', [{'format': 'xml'}, {'key': 'phone'}])
+def test_bad_parameters_are_400(client, params):
+    status, _ = upload(client, b'{"supplier_name": "A"}\n', **params)
+    assert status == 400
\ No newline at end of file
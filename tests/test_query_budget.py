@@ -0,0 +1,111 @@
+import logging
+import pytest
+from sqlalchemy import select
+from FlaskProjectSCD.app import db
+from FlaskProjectSCD.app.models.supplier import Supplier
+from FlaskProjectSCD.app.query_trace import QueryBudgetExceeded, assert_max_queries, query_budget
+
+
+@pytest.mark.parametrize('prefix', ['/api/suppliers', '/api/async/suppliers'])
+def test_list(client, suppliers, prefix):
+    # count and fingerprint, one page, and the cursor of the next page
+    with assert_max_queries(3):
+        response = client.get(f'{prefix}?per_page=4')
+    assert response.status_code == 200
+    assert response.get_json()['pagination']['total'] == len(suppliers)
+
+
+@pytest.mark.parametrize('prefix', ['/api/suppliers', '/api/async/suppliers'])
+def test_get(client, suppliers, prefix):
+    # version check for the ETag, then the row
+    with assert_max_queries(2):
+        response = client.get(f'{prefix}/{suppliers[0]}')
+    assert response.status_code == 200
+    
+    with assert_max_queries(1):
+        response = client.get(f'{prefix}/{suppliers[0]}', headers={'If-None-Match': response.headers['ETag']})
+    assert response.status_code == 304
+
+
+@pytest.mark.parametrize('prefix', ['/api/suppliers', '/api/async/suppliers'])
+def test_update(client, suppliers, prefix):
+    # row, conditional UPDATE, FTS5 sync, summary
+    with assert_max_queries(4):
+        response = client.put(f'{prefix}/{suppliers[0]}', json={'supplier_name': 'Renamed', 'email': 'r@example.com'})
+    assert response.status_code == 200
+    assert response.get_json()['data']['version'] == 2
+
+
+@pytest.mark.parametrize('prefix', ['/api/suppliers', '/api/async/suppliers'])
+def test_delete(client, suppliers, prefix):
+    # DELETE ... RETURNING, FTS5 sync, summary
+    with assert_max_queries(3):
+        response = client.delete(f'{prefix}/{suppliers[0]}')
+    assert response.status_code == 200
+    assert client.get(f'/api/suppliers/{suppliers[0]}').status_code == 404
+
+
+@pytest.mark.parametrize('prefix', ['/api/suppliers', '/api/async/suppliers'])
+def test_patch(client, suppliers, prefix):
+    # UPDATE ... RETURNING and the FTS5 sync, no read before the write
+    with assert_max_queries(2):
+        response = client.patch(f'{prefix}/{suppliers[0]}', json={'supplier_name': 'Renamed'})
+    assert response.status_code == 200
+    
+    # a field the stats count by locks and reads the row, then moves the summary
+    with assert_max_queries(4):
+        response = client.patch(f'{prefix}/{suppliers[0]}', json={'phone': '+123'})
+    assert response.status_code == 200
+    assert response.get_json()['data']['version'] == 3
+
+
+@pytest.mark.parametrize('prefix', ['/api/suppliers', '/api/async/suppliers'])
+def test_change_feed_adds_two_statements(make_app, prefix):
+    client = make_app(CHANGE_FEED_ENABLED=True).test_client()
+    supplier_id = client.post('/api/suppliers', json={'supplier_name': 'Acme'}).get_json()['data']['supplier_id']
+    
+    # counter bump with RETURNING and the change upsert
+    with assert_max_queries(4):
+        response = client.patch(f'{prefix}/{supplier_id}', json={'supplier_name': 'Renamed'})
+    assert response.status_code == 200
+    
+    with assert_max_queries(5):
+        response = client.delete(f'{prefix}/{supplier_id}')
+    assert response.status_code == 200
+
+
+def test_assert_max_queries_fails_over_budget(client, suppliers):
+    with pytest.raises(AssertionError, match='Expected at most 1 queries, 3 ran'):
+        with assert_max_queries(1):
+            client.get('/api/suppliers')
+
+
+@query_budget(2)
+def supplier_names():
+    # Deliberate N+1: one lookup per supplier instead of one query
+    ids = db.session.scalars(select(Supplier.supplier_id)).all()
+    return {'names': [
+        db.session.scalar(select(Supplier.supplier_name).where(Supplier.supplier_id == supplier_id))
+        for supplier_id in ids
+    ]}
+
+
+@pytest.fixture
+def n_plus_one_route(app):
+    # Routes must be added before the app handles its first request
+    app.add_url_rule('/test/supplier-names', view_func=supplier_names)
+
+
+def test_n_plus_one_is_detected_and_over_budget(app, n_plus_one_route, client, suppliers, caplog):
+    with caplog.at_level(logging.WARNING, logger=app.logger.name):
+        with pytest.raises(QueryBudgetExceeded, match='ran 7 queries, budget is 2'):
+            client.get('/test/supplier-names')
+    assert any('Possible N+1 on GET /test/supplier-names' in message and 'ran 6 times' in message
+               for message in caplog.messages)
+    
+    # Logged, not raised, when the budget is not strict
+    app.config['SQL_QUERY_BUDGET_STRICT'] = False
+    with caplog.at_level(logging.WARNING, logger=app.logger.name):
+        response = client.get('/test/supplier-names')
+    assert response.status_code == 200
+    assert 'GET /test/supplier-names ran 7 queries, budget is 2' in caplog.messages
\ No newline at end of file
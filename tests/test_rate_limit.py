@@ -0,0 +1,119 @@
+import pytest
+from FlaskProjectSCD.app.middleware.rate_limit import Limit, RateLimiter, parse_limits
+from FlaskProjectSCD.app.middleware.rate_limit_backends import MemoryRateLimitBackend
+from FlaskProjectSCD.app.services.auth_service import AuthService, FakeTokenVerifier
+
+
+def limiter(limits: str) -> RateLimiter:
+    return RateLimiter({'RATE_LIMITS': limits, 'RATE_LIMIT_BACKEND': 'memory', 'RATE_LIMIT_API_KEYS': ''})
+
+
+def test_parse_limits():
+    limits = parse_limits('default=600/minute, search=10/second')
+    assert (limits['default'].capacity, limits['default'].rate) == (600, 10)
+    assert limits['search'].period == 1
+    for spec in ('10', '10/fortnight', '0/minute', 'x/minute'):
+        with pytest.raises(ValueError):
+            Limit(spec)
+
+
+def test_memory_backend_takes_from_all_buckets_or_none():
+    backend = MemoryRateLimitBackend()
+    buckets = [('narrow', 5, 5 / 60), ('wide', 1, 1 / 60)]
+    
+    allowed, states = backend.consume(buckets)
+    assert allowed
+    assert [round(tokens) for tokens, _ in states] == [4, 0]
+    
+    # Refused by 'wide'; 'narrow' keeps its tokens
+    allowed, states = backend.consume(buckets)
+    assert not allowed
+    assert round(states[0][0]) == 4 and states[0][1] == 0
+    assert states[1][1] == pytest.approx(60, abs=0.1)
+    allowed, states = backend.consume(buckets[:1])
+    assert allowed and round(states[0][0]) == 3
+
+
+def test_refused_request_does_not_drain_narrower_buckets():
+    rate_limiter = limiter('default=2/minute,search=5/minute')
+    for _ in range(2):
+        assert rate_limiter.check('ip:1', ['search', 'default'])[0]
+    
+    allowed, limit, _, wait = rate_limiter.check('ip:1', ['search', 'default'])
+    assert not allowed
+    assert limit.spec == '2/minute'
+    assert wait == pytest.approx(30, abs=0.1)
+    
+    allowed, limit, remaining, _ = rate_limiter.check('ip:1', ['search'])
+    assert allowed and round(remaining) == 2
+
+
+def test_requests_over_the_limit_get_429_with_retry_after(make_app):
+    app = make_app(RATE_LIMIT_ENABLED=True, RATE_LIMITS='default=2/minute')
+    client = app.test_client()
+    
+    response = client.get('/api/suppliers')
+    assert response.status_code == 200
+    assert response.headers['RateLimit-Limit'] == '2'
+    assert response.headers['RateLimit-Remaining'] == '1'
+    assert client.get('/api/suppliers').status_code == 200
+    
+    response = client.get('/api/suppliers')
+    assert response.status_code == 429
+    assert response.headers['Retry-After'] == '30'
+    
+    # Clients have buckets of their own, and health checks are exempt
+    assert client.get('/api/suppliers', environ_base={'REMOTE_ADDR': '10.0.0.2'}).status_code == 200
+    assert client.get('/health').status_code == 200
+
+
+def test_trusted_proxy_address_and_unverified_tokens(make_app):
+    app = make_app(RATE_LIMIT_ENABLED=True, RATE_LIMITS='default=1/minute', RATE_LIMIT_TRUSTED_PROXIES=1)
+    client = app.test_client()
+    with app.app_context():
+        service = AuthService.get_instance()
+    calls = []
+    verify = service.verifier.verify
+    service.verifier.verify = lambda token: calls.append(token) or verify(token)
+    
+    def get(forwarded_for, token):
+        headers = {'X-Forwarded-For': forwarded_for, 'Authorization': f'Bearer {token}'}
+        return client.get('/api/suppliers', headers=headers).status_code
+    
+    # Forged tokens are never verified by the limiter and count against the client address
+    assert [get('203.0.113.1', f'forged-{i}') for i in range(2)] == [200, 429]
+    assert get('203.0.113.2', 'forged') == 200
+    assert calls == []
+    
+    # A token verified earlier counts against its user, wherever it comes from
+    token = FakeTokenVerifier.issue('uid-1')
+    with app.app_context():
+        service.verify_token(token)
+    assert [get('203.0.113.1', token), get('203.0.113.3', token)] == [200, 429]
+
+
+def test_load_shedding_refuses_with_503_and_retry_after(make_app):
+    app = make_app(LOAD_SHED_MAX_IN_FLIGHT=1, LOAD_SHED_RETRY_AFTER=2)
+    client = app.test_client()
+    shedder = app.extensions['load_shedder']
+    
+    # Another request holds the only slot
+    assert shedder.admit() is None
+    response = client.get('/api/suppliers')
+    assert response.status_code == 503
+    assert response.headers['Retry-After'] == '2'
+    assert client.get('/health').status_code == 200
+    
+    shedder.release()
+    assert client.get('/api/suppliers').status_code == 200
+    assert shedder.in_flight == 0
+
+
+def test_load_shedding_on_pool_waiters(make_app, monkeypatch):
+    app = make_app(LOAD_SHED_MAX_POOL_WAITERS=2)
+    shedder = app.extensions['load_shedder']
+    monkeypatch.setattr(shedder, 'pool_waiters', lambda: 2)
+    assert app.test_client().get('/api/suppliers').status_code == 503
+    
+    monkeypatch.setattr(shedder, 'pool_waiters', lambda: 1)
+    assert app.test_client().get('/api/suppliers').status_code == 200
\ No newline at end of file
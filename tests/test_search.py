@@ -0,0 +1,83 @@
+import pytest
+from sqlalchemy import select
+from sqlalchemy.dialects import mysql
+from FlaskProjectSCD.app.models.supplier import Supplier
+from FlaskProjectSCD.app.repositories.search_backends import MySQLFullTextSearchBackend
+
+SUPPLIERS = [
+    ('Acme Supply Co', 'José Núñez'),
+    ('The Acme Corp', 'Bob Stone'),
+    ('Zeta Parts', 'Ann Acker'),
+    ('Under_score 100% Ltd', None),
+]
+
+
+def searcher(client):
+    """Create SUPPLIERS and return a function listing the names a search finds"""
+    for name, contact in SUPPLIERS:
+        assert client.post('/api/suppliers', json={'supplier_name': name, 'contact_person': contact}).status_code == 201
+    
+    def names(term):
+        response = client.get('/api/suppliers', query_string={'search': term, 'per_page': 50})
+        assert response.status_code == 200
+        return sorted(supplier['supplier_name'] for supplier in response.get_json()['data'])
+    return names
+
+
+@pytest.fixture
+def search(client):
+    return searcher(client)
+
+
+def test_fts5_matches_every_word_as_prefix(search):
+    assert search('acme') == ['Acme Supply Co', 'The Acme Corp']
+    assert search('ACM sup') == ['Acme Supply Co']
+    assert search('ack') == ['Zeta Parts']
+    assert search('nunez') == ['Acme Supply Co']
+    assert search('acme zeta') == []
+
+
+@pytest.mark.parametrize('term', ['acme" OR "zeta', 'acme OR zeta', 'NEAR(acme zeta)', 'zeta -acme', 'acme*zeta', "'; DROP TABLE suppliers; --"])
+def test_fts5_query_syntax_in_input_is_literal(search, term):
+    # every word stays a required prefix, so none of these widen the match
+    assert search(term) == []
+    assert len(search('')) == len(SUPPLIERS)
+
+
+def test_fts5_without_words_falls_back_to_substring(search):
+    assert search('%') == ['Under_score 100% Ltd']
+    assert search('100%') == ['Under_score 100% Ltd']
+    assert search('"*') == []
+
+
+def test_like_matches_substrings_literally(make_app):
+    names = searcher(make_app(SEARCH_BACKEND='like').test_client())
+    
+    assert names('CME') == ['Acme Supply Co', 'The Acme Corp']
+    assert names('y co') == ['Acme Supply Co']
+    # LIKE wildcards and quotes in the input match only themselves
+    assert names('0%') == ['Under_score 100% Ltd']
+    assert names('%') == ['Under_score 100% Ltd']
+    assert names('r_s') == ['Under_score 100% Ltd'] == names('Under_')
+    assert names('a%c') == []
+    assert names("' OR '1'='1") == []
+
+
+@pytest.mark.parametrize('term, against', [
+    ('acme supply', '+acme* +supply*'),
+    ('The Acme Co', '+Acme*'),
+    ('acme" +in -zeta* @2', '+acme* +zeta*'),
+    ('to be', None),
+    ('"*', None),
+])
+def test_mysql_requires_only_indexed_words(term, against):
+    backend = MySQLFullTextSearchBackend(Supplier, ['supplier_name', 'contact_person', 'email'])
+    assert backend.boolean_query(term) == against
+    
+    query, rank = backend.apply(select(Supplier), term)
+    sql = str(query.compile(dialect=mysql.dialect()))
+    if against is None:
+        assert 'MATCH' not in sql and 'LIKE' in sql and rank is None
+    else:
+        assert 'MATCH (suppliers.supplier_name, suppliers.contact_person, suppliers.email) AGAINST' in sql
+        assert query.compile(dialect=mysql.dialect()).params['param_1'] == against
\ No newline at end of file
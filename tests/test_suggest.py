@@ -0,0 +1,111 @@
+import time
+import pytest
+from FlaskProjectSCD.app.repositories.suggest_index import PrefixIndex, SuggestIndex, prefix_keys
+from FlaskProjectSCD.app.repositories.supplier_repository import SupplierRepository
+
+
+@pytest.fixture
+def app(make_app):
+    return make_app(CHANGE_FEED_ENABLED=True, SUGGEST_ENABLED=True)
+
+
+def suggest(client, q, **params):
+    response = client.get('/api/suppliers/suggest', query_string={'q': q, **params})
+    assert response.status_code == 200
+    return response.get_json()['data']
+
+
+def suggested_names(client, q):
+    return sorted(item['supplier_name'] for item in suggest(client, q)['items'])
+
+
+def eventually(check, timeout=5):
+    """The sync thread applies writes shortly after they commit"""
+    deadline = time.monotonic() + timeout
+    while not check():
+        assert time.monotonic() < deadline
+        time.sleep(0.02)
+
+
+def entry(entity_id, name):
+    return entity_id, prefix_keys([name]), (entity_id, name)
+
+
+def test_keys_start_at_every_word():
+    assert prefix_keys(['The Ácme Supply-Co', None]) == ['acme supply co', 'co', 'supply co', 'the acme supply co']
+    
+    index = PrefixIndex(('id', 'name'), 10 ** 6)
+    index.load([entry(1, 'Acme Supply'), entry(2, 'Supply Acme'), entry(3, 'Other')])
+    # ordered by the matching key
+    assert [item['id'] for item in index.search('acme', 10)] == [2, 1]
+    assert [item['id'] for item in index.search('supply acme', 10)] == [2]
+    # an entity matching on two keys is returned once
+    assert [item['id'] for item in index.search('', 10)] == [2, 1, 3]
+    assert len(index.search('', 2)) == 2
+    
+    index.upsert(*entry(1, 'Renamed'))
+    index.remove(2)
+    assert index.search('acme', 10) == []
+    assert index.search('ren', 10) == [{'id': 1, 'name': 'Renamed'}]
+    assert len(index) == 2
+
+
+def test_memory_budget_leaves_entries_out():
+    entries = [entry(i, f'Supplier {i}') for i in range(3)]
+    index = PrefixIndex(('id', 'name'), sum(PrefixIndex.cost(keys, values) for _, keys, values in entries[:2]))
+    
+    index.load(entries)
+    assert (len(index), index.complete) == (2, False)
+    assert [item['id'] for item in index.search('supplier', 10)] == [0, 1]
+    
+    index.load(entries[:2])
+    assert index.complete
+    assert index.upsert(*entry(2, 'Supplier 2')) is False
+    assert not index.complete
+    # replacing an entry frees its own share first
+    assert index.upsert(*entry(0, 'Supplier 9')) is True
+    assert index.size <= index.max_bytes
+
+
+def test_build_then_catch_up_from_the_feed(app, client, suppliers):
+    index = SuggestIndex('supplier_id', SupplierRepository.suggest_fields, 10 ** 6, 60)
+    with app.app_context():
+        repository = SupplierRepository()
+        index.build(repository)
+    assert len(index.index) == 6 and index.ready.is_set()
+    
+    client.patch(f'/api/suppliers/{suppliers[0]}', json={'supplier_name': 'Zeta', 'contact_person': 'Ann Lee'})
+    client.delete(f'/api/suppliers/{suppliers[1]}')
+    client.post('/api/suppliers', json={'supplier_name': 'Yotta'})
+    
+    with app.app_context():
+        assert index.catch_up(SupplierRepository(), page_size=2) == 3
+        assert index.catch_up(SupplierRepository()) == 0
+    assert [item['supplier_name'] for item in index.search('LEE', 10)] == ['Zeta']
+    assert [item['supplier_id'] for item in index.search('supplier', 10)] == suppliers[2:]
+    assert len(index.index) == 6
+
+
+def test_endpoint_follows_writes_in_this_process(client, suppliers):
+    eventually(lambda: suggested_names(client, 'supp') == [f'Supplier {i}' for i in range(6)])
+    first_two = suggest(client, 'supp', limit=2)
+    assert (len(first_two['items']), first_two['complete']) == (2, True)
+    
+    client.post('/api/suppliers', json={'supplier_name': 'Crème Brûlée Ltd'})
+    eventually(lambda: suggested_names(client, 'brulee') == ['Crème Brûlée Ltd'])
+    
+    client.delete(f'/api/suppliers/{suppliers[0]}')
+    eventually(lambda: 'Supplier 0' not in suggested_names(client, 'supp'))
+    
+    assert client.get('/api/suppliers/suggest', query_string={'q': 'a', 'limit': 21}).status_code == 400
+
+
+def test_endpoint_reports_a_truncated_index(make_app):
+    client = make_app(CHANGE_FEED_ENABLED=True, SUGGEST_ENABLED=True, SUGGEST_MAX_MEMORY_MB=0).test_client()
+    client.post('/api/suppliers', json={'supplier_name': 'Acme'})
+    eventually(lambda: suggest(client, 'acme') == {'items': [], 'complete': False})
+
+
+def test_endpoint_is_404_when_off(make_app):
+    client = make_app(CHANGE_FEED_ENABLED=True).test_client()
+    assert client.get('/api/suppliers/suggest?q=a').status_code == 404
\ No newline at end of file
@@ -0,0 +1,90 @@
+from sqlalchemy import func, select
+from FlaskProjectSCD.app import db
+from FlaskProjectSCD.app.models.supplier import Supplier
+from FlaskProjectSCD.app.models.supplier_stat import SupplierStat
+
+
+def cells(app):
+    """Non-empty summary cells as {(dimension, bucket): count}"""
+    with app.app_context():
+        rows = db.session.execute(
+            select(SupplierStat.dimension, SupplierStat.bucket, SupplierStat.row_count)
+            .where(SupplierStat.row_count != 0)
+        ).all()
+        db.session.commit()
+    return {(dimension, bucket): count for dimension, bucket, count in rows}
+
+
+def domains(app):
+    """GROUP BY of the suppliers table on the email domain"""
+    domain = func.lower(func.substr(Supplier.email, func.instr(Supplier.email, '@') + 1))
+    with app.app_context():
+        rows = db.session.execute(
+            select(domain, func.count()).where(Supplier.email.like('%@%')).group_by(domain)
+        ).all()
+        total = db.session.scalar(select(func.count()).select_from(Supplier))
+        db.session.commit()
+    return {bucket: count for bucket, count in rows}, total
+
+
+def assert_consistent(app):
+    incremental = cells(app)
+    
+    by_domain, total = domains(app)
+    assert {bucket: count for (dimension, bucket), count in incremental.items() if dimension == 'domain'} == by_domain
+    assert incremental.get(('total', 'all'), 0) == total
+    
+    result = app.test_cli_runner().invoke(args=['rebuild-stats'])
+    assert result.exit_code == 0, result.output
+    assert f'from {total} suppliers' in result.output
+    assert cells(app) == incremental
+
+
+def test_writes_keep_summary_equal_to_rebuild(app, client):
+    created = []
+    for i, (email, phone) in enumerate([('a@one.com', '+1'), ('b@one.com', None), ('c@Two.com', '+3'), (None, '+4')]):
+        response = client.post('/api/suppliers', json={
+            'supplier_name': f'Supplier {i}', 'email': email, 'phone': phone, 'contact_person': 'Ann'
+        })
+        assert response.status_code == 201
+        created.append(response.get_json()['data']['supplier_id'])
+    assert_consistent(app)
+    
+    # move rows between domains and completeness buckets, sync and async
+    assert client.put(f'/api/suppliers/{created[0]}', json={'supplier_name': 'Moved', 'email': 'a@two.com'}).status_code == 200
+    assert client.patch(f'/api/suppliers/{created[1]}', json={'phone': '+2', 'contact_person': ''}).status_code == 200
+    assert client.patch(f'/api/async/suppliers/{created[2]}', json={'email': 'c@three.com'}).status_code == 200
+    assert client.put(f'/api/async/suppliers/{created[3]}', json={'supplier_name': 'Emailed', 'email': 'd@one.com'}).status_code == 200
+    # changes that move no count
+    assert client.patch(f'/api/suppliers/{created[0]}', json={'supplier_name': 'Renamed'}).status_code == 200
+    assert client.patch(f'/api/suppliers/{created[2]}', json={'email': 'C@THREE.com'}).status_code == 200
+    assert_consistent(app)
+    
+    assert client.delete(f'/api/suppliers/{created[0]}').status_code == 200
+    assert client.delete(f'/api/async/suppliers/{created[1]}').status_code == 200
+    assert_consistent(app)
+
+
+def test_bulk_writes_keep_summary_equal_to_rebuild(app, client):
+    response = client.post('/api/suppliers/bulk', json={'items': [
+        {'supplier_name': f'Bulk {i}', 'email': f'b{i}@{"one" if i % 2 else "two"}.com', 'phone': '+1'}
+        for i in range(6)
+    ] + [{'email': 'no-name@one.com'}]})
+    assert response.get_json()['failed'] == 1
+    ids = [result['id'] for result in response.get_json()['data'] if result['success']]
+    assert len(ids) == 6
+    assert_consistent(app)
+    
+    # one item fails on its own and moves nothing
+    response = client.patch('/api/suppliers/bulk', json={'items': [
+        {'supplier_id': ids[0], 'email': 'b0@three.com'},
+        {'supplier_id': ids[1], 'phone': ''},
+        {'supplier_id': ids[2], 'email': 'b2@three.com', 'version': 99},
+        {'supplier_id': ids[3], 'email': 'b3@three.com'},
+    ]})
+    assert (response.get_json()['succeeded'], response.get_json()['failed']) == (3, 1)
+    assert_consistent(app)
+    
+    response = client.delete('/api/suppliers/bulk', json={'ids': ids[:3] + [999999]})
+    assert (response.get_json()['succeeded'], response.get_json()['failed']) == (3, 1)
+    assert_consistent(app)
\ No newline at end of file